@@ -0,0 +1,37 @@
+"""
+Benchmarks of reading the environment file and the `dsutils_get_*` getters.
+"""
+from harness import *
+
+
+@benchmark("dsutils_read_env")
+def bench_read_env(workdir: str, size: int | None):
+    make_project(workdir)
+    return lambda: dsutils_read_env()
+
+
+@benchmark("dsutils_read_env_uncached")
+def bench_read_env_uncached(workdir: str, size: int | None):
+    make_project(workdir)
+
+    def run():
+        dsutils_invalidate_env()
+        dsutils_read_env()
+    return run
+
+
+@benchmark("dsutils_get_getters")
+def bench_getters(workdir: str, size: int | None):
+    make_project(workdir)
+
+    def run():
+        for _ in range(100):
+            dsutils_get_project_root()
+            dsutils_get_project_name()
+            dsutils_get_artifacts_dir()
+            dsutils_get_data_dir()
+            dsutils_get_data_processed_dir()
+            dsutils_get_data_raw_dir()
+            dsutils_get_experiments_dir()
+            dsutils_get_sources_file()
+    return run
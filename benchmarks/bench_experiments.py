@@ -0,0 +1,25 @@
+"""
+Benchmarks of validating experiment names against many existing experiments, and of rendering experiment notebooks.
+"""
+from harness import *
+from dsutils.notebook_template import get_notebook_template
+from dsutils.start_experiment import __validate_NAME__, __generate_notebook_content__
+
+
+@benchmark("start_experiment_validation", sizes=[1_000, 10_000])
+def bench_start_experiment_validation(workdir: str, size: int | None):
+    make_project(workdir)
+    generate_experiments(dsutils_get_experiments_dir(), size)
+    return lambda: __validate_NAME__("new_experiment")
+
+
+@benchmark("notebook_rendering")
+def bench_notebook_rendering(workdir: str, size: int | None):
+    make_project(workdir)
+    env_vars = dsutils_read_env()
+    template = get_notebook_template(env_vars)
+
+    def run():
+        for i in range(100):
+            __generate_notebook_content__(f"experiment_{i}", "A \"quoted\" description", env_vars, template)
+    return run
@@ -0,0 +1,37 @@
+"""
+Benchmarks of creating the files and folders of a new project.
+"""
+from harness import *
+from dsutils.create_files_and_folders import create_files_and_folders
+from dsutils.layout import LAYOUT_FILE, get_layout_plan
+import itertools
+import json
+
+
+@benchmark("create_files_and_folders")
+def bench_create_files_and_folders(workdir: str, size: int | None):
+    counter = itertools.count()
+
+    def run():
+        root = os.path.join(workdir, f"project_{next(counter)}")
+        os.mkdir(root)
+        create_files_and_folders(root)
+    return run
+
+
+@benchmark("layout_diff", sizes=[ 10, 1000 ])
+def bench_layout_diff(workdir: str, size: int | None):
+    """
+    Verifies a fully created project with `size` extra folders in its layout schema, using the cached plan.
+    """
+    root = os.path.join(workdir, "project")
+    os.mkdir(root)
+    schema = { f"extra_{i}": { "path": f"/extra/dir_{i}", "isFile": False } for i in range(size) }
+    schema["extra"] = { "path": "/extra", "isFile": False }
+    with open(root + LAYOUT_FILE, "w") as f:
+        json.dump(schema, f)
+    create_files_and_folders(root)
+
+    def run():
+        get_layout_plan(root).diff(root)
+    return run
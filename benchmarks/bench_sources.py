@@ -0,0 +1,43 @@
+"""
+Benchmarks of validating a new source against sources files of growing size.
+"""
+from harness import *
+from dsutils.sources_registry import SourcesRegistry, format_row
+from dsutils.add_source import __validate_NAME__
+
+
+@benchmark("add_source_validation", sizes=[1_000, 100_000, 1_000_000], slow_from=1_000_000)
+def bench_add_source_validation(workdir: str, size: int | None):
+    make_project(workdir)
+    generate_sources(dsutils_get_sources_file(), size)
+    return lambda: __validate_NAME__("NewSource")
+
+
+@benchmark("sources_index_build", sizes=[1_000, 100_000, 1_000_000], slow_from=1_000_000)
+def bench_sources_index_build(workdir: str, size: int | None):
+    make_project(workdir)
+    sources_file = dsutils_get_sources_file()
+    generate_sources(sources_file, size)
+
+    def run():
+        registry = SourcesRegistry(sources_file)
+        if os.path.isfile(registry.index_file):
+            os.remove(registry.index_file)
+        registry.refresh()
+    return run
+
+
+@benchmark("sources_index_append", sizes=[1_000, 100_000])
+def bench_sources_index_append(workdir: str, size: int | None):
+    """
+    Adds one source to a sources file of `size` rows and brings the persisted index up to date.
+    """
+    make_project(workdir)
+    sources_file = dsutils_get_sources_file()
+    generate_sources(sources_file, size)
+    registry = SourcesRegistry(sources_file).refresh()
+
+    def run():
+        registry.append([ format_row(registry.next_id(), f"source{registry.next_id()}", "", "https://example.com", "") ])
+        registry.refresh()
+    return run
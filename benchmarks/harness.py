@@ -0,0 +1,198 @@
+"""
+Shared machinery of the benchmark suite: the benchmark registry, timing, synthetic project fixtures and baseline comparison.
+
+Benchmarks are functions decorated with `@benchmark`, taking a fresh working directory and an optional size,
+doing their (untimed) setup and returning the callable to time.
+"""
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dsutils.internals import *
+from dsutils.sources_registry import format_row
+from dsutils.experiment_catalogue import CATALOGUE_DIR
+from dataclasses import dataclass, field
+from collections.abc import Callable
+import contextlib
+import json
+import statistics
+import time
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[str, int | None], Callable[[], object]]
+    size: int | None = None
+    # Benchmarks that are slow to set up are left out of quick runs
+    slow: bool = False
+
+    @property
+    def id(self):
+        return self.name if self.size is None else f"{self.name}[{self.size}]"
+
+
+@dataclass
+class Result:
+    id: str
+    rounds: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    times: list[float] = field(default_factory=list, repr=False)
+
+    def to_dict(self):
+        return { "rounds": self.rounds, "min_s": self.min_s, "median_s": self.median_s, "mean_s": self.mean_s }
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(name: str, sizes: list[int] | None = None, slow_from: int | None = None):
+    """
+    Registers a benchmark, once per size if `sizes` is given. Sizes of at least `slow_from` are only run without `--quick`.
+    """
+    def decorator(setup):
+        for size in sizes or [ None ]:
+            BENCHMARKS.append(Benchmark(name, setup, size, slow_from is not None and size is not None and size >= slow_from))
+        return setup
+    return decorator
+
+
+def measure(func: Callable[[], object], rounds: int = 20, warmup: int = 2, max_seconds: float = 5.0):
+    """
+    Times `func` after `warmup` untimed calls. Stops early once `max_seconds` were spent, with at least 3 rounds.
+
+    Returns:
+    ------
+        list[float]: The duration of every round in seconds.
+    """
+    for _ in range(warmup):
+        func()
+    times = []
+    started = time.perf_counter()
+    while len(times) < rounds:
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if len(times) >= 3 and time.perf_counter() - started > max_seconds:
+            break
+    return times
+
+
+def run_benchmark(bench: Benchmark, workdir: str, rounds: int = 20):
+    """
+    Sets up and times a benchmark, with `workdir` as working directory so project discovery finds its fixtures.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    with quiet(), working_directory(workdir):
+        func = bench.setup(workdir, bench.size)
+        times = measure(func, rounds)
+    return Result(bench.id, len(times), min(times), statistics.median(times), statistics.fmean(times), times)
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Hides the info and success messages of dsutils while benchmarking, so console output is not measured.
+    """
+    dsutils_set_log_level("ERROR")
+    try:
+        yield
+    finally:
+        dsutils_set_log_level("INFO")
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+#region Fixtures
+def make_project(root: str, create_files: bool = True):
+    """
+    Creates a DSUtils project with the default layout and environment file at `root`, as the setup script would, without prompting.
+    """
+    from dsutils.create_files_and_folders import create_files_and_folders, __get_files_and_folders_from_json__
+
+    root = os.path.abspath(root)
+    os.makedirs(root, exist_ok=True)
+    if create_files:
+        with quiet():
+            create_files_and_folders(root)
+
+    env_vars = [ ("PROJECT_ROOT", root), ("PROJECT_NAME", os.path.basename(root)) ]
+    for key, value in __get_files_and_folders_from_json__(root).items():
+        env_vars.append((key.upper(), value["path"].replace(root, "")))
+    with open(root + ENV_FILE, "w") as f:
+        f.write("\n".join([ f"{k}={v}" for k, v in env_vars ]))
+    dsutils_invalidate_env(root)
+    return root
+
+
+def generate_sources(sources_file: str, rows: int):
+    """
+    Writes a sources file with `rows` synthetic sources named `source0`, `source1`, ...
+    """
+    with open(sources_file, "w") as f:
+        f.write("id;name;description;url;citation")
+        chunk = []
+        for i in range(rows):
+            chunk.append("\n" + format_row(i, f"source{i}", f"Synthetic source {i}", f"https://example.com/{i}", f"Author {i}"))
+            if len(chunk) == 10_000:
+                f.write("".join(chunk))
+                chunk = []
+        f.write("".join(chunk))
+
+
+def generate_experiments(experiments_dir: str, count: int):
+    """
+    Creates `count` empty experiment directories named `experiment_0`, `experiment_1`, ...
+    """
+    for i in range(count):
+        os.mkdir(os.path.join(experiments_dir, f"experiment_{i}"))
+    os.makedirs(os.path.join(experiments_dir, CATALOGUE_DIR), exist_ok=True)
+    # Age the directory past the racy window of the experiment catalogue, which would otherwise rescan it on every lookup
+    past = time.time_ns() - 60_000_000_000
+    os.utime(experiments_dir, ns=(past, past))
+#endregion
+
+
+#region Baselines
+def load_baseline(path: str):
+    with open(path, "r") as f:
+        return json.load(f)["results"]
+
+
+def save_baseline(path: str, results: list[Result]):
+    with open(path, "w") as f:
+        json.dump({
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": { r.id: r.to_dict() for r in results },
+        }, f, indent=4)
+
+
+def compare(results: list[Result], baseline: dict[str, dict], threshold: float):
+    """
+    Compares the median of every result with its baseline.
+
+    Returns:
+    ------
+        list[tuple[str, float, float, float]]: The id, baseline median, current median and relative change of every result slower than `threshold`.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.id)
+        if base is None or base["median_s"] <= 0:
+            continue
+        change = result.median_s / base["median_s"] - 1
+        if change > threshold:
+            regressions.append((result.id, base["median_s"], result.median_s, change))
+    return regressions
+#endregion
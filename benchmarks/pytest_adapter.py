@@ -0,0 +1,27 @@
+"""
+Runs the benchmark suite with pytest-benchmark, which is not a dependency of dsutils.
+
+```bash
+# From the root of the project
+python -m pip install pytest-benchmark
+python -m pytest benchmarks/pytest_adapter.py --benchmark-autosave
+```
+"""
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+pytest.importorskip("pytest_benchmark")
+
+from harness import BENCHMARKS, quiet, working_directory
+from run import discover
+
+discover()
+
+
+@pytest.mark.parametrize("bench", BENCHMARKS, ids=[ b.id for b in BENCHMARKS ])
+def test_benchmark(bench, benchmark, tmp_path):
+    workdir = str(tmp_path / "project")
+    os.makedirs(workdir)
+    with quiet(), working_directory(workdir):
+        benchmark(bench.setup(workdir, bench.size))
@@ -0,0 +1,81 @@
+"""
+Standalone runner of the benchmark suite.
+
+```bash
+# From the root of the project
+python benchmarks/run.py --quick                 # Skip the slowest fixtures
+python benchmarks/run.py --save                  # Store the results as the baseline
+python benchmarks/run.py --threshold 0.1         # Fail when a benchmark is more than 10% slower than the baseline
+```
+"""
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from harness import BENCHMARKS, run_benchmark, load_baseline, save_baseline, compare
+import argparse
+import glob
+import importlib
+import json
+import shutil
+import tempfile
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def discover():
+    """
+    Imports every `bench_*.py` module next to this file, registering their benchmarks.
+    """
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_*.py"))):
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run the dsutils benchmark suite and compare it with a baseline.")
+    parser.add_argument("-k", "--filter", default=None, help="Only run benchmarks whose id contains this string.")
+    parser.add_argument("-q", "--quick", action="store_true", help="Skip benchmarks with slow to generate fixtures.")
+    parser.add_argument("-r", "--rounds", type=int, default=20, help="The maximum number of timed rounds per benchmark.")
+    parser.add_argument("-b", "--baseline", default=DEFAULT_BASELINE, help="The baseline JSON file to compare with or save to.")
+    parser.add_argument("-s", "--save", action="store_true", help="Save the results as the new baseline.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2, help="The relative slowdown of the median above which a benchmark is a regression.")
+    parser.add_argument("-o", "--output", default=None, help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    discover()
+    selected = [ b for b in BENCHMARKS if (args.filter is None or args.filter in b.id) and not (args.quick and b.slow) ]
+
+    results = []
+    print(f"{'benchmark':<45} {'rounds':>6} {'min (ms)':>12} {'median (ms)':>12}")
+    for bench in selected:
+        workdir = tempfile.mkdtemp(prefix="dsutils-bench-")
+        try:
+            result = run_benchmark(bench, os.path.join(workdir, "project"), args.rounds)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+        results.append(result)
+        print(f"{result.id:<45} {result.rounds:>6} {result.min_s * 1000:>12.3f} {result.median_s * 1000:>12.3f}", flush=True)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({ r.id: r.to_dict() for r in results }, f, indent=4)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline to compare with, run with --save to create one.")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    for id, base, current, change in regressions:
+        print(f"REGRESSION {id}: {base * 1000:.3f} ms -> {current * 1000:.3f} ms (+{change:.0%})")
+    if len(regressions) == 0:
+        print(f"No regressions above {args.threshold:.0%} compared to {args.baseline}")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
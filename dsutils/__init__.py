@@ -0,0 +1,74 @@
+"""
+DSUtils, utilities for data science projects.
+
+The public API is importable from the package itself, e.g. `from dsutils import load_dataset`.
+Submodules are only imported on first access of one of their names (PEP 562), so `import dsutils` stays cheap
+and scripts, notebooks and worker processes only pay for the parts of DSUtils they use.
+
+The functions named after their command line script (`add_source`, `start_experiment`, `create_files_and_folders` and `setup`)
+share their name with that script's module, which is what `dsutils.<name>` refers to, e.g. `dsutils.add_source.add_source(...)`.
+"""
+import importlib
+
+
+# Public names, mapped to the submodule that defines them
+__LAZY_NAMES__ = {
+    name: module
+    for module, names in {
+        "dsutils.internals": (
+            "ENV_FILE", "DsutilsEnv", "DsutilsEnvCache", "DsutilsError", "dsutils_raise_errors", "dsutils_exit",
+            "dsutils_set_log_level", "dsutils_flush_logs", "dsutils_capture_logs", "dsutils_info", "dsutils_success", "dsutils_warn", "dsutils_error",
+            "dsutils_input", "dsutils_input_options", "dsutils_input_yes_no",
+            "dsutils_find_project_root", "dsutils_read_env", "dsutils_get_env", "dsutils_invalidate_env", "dsutils_env_cache_stats",
+            "dsutils_get_project_root", "dsutils_get_project_name", "dsutils_get_artifacts_dir", "dsutils_get_data_dir",
+            "dsutils_get_data_processed_dir", "dsutils_get_data_raw_dir", "dsutils_get_experiments_dir",
+            "dsutils_get_sources_file", "dsutils_get_sources_file_content",
+            "dsutils_file_lock", "dsutils_enable_tracing", "dsutils_disable_tracing", "dsutils_span", "dsutils_traced",
+        ),
+        "dsutils.add_source": ("add_sources_bulk", "BulkImportReport"),
+        "dsutils.start_experiment": ("start_experiments",),
+        "dsutils.sources_registry": ("SourcesRegistry", "SourcesWriter", "get_sources_registry"),
+        "dsutils.experiment_catalogue": ("ExperimentCatalogue", "get_experiment_catalogue", "list_experiments"),
+        "dsutils.notebook_template": ("NotebookTemplate", "load_notebook_template", "get_notebook_template"),
+        "dsutils.artifact_store": ("ArtifactStore", "ArtifactWriter"),
+        "dsutils.step_cache": ("cache", "StepCache"),
+        "dsutils.pipeline": ("Pipeline", "PipelineStep"),
+        "dsutils.datasets": ("load_dataset", "invalidate_dataset"),
+        "dsutils.streaming": ("stream_records", "RecordBatch"),
+        "dsutils.partitioning": ("write_partitioned", "read_partitioned", "read_manifest", "select_shards"),
+        "dsutils.inventory": ("Inventory", "InventoryChanges", "scan_inventory"),
+        "dsutils.layout": ("LayoutEntry", "LayoutDiff", "LayoutPlan", "compile_layout", "load_layout_schema", "get_layout_plan", "clear_layout_cache"),
+        "dsutils.setup": ("setup_many",),
+        "dsutils.project_registry": ("ProjectRegistry", "list_projects", "register_projects"),
+        "dsutils.daemon": ("DsutilsDaemon",),
+        "dsutils.async_api": (
+            "async_start_experiment", "async_start_experiments", "async_add_source", "async_add_sources_bulk",
+            "async_create_files_and_folders", "set_async_max_workers",
+        ),
+    }.items()
+    for name in names
+}
+
+__SUBMODULES__ = (
+    "add_source", "artifact_store", "async_api", "create_files_and_folders", "daemon", "daemon_client", "datasets", "experiment_catalogue", "internals", "inventory",
+    "layout", "notebook_template", "partitioning", "pipeline", "project_registry", "setup", "sources_registry", "start_experiment", "step_cache", "streaming",
+)
+
+__all__ = sorted(__LAZY_NAMES__)
+
+
+def __getattr__(name: str):
+    if name in __LAZY_NAMES__:
+        value = getattr(importlib.import_module(__LAZY_NAMES__[name]), name)
+    elif name in __SUBMODULES__:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    # Cache the value, so __getattr__ is only called on first access
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__LAZY_NAMES__) | set(__SUBMODULES__))
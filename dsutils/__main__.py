@@ -0,0 +1,37 @@
+import importlib
+import sys
+
+
+# Subcommands of `python -m dsutils`, mapped to the module whose main(argv) implements them.
+# Modules are only imported when their subcommand is run.
+COMMANDS = {
+    "add_source": "dsutils.add_source",
+    "inventory": "dsutils.inventory",
+    "layout": "dsutils.layout",
+    "projects": "dsutils.project_registry",
+    "serve": "dsutils.daemon",
+    "setup": "dsutils.setup",
+    "start_experiment": "dsutils.start_experiment",
+}
+# Subcommands that are forwarded to the daemon of the project when one is running, without importing their module
+FORWARDED = ("add_source", "start_experiment")
+
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 0 or argv[0] not in COMMANDS:
+        print(f"usage: python -m dsutils {{{','.join(COMMANDS)}}} ...", file=sys.stderr)
+        sys.exit(2)
+    command, args = argv[0], argv[1:]
+    if command in FORWARDED:
+        from dsutils.daemon_client import forward_command
+        exit_code = forward_command(command, args)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        importlib.import_module(COMMANDS[command]).main(args, forward=False)
+        return
+    importlib.import_module(COMMANDS[command]).main(args)
+
+
+if __name__ == "__main__":
+    main()
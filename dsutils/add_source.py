@@ -5,28 +5,15 @@ if __name__ == "__main__":
     sys.path.insert(0, dsutils_path)
 
 from dsutils.internals import *
-import argparse
+from dsutils.sources_registry import get_sources_registry
+import csv
+import json
+from collections.abc import Container, Iterable
+from dataclasses import dataclass, field
 from urllib.parse import urlparse
 
-parser = argparse.ArgumentParser(description='Adds a new source entry to the sources.csv file.')
 
-#"id,name,type,description,url,citation"
-parser.add_argument('-n', '--name', default=None, help='The name of the source.')
-parser.add_argument('-d', '--description', default=None, help='The description of the source.')
-parser.add_argument('-u', '--url', default=None, help='The url of the source.')
-parser.add_argument('-c', '--citation', default=None, help='The citation for the source.')
-
-args = parser.parse_args()
-NAME = args.name
-DESCRIPTION = args.description
-URL = args.url
-CITATION = args.citation
-
-PROJECT_ROOT = dsutils_get_project_root()
-SOURCES_FILE = os.path.join(PROJECT_ROOT, "sources.csv")
-
-
-def __validate_NAME__(name: str | None = None):
+def __validate_NAME__(name: str | None = None, existing_names: Container[str] | None = None):
     """
     Validates the name argument.
 
@@ -34,6 +21,9 @@ def __validate_NAME__(name: str | None = None):
     ----------
     name : str, optional
         The name of the source, default None
+    existing_names : Container[str], optional
+        The existing source names to validate against, e.g. a `SourcesWriter`, default None.
+        If None, the sources registry is queried instead.
 
     Returns:
     -------
@@ -42,13 +32,15 @@ def __validate_NAME__(name: str | None = None):
     """
     errors = []
 
-    existing_sources = dsutils_get_sources_file_content()
+    if existing_names is None:
+        existing_names = get_sources_registry()
 
     if name == "" or name is None:
         errors.append("Source name cannot be empty.")
+        return errors
     if name.isalnum() == False:
         errors.append("Source name must contain only alphanumeric characters (a-z, A-Z, 0-9).")
-    if len(existing_sources) > 1 and any([ line.startswith(name) for line in existing_sources[1:] ]):
+    if name in existing_names:
         errors.append(f"Source with name '{name}' already exists.")
 
     return errors
@@ -122,11 +114,19 @@ def __validate_CITATION__(citation: str | None = None):
     return errors
 
 
-def add_source(name: str | None = None, description: str | None = None, url: str | None = None, citation: str | None = None):
+def __get_registry__(project_root: str | None = None):
+    """
+    Returns the sources registry of the project, the one of the working directory if `project_root` is None.
+    """
+    return get_sources_registry(None if project_root is None else dsutils_get_sources_file(project_root))
+
+
+@dsutils_traced("add_source")
+def add_source(name: str | None = None, description: str | None = None, url: str | None = None, citation: str | None = None, interactive: bool = False, project_root: str | None = None):
     """
     Adds a new source entry to the sources.csv file.  
-    If any of the arguments are invalid and the function is called from another script, a `ValueError` will be raised.
-    If this script is called from the command line, the user will be prompted to rectify invalid arguments.
+    If any of the arguments are invalid, a `ValueError` will be raised.
+    In interactive mode, i.e. when called from the command line, the user will be prompted to rectify invalid arguments instead.
 
     Args:
     ----------
@@ -138,63 +138,62 @@ def add_source(name: str | None = None, description: str | None = None, url: str
         The url of the source, default None
     citation : str, optional
         The citation of the source, default None
+    interactive : bool, optional
+        Whether to prompt the user to rectify invalid arguments, default False
+    project_root : str, optional
+        The root directory of the project, default the project of the working directory
 
     Raises
     ------
     ValueError
-        If any of the arguments are invalid and the function is called from another script.
+        If any of the arguments are invalid and `interactive` is False.
     """
-    global NAME, DESCRIPTION, URL, CITATION
-
-    def __parse_var__(var: str | None = None, glb = str | None):
-        if var is not None:
-            return var.strip()
-        elif glb is not None:
-            return glb.strip()
-        else:
-            return ""
+    def __parse_var__(var: str | None = None):
+        return "" if var is None else var.strip()
         
-    NAME = __parse_var__(name, NAME)
-    DESCRIPTION = __parse_var__(description, DESCRIPTION)
-    URL = __parse_var__(url, URL)
-    CITATION = __parse_var__(citation, CITATION)
-
-    name_errors = __validate_NAME__(NAME)
-    description_errors = __validate_DESCRIPTION__(DESCRIPTION)
-    url_errors = __validate_URL__(URL)
-    citation_errors = __validate_CITATION__(CITATION)
+    name = __parse_var__(name)
+    description = __parse_var__(description)
+    url = __parse_var__(url)
+    citation = __parse_var__(citation)
+
+    registry = __get_registry__(project_root)
+    with dsutils_span("validation"):
+        name_errors = __validate_NAME__(name, registry)
+        description_errors = __validate_DESCRIPTION__(description)
+        url_errors = __validate_URL__(url)
+        citation_errors = __validate_CITATION__(citation)
 
     try:
     # Interactive mode when called from command line
     # Will prompt user to rectify invalid arguments
-        if __name__ == "__main__":
+        if interactive:
             while len(name_errors) > 0:
                 for error in name_errors:
                     dsutils_warn(error)
-                NAME = dsutils_input("Source name: ")
-                NAME = NAME.strip()
-                name_errors = __validate_NAME__(NAME)
+                name = dsutils_input("Source name: ")
+                name = name.strip()
+                name_errors = __validate_NAME__(name, registry)
 
             while len(description_errors) > 0:
                 for error in description_errors:
                     dsutils_warn(error)
-                DESCRIPTION = dsutils_input("Source description: ")
-                DESCRIPTION = DESCRIPTION.strip()
-                description_errors = __validate_DESCRIPTION__(DESCRIPTION)
+                description = dsutils_input("Source description: ")
+                description = description.strip()
+                description_errors = __validate_DESCRIPTION__(description)
 
             while len(url_errors) > 0:
                 for error in url_errors:
                     dsutils_warn(error)
-                URL = dsutils_input("Source URL: ")
-                URL = URL.strip()
-                url_errors = __validate_URL__(URL)
+                url = dsutils_input("Source URL: ")
+                url = url.strip()
+                url_errors = __validate_URL__(url)
 
             while len(citation_errors) > 0:
                 for error in citation_errors:
                     dsutils_warn(error)
-                CITATION = dsutils_input("Source citation: ")
-                CITATION = CITATION.strip()
-                citation_errors = __validate_CITATION__(CITATION)
+                citation = dsutils_input("Source citation: ")
+                citation = citation.strip()
+                citation_errors = __validate_CITATION__(citation)
 
         # Non-interactive mode when called from another script
         # Will raise ValueError if any arguments are invalid
@@ -203,15 +202,12 @@ def add_source(name: str | None = None, description: str | None = None, url: str
             if len(joined_errors) > 0:
                 raise ValueError("Invalid argument values:\n" + '\n'.join(joined_errors))
             
-        existing_sources = dsutils_get_sources_file_content()
-        new_id = 0
-        if len(existing_sources) > 1:
-            new_id = int(existing_sources[-1].split(';')[0]) + 1
-
-        newline = f"{new_id};'{NAME}';'{DESCRIPTION}';'{URL}';'{CITATION}'"
-
-        with open(SOURCES_FILE, 'a') as file:
-            file.write(f"\n{newline}")
+        # Re-check the name while holding the lock, another process may have added it since validation
+        with dsutils_span("filesystem_writes") as span, registry.writer() as writer:
+            if writer.contains(name):
+                raise ValueError(f"Invalid argument values:\nSource with name '{name}' already exists.")
+            newline = writer.add(name, description, url, citation)
+            span.add_file(len(newline) + 1)
 
         return newline
     except KeyboardInterrupt:
@@ -219,5 +215,186 @@ def add_source(name: str | None = None, description: str | None = None, url: str
         sys.exit(1)
 
 
+@dataclass
+class BulkImportReport:
+    """
+    The result of `add_sources_bulk`.
+
+    Attributes:
+    ----------
+    added : list[str]
+        The rows that were appended to the sources file.
+    errors : list[dict]
+        One entry per rejected source, with the `index` of the source in the input, its `line` in the imported file (None if not imported from a file),
+        its `name` and the list of `errors`.
+    """
+    added: list[str] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+    def to_dict(self):
+        return { "added": self.added, "errors": self.errors }
+
+
+def __read_bulk_file__(path: str):
+    """
+    Reads the sources to import from a .csv or .jsonl file.
+
+    CSV files must have a header containing the `name`, `description`, `url` and `citation` columns.
+    JSONL files must contain one object per line with those keys. A line that is not valid JSON does not stop the import,
+    it is yielded as the `ValueError` it raised, so it is rejected like any other invalid source.
+
+    Args:
+    ----------
+    path : str
+        The path to the file.
+
+    Returns:
+    -------
+    Iterator[tuple[int, dict | ValueError]]
+        The line number and source of every row in the file.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in [".csv", ".jsonl"]:
+        raise ValueError(f"Unsupported file type '{extension}', expected a .csv or .jsonl file.")
+
+    with open(path, "r", newline="") as file:
+        if extension == ".csv":
+            reader = csv.DictReader(file)
+            for source in reader:
+                yield reader.line_num, source
+        else:
+            for line_number, line in enumerate(file, start=1):
+                if line.strip() == "":
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    yield line_number, ValueError(f"Invalid JSON: {e}")
+
+
+@dsutils_traced("add_sources_bulk")
+def __add_sources__(rows: Iterable[tuple[int | None, object]], project_root: str | None = None):
+    """
+    Adds the sources of `rows`, pairs of the line number of a source in the imported file and the source, see `add_sources_bulk`.
+    """
+    def __parse_var__(var):
+        return "" if var is None else str(var).strip()
+
+    report = BulkImportReport()
+
+    with dsutils_span("filesystem_writes") as span, __get_registry__(project_root).writer() as writer:
+        for index, (line, source) in enumerate(rows):
+            if isinstance(source, ValueError):
+                report.errors.append({ "index": index, "line": line, "name": "", "errors": [ str(source) ] })
+                continue
+            if not isinstance(source, dict):
+                report.errors.append({ "index": index, "line": line, "name": "", "errors": [ f"Source must be an object, not {type(source).__name__}." ] })
+                continue
+
+            name = __parse_var__(source.get("name"))
+            description = __parse_var__(source.get("description"))
+            url = __parse_var__(source.get("url"))
+            citation = __parse_var__(source.get("citation"))
+
+            errors = __validate_NAME__(name, writer) \
+                + __validate_DESCRIPTION__(description) \
+                + __validate_URL__(url) \
+                + __validate_CITATION__(citation)
+            if len(errors) > 0:
+                report.errors.append({ "index": index, "line": line, "name": name, "errors": errors })
+                continue
+
+            report.added.append(writer.add(name, description, url, citation))
+            span.add_file(len(report.added[-1]) + 1)
+
+    return report
+
+
+def add_sources_bulk(sources: Iterable[dict], project_root: str | None = None):
+    """
+    Adds many sources to the sources.csv file at once.
+
+    The lock on the sources file is held for the whole batch, so every source is validated against a consistent view of the existing source names,
+    including the sources earlier in the same batch. Valid sources get consecutive ids and are appended with a single write,
+    invalid sources are reported instead of prompting the user.
+
+    Args:
+    ----------
+    sources : Iterable[dict]
+        The sources to add, each a dictionary with the `name`, `description`, `url` and `citation` keys.
+    project_root : str, optional
+        The root directory of the project, default the project of the working directory.
+
+    Returns:
+    -------
+    BulkImportReport
+        The appended rows and the errors of the rejected sources.
+    """
+    return __add_sources__(((None, source) for source in sources), project_root)
+
+
+def __add_sources_from_file__(path: str, report_path: str | None = None):
+    """
+    Command line mode of `add_sources_bulk`, importing every source in the given file.
+    """
+    report = __add_sources__(__read_bulk_file__(path))
+
+    for error in report.errors:
+        dsutils_warn(f"Line {error['line']} ('{error['name']}'): " + " ".join(error["errors"]))
+    if report_path is not None:
+        with open(report_path, "w") as file:
+            json.dump(report.to_dict(), file, indent=4)
+
+    dsutils_success(f"Added {len(report.added)} sources, rejected {len(report.errors)}.")
+    if len(report.errors) > 0:
+        sys.exit(1)
+
+
+def __build_parser__():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Adds a new source entry to the sources.csv file.')
+
+    #"id,name,type,description,url,citation"
+    parser.add_argument('-n', '--name', default=None, help='The name of the source.')
+    parser.add_argument('-d', '--description', default=None, help='The description of the source.')
+    parser.add_argument('-u', '--url', default=None, help='The url of the source.')
+    parser.add_argument('-c', '--citation', default=None, help='The citation for the source.')
+    parser.add_argument('-f', '--from-file', default=None, help='Path to a .csv or .jsonl file with name, description, url and citation columns to import in bulk.')
+    parser.add_argument('-r', '--report', default=None, help='Path to write the JSON report of a bulk import to.')
+    return parser
+
+
+def __run__(args, interactive: bool = True):
+    """
+    Runs the command line script with the parsed arguments, also used by the DSUtils daemon to run forwarded calls.
+    """
+    if args.from_file is not None:
+        __add_sources_from_file__(args.from_file, args.report)
+    else:
+        add_source(args.name, args.description, args.url, args.citation, interactive=interactive)
+
+
+def main(argv: list[str] | None = None, forward: bool = True):
+    """
+    Command line entry point, parsing `argv` (default `sys.argv[1:]`) and adding a source interactively or importing sources in bulk.
+    The call is forwarded to the DSUtils daemon of the project when one is running, unless `forward` is False.
+    """
+    if forward:
+        from dsutils.daemon_client import forward_command
+        exit_code = forward_command("add_source", sys.argv[1:] if argv is None else argv)
+        if exit_code is not None:
+            if exit_code != 0:
+                sys.exit(exit_code)
+            return
+
+    __run__(__build_parser__().parse_args(argv))
+
+
 if __name__ == "__main__":
-    add_source()
\ No newline at end of file
+    main()
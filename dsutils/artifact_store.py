@@ -0,0 +1,402 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from datetime import datetime
+import hashlib
+import json
+import pickle
+import shutil
+import threading
+import uuid
+
+
+STORE_DIR = ".store"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactWriter:
+    """
+    Binary file-like object streaming an artifact into the store, obtained through `ArtifactStore.writer()`.
+
+    Written bytes are hashed as they go to a temporary file, so large artifacts are never held in memory.
+    When the writer is closed, the temporary file becomes the blob of its hash, or is discarded if that blob already exists.
+    """
+
+    def __init__(self, store: "ArtifactStore", experiment: str, name: str):
+        self.store = store
+        self.experiment = experiment
+        self.name = name
+        self.hash: str | None = None
+        self.size = 0
+
+        self._hasher = hashlib.sha256()
+        self._tmp_file = store.__tmp_path__()
+        self._file = open(self._tmp_file, "wb")
+
+    def write(self, data: bytes):
+        self._hasher.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def writable(self):
+        return True
+
+    def close(self):
+        """
+        Commits the written bytes to the store and records them in the manifest.
+        """
+        if self._file.closed:
+            return
+        self._file.close()
+        self.hash = self._hasher.hexdigest()
+        self.store.__record__(self.experiment, self.name, self.hash, self.size, self._tmp_file)
+
+    def abort(self):
+        """
+        Discards the written bytes.
+        """
+        if not self._file.closed:
+            self._file.close()
+        if os.path.isfile(self._tmp_file):
+            os.remove(self._tmp_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for the artifacts of experiments, rooted at the artifacts directory.
+
+    Artifacts are stored once per unique content as blobs named after their SHA-256 hash, so identical artifacts saved under different
+    names or by different experiments share the same bytes on disk. A manifest maps every `experiment/name` to the hash of its content.
+
+    Re-saving an artifact whose content is already stored only costs hashing it: no blob is written, and the manifest is left untouched
+    if the artifact already pointed to that content.
+    """
+
+    def __init__(self, root: str | None = None):
+        if root is None:
+            root = dsutils_get_artifacts_dir()
+        self.root = os.path.abspath(root)
+        self.store_dir = os.path.join(self.root, STORE_DIR)
+        self.blobs_dir = os.path.join(self.store_dir, "blobs")
+        self.tmp_dir = os.path.join(self.store_dir, "tmp")
+        self.manifest_file = os.path.join(self.store_dir, "manifest.json")
+        self.lock_file = os.path.join(self.store_dir, "manifest.lock")
+
+        self._lock = threading.RLock()
+        self._manifest: dict[str, dict] = dict()
+        self._manifest_signature = None
+
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    #region Blobs
+    def __blob_path__(self, hash: str):
+        return os.path.join(self.blobs_dir, hash[:2], hash[2:])
+
+    def __tmp_path__(self):
+        return os.path.join(self.tmp_dir, f"{os.getpid()}-{uuid.uuid4().hex}")
+
+    def __commit_tmp__(self, tmp_file: str, hash: str):
+        """
+        Moves a temporary file into place as the blob of the given hash, or discards it if the blob already exists.
+        """
+        blob_path = self.__blob_path__(hash)
+        if os.path.isfile(blob_path):
+            os.remove(tmp_file)
+            return
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(tmp_file, blob_path)
+    #endregion
+
+    #region Manifest
+    def __load_manifest__(self):
+        """
+        Loads the manifest from disk, if it changed since it was last loaded.
+        """
+        try:
+            stat = os.stat(self.manifest_file)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._manifest_signature:
+            return
+
+        with open(self.manifest_file, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported artifact manifest version: {manifest.get('version')}")
+        self._manifest = manifest["artifacts"]
+        self._manifest_signature = signature
+
+    def __save_manifest__(self):
+        """
+        Atomically writes the manifest to disk.
+        """
+        tmp_file = self.__tmp_path__()
+        with open(tmp_file, "w") as f:
+            json.dump({ "version": MANIFEST_VERSION, "artifacts": self._manifest }, f, indent=4)
+        os.replace(tmp_file, self.manifest_file)
+        stat = os.stat(self.manifest_file)
+        self._manifest_signature = (stat.st_mtime_ns, stat.st_size)
+
+    def __record__(self, experiment: str, name: str, hash: str, size: int, tmp_file: str | None = None):
+        """
+        Points `experiment/name` to the given hash in the manifest, writing the manifest only if it changed.
+
+        The temporary file with the content, if given, becomes the blob while the manifest lock is held,
+        so `gc()` cannot remove the blob before the artifact refers to it.
+
+        Returns:
+        ------
+            bool: False if no temporary file was given and the blob does not exist, e.g. because `gc()` removed it, in which case nothing is recorded.
+        """
+        key = self.__key__(experiment, name)
+        with self._lock:
+            self.__load_manifest__()
+            entry = self._manifest.get(key)
+            if entry is not None and entry["hash"] == hash:
+                # The blob is referenced already, so gc() keeps it
+                if tmp_file is not None:
+                    self.__commit_tmp__(tmp_file, hash)
+                return True
+            with dsutils_file_lock(self.lock_file):
+                if tmp_file is not None:
+                    self.__commit_tmp__(tmp_file, hash)
+                elif not os.path.isfile(self.__blob_path__(hash)):
+                    return False
+                self.__load_manifest__()
+                self._manifest[key] = { "hash": hash, "size": size, "saved_at": datetime.now().isoformat(timespec="seconds") }
+                self.__save_manifest__()
+        return True
+
+    def __save__(self, experiment: str, name: str, hash: str, size: int, write_tmp):
+        """
+        Records an artifact in the manifest, first storing its content as a blob with `write_tmp(tmp_file)` if the blob does not exist.
+        """
+        tmp_file = None
+        if not os.path.isfile(self.__blob_path__(hash)):
+            tmp_file = self.__tmp_path__()
+            write_tmp(tmp_file)
+        if not self.__record__(experiment, name, hash, size, tmp_file):
+            # The blob was removed by gc() since it was checked, store it after all
+            tmp_file = self.__tmp_path__()
+            write_tmp(tmp_file)
+            self.__record__(experiment, name, hash, size, tmp_file)
+
+    def __key__(self, experiment: str, name: str):
+        if experiment == "" or name == "":
+            raise ValueError("Artifact experiment and name cannot be empty.")
+        return f"{experiment}/{name}"
+
+    def __entry__(self, experiment: str, name: str):
+        key = self.__key__(experiment, name)
+        with self._lock:
+            self.__load_manifest__()
+            entry = self._manifest.get(key)
+        if entry is None:
+            raise KeyError(f"Artifact does not exist: {key}")
+        return entry
+    #endregion
+
+    #region Saving
+    def writer(self, experiment: str, name: str):
+        """
+        Returns an `ArtifactWriter` to stream an artifact into the store.
+
+        Example:
+        ------
+        ```python
+        with store.writer("baseline_model", "model.pkl") as f:
+            pickle.dump(model, f)
+        ```
+        """
+        return ArtifactWriter(self, experiment, name)
+
+    def save_bytes(self, experiment: str, name: str, data: bytes):
+        """
+        Saves an artifact from bytes in memory.
+
+        Returns:
+        ------
+            str: The hash of the artifact.
+        """
+        def write_tmp(tmp_file: str):
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+
+        hash = hashlib.sha256(data).hexdigest()
+        self.__save__(experiment, name, hash, len(data), write_tmp)
+        return hash
+
+    def save_file(self, experiment: str, name: str, path: str):
+        """
+        Saves an existing file as an artifact.
+
+        The file is hashed first, and only copied into the store if its content is not stored yet.
+
+        Returns:
+        ------
+            str: The hash of the artifact.
+        """
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        hash = hasher.hexdigest()
+
+        self.__save__(experiment, name, hash, os.path.getsize(path), lambda tmp_file: shutil.copyfile(path, tmp_file))
+        return hash
+
+    def save_stream(self, experiment: str, name: str, stream):
+        """
+        Saves an artifact from a binary stream, e.g. an opened file or a network response, in a single pass.
+
+        Returns:
+        ------
+            str: The hash of the artifact.
+        """
+        with self.writer(experiment, name) as writer:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                writer.write(chunk)
+        return writer.hash
+
+    def save_object(self, experiment: str, name: str, obj):
+        """
+        Pickles an object and saves it as an artifact.
+
+        Use `writer()` with `pickle.dump` instead for objects too large to also hold pickled in memory.
+
+        Returns:
+        ------
+            str: The hash of the artifact.
+        """
+        return self.save_bytes(experiment, name, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    #endregion
+
+    #region Loading
+    def path(self, experiment: str, name: str):
+        """
+        Returns the path to the blob of an artifact. The blob must not be modified.
+
+        Raises:
+        ------
+            KeyError: If the artifact does not exist.
+        """
+        return self.__blob_path__(self.__entry__(experiment, name)["hash"])
+
+    def open(self, experiment: str, name: str):
+        """
+        Opens an artifact for binary reading.
+
+        Raises:
+        ------
+            KeyError: If the artifact does not exist.
+        """
+        return open(self.path(experiment, name), "rb")
+
+    def load_bytes(self, experiment: str, name: str):
+        """
+        Returns the content of an artifact.
+
+        Raises:
+        ------
+            KeyError: If the artifact does not exist.
+        """
+        with self.open(experiment, name) as f:
+            return f.read()
+
+    def load_object(self, experiment: str, name: str):
+        """
+        Unpickles an artifact saved with `save_object()`. Only load artifacts you trust.
+
+        Raises:
+        ------
+            KeyError: If the artifact does not exist.
+        """
+        with self.open(experiment, name) as f:
+            return pickle.load(f)
+
+    def exists(self, experiment: str, name: str):
+        """
+        Returns True if the artifact exists.
+        """
+        try:
+            self.__entry__(experiment, name)
+            return True
+        except KeyError:
+            return False
+
+    def list(self, experiment: str | None = None):
+        """
+        Returns the manifest entries of all artifacts, or of the artifacts of one experiment.
+
+        Returns:
+        ------
+            dict[str, dict]: The `hash`, `size` and `saved_at` of every artifact, keyed by `experiment/name`.
+        """
+        with self._lock:
+            self.__load_manifest__()
+            prefix = None if experiment is None else f"{experiment}/"
+            return { k: dict(v) for k, v in self._manifest.items() if prefix is None or k.startswith(prefix) }
+    #endregion
+
+    #region Removing
+    def delete(self, experiment: str, name: str):
+        """
+        Removes an artifact from the manifest. Its blob is only removed by `gc()`, as other artifacts may share it.
+
+        Raises:
+        ------
+            KeyError: If the artifact does not exist.
+        """
+        key = self.__key__(experiment, name)
+        with self._lock, dsutils_file_lock(self.lock_file):
+            self.__load_manifest__()
+            if key not in self._manifest:
+                raise KeyError(f"Artifact does not exist: {key}")
+            del self._manifest[key]
+            self.__save_manifest__()
+
+    def gc(self):
+        """
+        Removes the blobs no artifact refers to anymore, and leftover temporary files.
+
+        Returns:
+        ------
+            int: The number of bytes freed.
+        """
+        freed = 0
+        with self._lock, dsutils_file_lock(self.lock_file):
+            self.__load_manifest__()
+            referenced = set([ entry["hash"] for entry in self._manifest.values() ])
+
+            for prefix in os.scandir(self.blobs_dir):
+                if not prefix.is_dir():
+                    continue
+                for blob in os.scandir(prefix.path):
+                    if prefix.name + blob.name not in referenced:
+                        freed += blob.stat().st_size
+                        os.remove(blob.path)
+
+            for tmp in os.scandir(self.tmp_dir):
+                # Temporary files may belong to writes still in progress, only remove the ones untouched for a day
+                if datetime.now().timestamp() - tmp.stat().st_mtime > 24 * 60 * 60:
+                    freed += tmp.stat().st_size
+                    os.remove(tmp.path)
+        return freed
+    #endregion
@@ -0,0 +1,157 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dsutils.add_source import add_source, add_sources_bulk
+from dsutils.create_files_and_folders import create_files_and_folders
+from dsutils.start_experiment import start_experiment, start_experiments
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import threading
+
+
+# The default number of threads blocking DSUtils calls are run on, shared by every project
+MAX_WORKERS = 8
+
+__EXECUTOR__: ThreadPoolExecutor | None = None
+__EXECUTOR_LOCK__ = threading.Lock()
+
+
+def set_async_max_workers(max_workers: int):
+    """
+    Sets the number of threads the async functions run their blocking work on. Calls already submitted finish on the previous threads.
+
+    Args:
+    ------
+        max_workers (int): The maximum number of concurrent blocking calls.
+    """
+    global __EXECUTOR__, MAX_WORKERS
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    with __EXECUTOR_LOCK__:
+        MAX_WORKERS = max_workers
+        previous, __EXECUTOR__ = __EXECUTOR__, None
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def __get_executor__():
+    global __EXECUTOR__
+
+    with __EXECUTOR_LOCK__:
+        if __EXECUTOR__ is None:
+            __EXECUTOR__ = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dsutils-async")
+        return __EXECUTOR__
+
+
+async def __run_blocking__(func, *args, **kwargs):
+    """
+    Runs a blocking DSUtils function on the executor, raising a `DsutilsError` where it would exit the program.
+    The context of the calling task is copied, so its tracing spans apply to the call.
+    """
+    context = contextvars.copy_context()
+
+    def __blocking_call__():
+        with dsutils_raise_errors():
+            try:
+                return func(*args, **kwargs)
+            except SystemExit as e:
+                # Exiting a worker thread would stop the event loop awaiting it
+                raise DsutilsError(f"{func.__name__} exited with code {e.code}") from e
+
+    return await asyncio.get_running_loop().run_in_executor(__get_executor__(), context.run, __blocking_call__)
+
+
+async def async_start_experiment(name: str, description: str, project_root: str | None = None):
+    """
+    Creates a new experiment directory and notebook without blocking the event loop, see `start_experiment`.
+
+    Args:
+    ------
+        name (str): The name of the experiment.
+        description (str): The description of the experiment.
+        project_root (str, optional): The root directory of the project. Defaults to the project of the working directory.
+
+    Returns:
+    ------
+        str: The path to the newly created experiment directory.
+
+    Raises:
+    ------
+        ValueError: If any arguments are invalid.
+        FileNotFoundError: If the experiments directory does not exist.
+        FileExistsError: If the experiment already exists.
+        DsutilsError: If the project has not been set up.
+    """
+    return await __run_blocking__(start_experiment, name, description, interactive=False, project_root=project_root)
+
+
+async def async_start_experiments(specs: list[dict] | dict, workers: int | None = None, project_root: str | None = None):
+    """
+    Creates many experiments at once without blocking the event loop, see `start_experiments`.
+
+    Returns:
+    ------
+        list[dict]: The `name`, `description`, `path` and `notebook` path of every created experiment.
+    """
+    return await __run_blocking__(start_experiments, specs, workers, project_root=project_root)
+
+
+async def async_add_source(name: str, description: str, url: str, citation: str, project_root: str | None = None):
+    """
+    Adds a new source entry to the sources file without blocking the event loop, see `add_source`.
+
+    Args:
+    ------
+        name (str): The name of the source.
+        description (str): The description of the source.
+        url (str): The url of the source.
+        citation (str): The citation of the source.
+        project_root (str, optional): The root directory of the project. Defaults to the project of the working directory.
+
+    Returns:
+    ------
+        str: The row appended to the sources file.
+
+    Raises:
+    ------
+        ValueError: If any arguments are invalid.
+        DsutilsError: If the project has not been set up.
+    """
+    return await __run_blocking__(add_source, name, description, url, citation, interactive=False, project_root=project_root)
+
+
+async def async_add_sources_bulk(sources: Iterable[dict], project_root: str | None = None):
+    """
+    Adds many sources to the sources file at once without blocking the event loop, see `add_sources_bulk`.
+
+    Returns:
+    ------
+        BulkImportReport: The appended rows and the errors of the rejected sources.
+    """
+    return await __run_blocking__(add_sources_bulk, sources, project_root=project_root)
+
+
+async def async_create_files_and_folders(project_root: str | None = None):
+    """
+    Creates the files and folders provided by DSUtils without blocking the event loop, see `create_files_and_folders`.
+
+    Args:
+    ------
+        project_root (str, optional): The root directory of the project. Defaults to `dsutils_get_project_root()`.
+
+    Returns:
+    ------
+        list[str]: A list of the paths to the files and folders that were created.
+
+    Raises:
+    ------
+        DsutilsError: If a file or folder could not be created, after removing the ones that were.
+    """
+    return await __run_blocking__(create_files_and_folders, project_root)
@@ -5,20 +5,38 @@ if __name__ == "__main__":
     sys.path.insert(0, dsutils_path)
 
 from dsutils.internals import *
+from dsutils.layout import LayoutEntry, get_layout_plan
+import errno
+import glob
 import json
+import shutil
+import socket
+import tempfile
+
+
+# Version of the files and folders layout, recorded for every project in the project registry.
+# Increase it when files_and_folders.json changes in a way existing projects need to be migrated for.
+LAYOUT_VERSION = 1
+
+# Files and folders are built in a staging directory in the project root, so they can be moved into place with a rename
+STAGING_PREFIX = ".dsutils-staging-"
+JOURNAL_FILE = "journal"
+JOURNAL_VERSION = 1
 
 
 def __get_files_and_folders_from_json__(project_root: str | None = None):
     """
     Returns a dictionary of the files and folders that need to be created.
 
+    The layout is compiled from `files_and_folders.json` and the layout schemas extending it only once, see `get_layout_plan()`.
+
     The dictionary has the following structure:
     ```json
     {
         "file_or_folder": {
             "path": "<path to file or folder>",
             "isFile": "<true if file, false if folder>",
-            "fileContents": "<contents of file, either as string or list. empty string if file content is not applicable>"
+            "fileContents": "<contents of file as a string. empty string if file content is not applicable>"
         },
         ...
     }
@@ -26,21 +44,7 @@ def __get_files_and_folders_from_json__(project_root: str | None = None):
     if project_root is None:
         project_root = dsutils_get_project_root()
 
-    with open(os.path.join(os.path.dirname(__file__), "files_and_folders.json"), "r") as file:
-        files_and_folders = json.load(file)
-
-    for f in files_and_folders:
-        # Add the project root to the path
-        files_and_folders[f]["path"] = project_root + str(files_and_folders[f]["path"]).replace("/", os.sep)
-        # Parse the file contents
-        if bool(files_and_folders[f]['isFile']):
-            # We assume that the file contents are a list of strings or a string
-            # A test case for this is in tests/create_files_and_folders_test.py
-            # As such, we need to convert the list to a string
-            if isinstance(files_and_folders[f]['fileContents'], list):
-                files_and_folders[f]['fileContents'] = "\n".join(files_and_folders[f]['fileContents'])
-
-    return files_and_folders
+    return get_layout_plan(project_root).files_and_folders(project_root)
 
 
 def __remove_files_and_folders__(project_root: str | None = None):
@@ -58,37 +62,219 @@ def __remove_files_and_folders__(project_root: str | None = None):
     if project_root is None:
         project_root = dsutils_get_project_root()
     elif not os.path.exists(project_root) or not os.path.isdir(project_root):
-        dsutils_error(f"Project root does not exist or is not a directory: {project_root}")
-        dsutils_error("Please enter a valid project root.")
-        dsutils_error("Aborting...")
-        sys.exit(1)
+        dsutils_exit(
+            f"Project root does not exist or is not a directory: {project_root}",
+            "Please enter a valid project root.",
+            "Aborting...",
+        )
 
-    files_and_folders = __get_files_and_folders_from_json__(project_root)
-    # Sort the files and folders such that:
-    # 1. Files are removed before folders
-    # 2. Files and folders are removed from the deepest path to the shallowest path
-    # Deepest meaning the path with the most subdirectories, i.e. path with the most os.sep
-    files_and_folders = {
-        k: v for k, v in sorted(files_and_folders.items(), key=lambda item: (not item[1]["isFile"], item[1]["path"].count(os.sep)), reverse=True)
-    }
+    # Remove the entries in reverse creation order, so files and folders are removed before the folders they are in
+    plan = get_layout_plan(project_root)
 
     dsutils_warn("Removing files and folders...")
-    for f in files_and_folders:
+    for entry in reversed(plan.ordered):
+        path = entry.resolve(project_root)
         try:
-            if os.path.isfile(files_and_folders[f]["path"]):
-                os.remove(files_and_folders[f]["path"])
-            elif os.path.isdir(files_and_folders[f]["path"]):
-                os.rmdir(files_and_folders[f]["path"])
+            if os.path.isfile(path):
+                os.remove(path)
+            elif os.path.isdir(path):
+                os.rmdir(path)
         except Exception as e:
-            dsutils_error(f"Failed to remove {files_and_folders[f]['path']}")
+            dsutils_error(f"Failed to remove {path}")
             dsutils_error(e)
 
 
+#region Transactions
+def __is_process_alive__(pid: int):
+    """
+    Returns whether the process with the given id is still running. On Windows every process is assumed to be running,
+    as signalling it would terminate it.
+    """
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def __read_journal__(staging_dir: str):
+    """
+    Returns the header of the journal in the staging directory and the paths it records as created, or None if it can not be read.
+    """
+    try:
+        with open(os.path.join(staging_dir, JOURNAL_FILE), "r") as f:
+            entries = [ json.loads(line) for line in f if line.strip() != "" ]
+    except (OSError, ValueError):
+        return None
+    if len(entries) == 0 or entries[0].get("version") != JOURNAL_VERSION:
+        return None
+    return entries[0], [ entry["path"] for entry in entries[1:] ]
+
+
+def __rollback__(created: list[str]):
+    """
+    Removes the files and folders that were moved into the project, in reverse order.
+    Only paths recorded in the journal are removed, so files and folders that existed before are never touched.
+    """
+    for path in reversed(created):
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            elif os.path.lexists(path):
+                os.remove(path)
+        except OSError as e:
+            dsutils_error(f"Failed to remove {path}")
+            dsutils_error(e)
+
+
+def __recover_stale_transactions__(project_root: str):
+    """
+    Rolls back the transactions of processes on this host that stopped before committing, e.g. because they were killed.
+    Transactions of processes that are still running, or of other hosts, are left alone.
+    """
+    for staging_dir in glob.glob(os.path.join(glob.escape(project_root), STAGING_PREFIX + "*")):
+        journal = __read_journal__(staging_dir)
+        if journal is not None:
+            header, created = journal
+            if header.get("host") != socket.gethostname() or __is_process_alive__(header.get("pid", -1)):
+                continue
+            dsutils_warn(f"Rolling back an unfinished setup of {project_root}")
+            __rollback__(created)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def __move_root__(project_root: str, path: str):
+    """
+    Returns the shallowest directory, or file, on the way from the project root to the path that does not exist yet.
+    Moving it into place moves the whole missing part of the tree with a single rename.
+    """
+    parent = os.path.dirname(path)
+    while parent != project_root and len(parent) > len(project_root) and not os.path.isdir(parent):
+        path, parent = parent, os.path.dirname(parent)
+    return path
+
+
+def __move_no_replace__(source: str, destination: str):
+    """
+    Moves a staged file or folder to a path that does not exist, failing with `FileExistsError` instead of replacing
+    a file or empty folder another process created there since it was checked, as `os.rename()` would on POSIX.
+    """
+    if os.name == "nt":
+        # Renaming never replaces an existing path on Windows
+        os.rename(source, destination)
+        return
+
+    if os.path.isdir(source):
+        # Claim the path with an empty folder, which the rename replaces, but fails if anything was put in it since
+        os.mkdir(destination)
+        try:
+            os.rename(source, destination)
+        except OSError as e:
+            try:
+                os.rmdir(destination)
+            except OSError:
+                pass
+            if e.errno in (errno.EEXIST, errno.ENOTEMPTY, errno.ENOTDIR):
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), destination) from e
+            raise
+        return
+
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        # The file system does not support hard links, claim the path with an empty file instead
+        os.close(os.open(destination, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        os.replace(source, destination)
+        return
+    os.remove(source)
+
+
+def __scaffold__(project_root: str, missing: list[LayoutEntry], span):
+    """
+    Builds the missing files and folders in a staging directory and moves them into the project.
+
+    Every path is recorded in a journal before it is moved. Committing removes the journal; if anything fails before that,
+    exactly the recorded paths are removed again, so the project is left as it was.
+
+    Args:
+    ------
+        project_root (str): The root directory of the project.
+        missing (list[LayoutEntry]): The entries that do not exist yet, in creation order, see `LayoutPlan.diff()`.
+
+    Returns:
+    ------
+        list[str]: The paths that were moved into the project.
+    """
+    if len(missing) == 0:
+        return []
+
+    staging_dir = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=project_root)
+    staging_tree = os.path.join(staging_dir, "tree")
+    created: list[str] = []
+    try:
+        #region Build the tree in the staging directory
+        move_roots: dict[str, str] = dict()
+        for entry in missing:
+            path = entry.resolve(project_root)
+            staged_path = staging_tree + path[len(project_root):]
+            if entry.is_file:
+                os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+                with open(staged_path, "w") as file:
+                    file.write(entry.contents)
+                span.add_file(len(entry.contents))
+            else:
+                os.makedirs(staged_path, exist_ok=True)
+                span.add_file()
+            # Entries come after their parent, so a missing parent folder already has its move root
+            parent = entry.path.rsplit("/", 1)[0]
+            move_roots[entry.path] = move_roots[parent] if parent in move_roots else __move_root__(project_root, path)
+        move_roots = list(dict.fromkeys(move_roots.values()))
+        #endregion
+
+        #region Move the tree into place
+        # The journal must be on disk before any path exists, or a crash could leave paths behind unrecorded.
+        # Every path is written up front, so a single sync is needed however many paths are moved.
+        with open(os.path.join(staging_dir, JOURNAL_FILE), "w") as journal:
+            journal.write(json.dumps({ "version": JOURNAL_VERSION, "pid": os.getpid(), "host": socket.gethostname(), "project_root": project_root }) + "\n")
+            journal.write("".join([ json.dumps({ "path": move_root }) + "\n" for move_root in move_roots ]))
+            journal.flush()
+            os.fsync(journal.fileno())
+        for move_root in move_roots:
+            try:
+                __move_no_replace__(staging_tree + move_root[len(project_root):], move_root)
+            except FileExistsError as e:
+                raise FileExistsError(errno.EEXIST, "Created by another process while setting up the project", move_root) from e
+            created.append(move_root)
+        #endregion
+
+        # Commit
+        os.remove(os.path.join(staging_dir, JOURNAL_FILE))
+    except BaseException:
+        __rollback__(created)
+        raise
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    for entry in missing:
+        dsutils_success(f"\t{entry.resolve(project_root)}")
+    return created
+#endregion
+
+
 def create_files_and_folders(project_root: str | None = None):
     """
-    Creates the files and folders provided by DSUtils. For more information on the files and folders, see the `files_and_folders.json` file.
+    Creates the files and folders provided by DSUtils. For more information on the files and folders, see the `files_and_folders.json` file
+    and the layout schemas extending it, see `get_layout_plan()`.
 
     If a file or folder already exists, it is not overwritten.
+    The missing files and folders are built in a staging directory and moved into the project, see `__scaffold__()`.
+    If that fails, the files and folders that were moved are removed again and the program exits, see `dsutils_exit()`.
 
     Args:
     -----
@@ -100,37 +286,31 @@ def create_files_and_folders(project_root: str | None = None):
     """
     if project_root is None:
         project_root = dsutils_get_project_root()
-
-    files_and_folders = __get_files_and_folders_from_json__(project_root)
-    paths: list[str] = []
+    elif str(project_root).strip() == "" or not os.path.isdir(project_root):
+        dsutils_exit(
+            f"Project root does not exist or is not a directory: {project_root}",
+            "Please enter a valid project root.",
+            "Aborting...",
+        )
+    project_root = os.path.abspath(project_root)
 
     try:
-        dsutils_info("Creating files and folders...")
-        for f in files_and_folders:
-            if os.path.isfile(files_and_folders[f]['path']) or os.path.isdir(files_and_folders[f]['path']):
-                dsutils_warn(f"\t{files_and_folders[f]['path']} (already exists)")
-            else:
-                if bool(files_and_folders[f]['isFile']):
-                    if isinstance(files_and_folders[f]['fileContents'], list):
-                        files_and_folders[f]['fileContents'] = "\n".join(files_and_folders[f]['fileContents'])
+        plan = get_layout_plan(project_root)
 
-                    with open(files_and_folders[f]['path'], "w") as file:
-                        file.write(files_and_folders[f]['fileContents'])
-                else:
-                    os.mkdir(files_and_folders[f]['path'])
-                dsutils_success(f"\t{files_and_folders[f]['path']}")
-
-            paths.append(str(files_and_folders[f]['path']))
+        dsutils_info("Creating files and folders...")
+        __recover_stale_transactions__(project_root)
+        diff = plan.diff(project_root)
+        for entry in diff.existing + diff.conflicting:
+            dsutils_warn(f"\t{entry.resolve(project_root)} (already exists)")
+        with dsutils_span("filesystem_writes") as span:
+            __scaffold__(project_root, diff.missing, span)
 
-        return paths
+        return [ entry.resolve(project_root) for entry in plan.entries ]
     except KeyboardInterrupt:
         dsutils_error("KeyboardInterrupt")
-        __remove_files_and_folders__()
         sys.exit(1)
     except Exception as e:
-        dsutils_error(e)
-        __remove_files_and_folders__()
-        sys.exit(1)
+        dsutils_exit(e)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,283 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dsutils.daemon_client import SOCKET_FILE, DaemonNotRunningError, find_daemon, request
+from dsutils.experiment_catalogue import get_experiment_catalogue
+from dsutils.sources_registry import get_sources_registry
+import asyncio
+import importlib
+import json
+import signal
+import socket
+import time
+
+
+# Requests and responses are single JSON lines, at most this long
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+# Command line scripts that can be forwarded to the daemon, mapped to their module
+COMMANDS = {
+    "add_source": "dsutils.add_source",
+    "start_experiment": "dsutils.start_experiment",
+}
+# Arguments of the command line scripts that are paths, resolved against the working directory of the client
+PATH_ARGUMENTS = ("from_file", "report", "spec", "manifest")
+
+# Operations that only read in-memory state, cheap enough to run on the event loop rather than a worker thread
+INLINE_OPERATIONS = ("ping", "env", "path")
+
+PATHS = {
+    "project_root": dsutils_get_project_root,
+    "artifacts_dir": dsutils_get_artifacts_dir,
+    "data_dir": dsutils_get_data_dir,
+    "data_processed_dir": dsutils_get_data_processed_dir,
+    "data_raw_dir": dsutils_get_data_raw_dir,
+    "experiments_dir": dsutils_get_experiments_dir,
+    "sources_file": dsutils_get_sources_file,
+}
+
+
+class __UsageError__(Exception):
+    """
+    Raised instead of exiting when the arguments of a forwarded command line call cannot be parsed.
+    """
+
+
+def __raise_usage_error__(message: str):
+    raise __UsageError__(message)
+
+
+class DsutilsDaemon:
+    """
+    Serves requests for one project over a Unix domain socket, keeping its environment, sources index and experiment catalogue warm in memory.
+
+    Every request is a JSON line `{"op": ..., "args": {...}}`, answered with a JSON line `{"ok": true, "result": ...}`
+    or `{"ok": false, "error": {"type": ..., "message": ...}}`. Operations that touch the filesystem run on worker threads, one at a time per connection.
+
+    Operations:
+    ------
+        ping: Returns the `pid`, `project_root`, `uptime` and number of `requests` served.
+        env: Returns the environment variables of the project.
+        path: Returns the path of `key`, one of the keys of `PATHS`.
+        add_source, add_sources_bulk, start_experiment, start_experiments: Call the function of the same name with the given arguments, never prompting.
+        command: Runs a command line script, see `dsutils.daemon_client.forward_command`.
+        shutdown: Stops the daemon.
+    """
+
+    def __init__(self, project_root: str | None = None):
+        if project_root is None:
+            project_root = dsutils_get_project_root()
+        self.project_root = os.path.abspath(project_root)
+        self.socket_path = os.path.join(self.project_root, SOCKET_FILE)
+        self.requests = 0
+        self._started = time.monotonic()
+        self._stopped: asyncio.Event | None = None
+        # The tasks serving the open connections, cancelled on shutdown
+        self._connections: set[asyncio.Task] = set()
+
+    def warm(self):
+        """
+        Loads the environment, sources index and experiment catalogue of the project.
+        """
+        dsutils_read_env()
+        if os.path.isfile(dsutils_get_sources_file()):
+            get_sources_registry().refresh()
+        if os.path.isdir(dsutils_get_experiments_dir()):
+            get_experiment_catalogue().names()
+
+    async def serve(self):
+        """
+        Serves requests until a `shutdown` request or SIGINT/SIGTERM, then removes the socket.
+
+        Raises:
+        ------
+            RuntimeError: If another daemon is already serving the project.
+        """
+        # Project discovery of the getters starts from the working directory
+        os.chdir(self.project_root)
+        self.__remove_stale_socket__()
+        self.warm()
+
+        self._stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stopped.set)
+            except (NotImplementedError, RuntimeError):
+                # Not available outside of the main thread
+                pass
+
+        # Bind relative to the project root, so long project paths do not exceed the socket path limit
+        server = await asyncio.start_unix_server(self.__handle_connection__, path=SOCKET_FILE, limit=MAX_MESSAGE_SIZE)
+        try:
+            dsutils_success(f"Serving {self.project_root} on {self.socket_path}")
+            dsutils_flush_logs()
+            async with server:
+                await self._stopped.wait()
+                server.close()
+                await self.__close_connections__()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            dsutils_info("DSUtils daemon stopped")
+
+    def __remove_stale_socket__(self):
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            request("ping", self.socket_path, timeout=1.0)
+        except (DaemonNotRunningError, OSError):
+            # Left behind by a daemon that did not shut down cleanly
+            os.remove(self.socket_path)
+            return
+        raise RuntimeError(f"A DSUtils daemon is already serving {self.project_root}")
+
+    async def __close_connections__(self):
+        """
+        Cancels the tasks serving the open connections and waits for their connections to be closed.
+        """
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def __handle_connection__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.__dispatch__(line)
+                writer.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # The daemon is shutting down, see __close_connections__()
+            pass
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def __dispatch__(self, line: bytes):
+        self.requests += 1
+        try:
+            message = json.loads(line)
+            op, args = message["op"], message.get("args", {})
+            if op == "shutdown":
+                self._stopped.set()
+                return { "ok": True, "result": None }
+            handler = getattr(self, f"op_{op}", None)
+            if handler is None:
+                raise ValueError(f"Unknown operation '{op}'")
+            if op == "command":
+                return await asyncio.to_thread(handler, **args)
+            if op in INLINE_OPERATIONS:
+                return { "ok": True, "result": handler(**args) }
+            return { "ok": True, "result": await asyncio.to_thread(handler, **args) }
+        except SystemExit as e:
+            return { "ok": False, "error": { "type": "SystemExit", "message": str(e.code) } }
+        except Exception as e:
+            return { "ok": False, "error": { "type": type(e).__name__, "message": str(e) } }
+
+    #region Operations
+    def op_ping(self):
+        return { "pid": os.getpid(), "project_root": self.project_root, "uptime": time.monotonic() - self._started, "requests": self.requests }
+
+    def op_env(self):
+        return dsutils_read_env()
+
+    def op_path(self, key: str):
+        if key not in PATHS:
+            raise ValueError(f"Unknown path '{key}', expected one of: {', '.join(PATHS)}")
+        return PATHS[key]()
+
+    def op_add_source(self, **kwargs):
+        from dsutils.add_source import add_source
+        return add_source(**kwargs, interactive=False)
+
+    def op_add_sources_bulk(self, sources: list[dict]):
+        from dsutils.add_source import add_sources_bulk
+        return add_sources_bulk(sources).to_dict()
+
+    def op_start_experiment(self, **kwargs):
+        from dsutils.start_experiment import start_experiment
+        return start_experiment(**kwargs, interactive=False)
+
+    def op_start_experiments(self, specs: list[dict] | dict, workers: int | None = None):
+        from dsutils.start_experiment import start_experiments
+        return start_experiments(specs, workers)
+
+    def op_command(self, command: str, argv: list[str], cwd: str):
+        """
+        Runs a command line script non-interactively. The messages it logs are returned rather than printed,
+        and `fallback` is set when the client has to run the script itself, i.e. when its arguments cannot be parsed.
+        """
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command '{command}', expected one of: {', '.join(COMMANDS)}")
+        module = importlib.import_module(COMMANDS[command])
+
+        parser = module.__build_parser__()
+        parser.error = __raise_usage_error__
+        try:
+            args = parser.parse_args(argv)
+        except __UsageError__:
+            # Let the client print the usage, as argparse would
+            return { "ok": False, "fallback": True }
+        for key in PATH_ARGUMENTS:
+            if getattr(args, key, None) is not None:
+                setattr(args, key, os.path.join(cwd, getattr(args, key)))
+
+        with dsutils_capture_logs() as messages:
+            try:
+                module.__run__(args, interactive=False)
+                return { "ok": True, "result": 0, "messages": messages }
+            except SystemExit as e:
+                return { "ok": True, "result": e.code if isinstance(e.code, int) else 1, "messages": messages }
+            except Exception as e:
+                return { "ok": False, "error": { "type": type(e).__name__, "message": str(e) }, "messages": messages }
+    #endregion
+
+
+def main(argv: list[str] | None = None):
+    """
+    Command line entry point of `python -m dsutils serve`, serving the project in the foreground until interrupted.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m dsutils serve", description='Serves DSUtils requests for a project over a Unix domain socket.')
+    parser.add_argument('-p', '--projectroot', default=None, help='The root directory of the project. Defaults to the project of the working directory.')
+    parser.add_argument('-s', '--stop', action='store_true', help='Stops the daemon serving the project instead.')
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        socket_path = find_daemon(args.projectroot)
+        try:
+            if socket_path is None:
+                raise DaemonNotRunningError(socket_path)
+            request("shutdown", socket_path)
+        except DaemonNotRunningError:
+            dsutils_warn("No DSUtils daemon is serving this project.")
+        return
+
+    if not hasattr(socket, "AF_UNIX"):
+        dsutils_error("The DSUtils daemon requires Unix domain sockets, which are not available on this platform.")
+        sys.exit(1)
+    try:
+        asyncio.run(DsutilsDaemon(args.projectroot).serve())
+    except RuntimeError as e:
+        dsutils_error(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Client of the DSUtils daemon, see `dsutils.daemon`.
+
+Only the standard library is imported here, so forwarding a command line call to a running daemon
+does not pay for importing the rest of DSUtils.
+"""
+import builtins
+import json
+import os
+import socket
+import sys
+import time
+
+
+# The socket of a running daemon, created in the root directory of the project it serves
+SOCKET_FILE = ".dsutils.sock"
+# Same as `dsutils.internals.ENV_FILE`, which is not imported to keep this module light
+ENV_FILE_NAME = ".dsutils.env"
+TIMEOUT = 60.0
+# Command line scripts forwarded to the daemon run as long as they do locally, e.g. a bulk import, so their response is waited for without a timeout
+COMMAND_TIMEOUT = None
+# Number of seconds to wait for the daemon to accept a connection
+CONNECT_TIMEOUT = 5.0
+# Longest path accepted by connect() for a Unix domain socket, longer paths are connected to relative to the working directory
+MAX_SOCKET_PATH = 100
+
+
+class DaemonError(RuntimeError):
+    """
+    Raised when the daemon fails a request with an exception that is not a builtin exception.
+    """
+
+
+class DaemonNotRunningError(ConnectionError):
+    """
+    Raised when there is no daemon serving the project.
+    """
+
+
+def find_daemon(start: str | None = None):
+    """
+    Finds the socket of the daemon serving the project containing `start`, walking up like the project root discovery does.
+
+    Args:
+    ------
+        start (str, optional): The directory to start searching from. Defaults to `os.getcwd()`.
+
+    Returns:
+    ------
+        str | None: The path to the socket, or None if the project has no daemon running.
+    """
+    directory = os.path.abspath(os.getcwd() if start is None else start)
+    while True:
+        candidate = os.path.join(directory, SOCKET_FILE)
+        if os.path.exists(candidate):
+            return candidate
+        # Stop at the root of the nearest project, a daemon of an enclosing project does not serve it
+        if os.path.isfile(os.path.join(directory, ENV_FILE_NAME)):
+            return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def __send__(socket_path: str, message: dict, timeout: float | None = TIMEOUT):
+    """
+    Sends one newline-delimited JSON message to the daemon and returns its response, waiting at most `timeout` seconds, or indefinitely when None.
+    """
+    if len(socket_path) > MAX_SOCKET_PATH:
+        socket_path = os.path.relpath(socket_path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT if timeout is None else min(timeout, CONNECT_TIMEOUT))
+        sock.connect(socket_path)
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    if len(chunks) == 0:
+        raise ConnectionError("The DSUtils daemon closed the connection without responding.")
+    return json.loads(b"".join(chunks))
+
+
+def __raise_error__(error: dict):
+    """
+    Raises the exception a request failed with in the daemon, as the builtin exception type of the same name when there is one.
+    """
+    exception_type = getattr(builtins, error["type"], None)
+    if isinstance(exception_type, type) and issubclass(exception_type, Exception):
+        raise exception_type(error["message"])
+    raise DaemonError(f"{error['type']}: {error['message']}")
+
+
+def request(op: str, socket_path: str | None = None, timeout: float = TIMEOUT, **args):
+    """
+    Sends a request to the daemon serving the project of the working directory. See `dsutils.daemon.DsutilsDaemon` for the available operations.
+
+    Args:
+    ------
+        op (str): The operation, e.g. `"start_experiment"`.
+        socket_path (str, optional): The socket of the daemon. Defaults to `find_daemon()`.
+        timeout (float, optional): The number of seconds to wait for the daemon. Defaults to `TIMEOUT`.
+        **args: The arguments of the operation.
+
+    Returns:
+    ------
+        The result of the operation.
+
+    Raises:
+    ------
+        DaemonNotRunningError: If there is no daemon serving the project.
+        DaemonError: If the operation raised an exception that is not a builtin exception, builtin exceptions are raised as is.
+    """
+    if socket_path is None:
+        socket_path = find_daemon()
+        if socket_path is None:
+            raise DaemonNotRunningError("No DSUtils daemon is serving this project, start one with `python -m dsutils serve`.")
+
+    try:
+        response = __send__(socket_path, { "op": op, "args": args }, timeout)
+    except (ConnectionRefusedError, FileNotFoundError) as e:
+        raise DaemonNotRunningError(f"The DSUtils daemon is not running: {e}") from e
+    if not response["ok"]:
+        __raise_error__(response["error"])
+    return response["result"]
+
+
+def __print_message__(level: int, message: str):
+    """
+    Prints a message logged by the daemon in the format of the DSUtils console, without colours.
+    """
+    stream = sys.stderr if level >= 40 else sys.stdout
+    stream.write(f"[DSUTILS | {time.strftime('%H:%M:%S')}]: {message}\n")
+
+
+def forward_command(command: str, argv: list[str]):
+    """
+    Runs a command line script in the daemon serving the project of the working directory, printing the messages it logged.
+
+    Args:
+    ------
+        command (str): The script, e.g. `"add_source"`.
+        argv (list[str]): The command line arguments of the script.
+
+    Returns:
+    ------
+        int | None: The exit code of the script, or None when it has to be run locally instead:
+        when no daemon is running, forwarding is disabled with the `DSUTILS_NO_DAEMON` environment variable,
+        help is requested, the arguments cannot be parsed, or the arguments are invalid and the user can be prompted to rectify them.
+    """
+    if os.environ.get("DSUTILS_NO_DAEMON", "") not in ("", "0") or "-h" in argv or "--help" in argv:
+        return None
+    socket_path = find_daemon()
+    if socket_path is None:
+        return None
+
+    try:
+        response = __send__(socket_path, { "op": "command", "args": { "command": command, "argv": argv, "cwd": os.getcwd() } }, COMMAND_TIMEOUT)
+    except (ConnectionRefusedError, FileNotFoundError):
+        # A socket left behind by a daemon that did not shut down cleanly
+        return None
+    except (OSError, ValueError) as e:
+        # The command may have run in part, so it is not run again locally
+        __print_message__(40, f"Lost the connection to the DSUtils daemon while running {command}: {str(e) or type(e).__name__}")
+        return 1
+
+    if response.get("fallback"):
+        return None
+    if not response["ok"] and response["error"]["type"] == "ValueError" and sys.stdin.isatty():
+        return None
+
+    for level, message in response.get("messages", []):
+        __print_message__(level, message)
+    if not response["ok"]:
+        __print_message__(40, f"{response['error']['type']}: {response['error']['message']}")
+        return 1
+    return response["result"]
@@ -0,0 +1,251 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+import csv
+import json
+import shutil
+try:
+    import numpy as np
+except ImportError:
+    # Optional dependency, only required by load_dataset()
+    np = None
+
+
+DATASETS_DIR = ".datasets"
+META_FILE = "meta.json"
+META_VERSION = 1
+CHUNK_ROWS = 65536
+
+# Inferred column kinds, in the order a column is widened to
+__INT__, __FLOAT__, __STR__ = 0, 1, 2
+# Range of the integer columns, stored as int64
+INT_MIN, INT_MAX = -2**63, 2**63 - 1
+
+
+def __require_numpy__():
+    if np is None:
+        raise ImportError("load_dataset() requires numpy, install it with `pip install numpy`.")
+
+
+def __raw_path__(name: str, raw_dir: str):
+    if os.path.splitext(name)[1] == "":
+        name += ".csv"
+    return os.path.join(raw_dir, name)
+
+
+def __cache_path__(name: str, processed_dir: str):
+    return os.path.join(processed_dir, DATASETS_DIR, os.path.splitext(name)[0])
+
+
+def __source_signature__(path: str):
+    stat = os.stat(path)
+    return { "size": stat.st_size, "mtime_ns": stat.st_mtime_ns }
+
+
+def __read_meta__(cache_path: str):
+    try:
+        with open(os.path.join(cache_path, META_FILE), "r") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != META_VERSION:
+        return None
+    return meta
+
+
+def __infer_columns__(raw_path: str):
+    """
+    Reads the CSV once to infer the header, the number of rows and the dtype of every column.
+
+    A column is an integer column if all its values parse as integers that fit in an int64, a float column if they parse as floats
+    (an empty value in a numeric column becomes NaN), and a string column otherwise. Integers too large for an int64, e.g. long IDs,
+    make their column a string column rather than a float column, so they are not rounded.
+    """
+    with open(raw_path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"Dataset has no header: {raw_path}")
+        if len(set(header)) != len(header):
+            raise ValueError(f"Dataset has duplicate column names: {raw_path}")
+
+        kinds = [ __INT__ ] * len(header)
+        missing = [ False ] * len(header)
+        widths = [ 1 ] * len(header)
+        rows = 0
+        for row in reader:
+            if len(row) == 0:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"Dataset row {reader.line_num} has {len(row)} values, expected {len(header)}: {raw_path}")
+            rows += 1
+            for i, value in enumerate(row):
+                if len(value) > widths[i]:
+                    widths[i] = len(value)
+                if value == "":
+                    missing[i] = True
+                    continue
+                if kinds[i] == __INT__:
+                    try:
+                        number = int(value)
+                    except ValueError:
+                        kinds[i] = __FLOAT__
+                    else:
+                        if INT_MIN <= number <= INT_MAX:
+                            continue
+                        kinds[i] = __STR__
+                if kinds[i] == __FLOAT__:
+                    try:
+                        float(value)
+                    except ValueError:
+                        kinds[i] = __STR__
+
+    dtypes = []
+    for kind, has_missing, width in zip(kinds, missing, widths):
+        if kind == __STR__:
+            dtypes.append(np.dtype(f"<U{width}"))
+        elif kind == __FLOAT__ or has_missing:
+            dtypes.append(np.dtype("<f8"))
+        else:
+            dtypes.append(np.dtype("<i8"))
+    return header, rows, dtypes
+
+
+def __convert_value__(dtype):
+    if dtype.kind == "i":
+        return int
+    if dtype.kind == "f":
+        return lambda value: float(value) if value != "" else np.nan
+    return str
+
+
+def __convert__(raw_path: str, cache_path: str):
+    """
+    Converts a CSV into one `.npy` file per column in `cache_path`.
+
+    The CSV is streamed twice, first to infer the dtypes and then to fill the column files in chunks of rows,
+    so files larger than memory can be converted. The cache is built in a temporary directory and moved into place when complete.
+    """
+    signature = __source_signature__(raw_path)
+    header, rows, dtypes = __infer_columns__(raw_path)
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    try:
+        columns = [ np.lib.format.open_memmap(os.path.join(tmp_path, f"{i}.npy"), mode="w+", dtype=dtype, shape=(rows,)) for i, dtype in enumerate(dtypes) ]
+        converters = [ __convert_value__(dtype) for dtype in dtypes ]
+
+        with open(raw_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader)
+            start = 0
+            chunk = [ [] for _ in header ]
+            for row in reader:
+                if len(row) == 0:
+                    continue
+                for i, value in enumerate(row):
+                    chunk[i].append(converters[i](value))
+                if len(chunk[0]) == CHUNK_ROWS:
+                    for column, values in zip(columns, chunk):
+                        column[start:start + len(values)] = values
+                    start += CHUNK_ROWS
+                    chunk = [ [] for _ in header ]
+            if len(header) > 0 and len(chunk[0]) > 0:
+                for column, values in zip(columns, chunk):
+                    column[start:start + len(values)] = values
+
+        for column in columns:
+            column.flush()
+        del columns
+
+        meta = {
+            "version": META_VERSION,
+            "source": signature,
+            "rows": rows,
+            "columns": [ { "name": name, "dtype": dtype.str } for name, dtype in zip(header, dtypes) ],
+        }
+        with open(os.path.join(tmp_path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=4)
+
+        shutil.rmtree(cache_path, ignore_errors=True)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return meta
+
+
+def load_dataset(name: str, columns: list[str] | None = None, raw_dir: str | None = None, processed_dir: str | None = None):
+    """
+    Loads a raw CSV dataset as memory-mapped NumPy arrays, one per column.
+
+    On first access the CSV is converted into a columnar cache of `.npy` files under `data/processed/.datasets/`.
+    Later loads memory-map the cache, so they are near instant and only read the pages that are actually used.
+    The cache is rebuilt automatically when the size or modification time of the raw file changed.
+
+    Example:
+    ------
+    ```python
+    sales = load_dataset("sales")                          # data/raw/sales.csv
+    df = pd.DataFrame(load_dataset("sales", ["price"]))
+    ```
+
+    Args:
+    ------
+        name (str): The path of the CSV relative to the raw data directory. The `.csv` extension may be omitted.
+        columns (list[str], optional): The columns to load. Defaults to all columns.
+        raw_dir (str, optional): The raw data directory. Defaults to the one of the current project.
+        processed_dir (str, optional): The processed data directory. Defaults to the one of the current project.
+
+    Returns:
+    ------
+        dict[str, numpy.memmap]: The read-only columns, in the order of the CSV header.
+
+    Raises:
+    ------
+        ImportError: If numpy is not installed.
+        FileNotFoundError: If the raw file does not exist.
+        ValueError: If the raw file is not a valid CSV with a header, or a requested column does not exist.
+    """
+    __require_numpy__()
+    raw_dir = dsutils_get_data_raw_dir() if raw_dir is None else raw_dir
+    processed_dir = dsutils_get_data_processed_dir() if processed_dir is None else processed_dir
+
+    raw_path = __raw_path__(name, raw_dir)
+    cache_path = __cache_path__(name, processed_dir)
+    signature = __source_signature__(raw_path)
+
+    meta = __read_meta__(cache_path)
+    if meta is None or meta["source"] != signature:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with dsutils_file_lock(f"{cache_path}.lock"):
+            # Another process may have converted the dataset while we waited for the lock
+            meta = __read_meta__(cache_path)
+            if meta is None or meta["source"] != signature:
+                dsutils_info(f"Converting dataset {name} to a columnar cache...")
+                meta = __convert__(raw_path, cache_path)
+
+    names = [ column["name"] for column in meta["columns"] ]
+    if columns is not None:
+        unknown = [ column for column in columns if column not in names ]
+        if len(unknown) > 0:
+            raise ValueError(f"Dataset {name} has no columns: {', '.join(unknown)}")
+
+    dataset = dict()
+    for i, column in enumerate(names):
+        if columns is None or column in columns:
+            dataset[column] = np.load(os.path.join(cache_path, f"{i}.npy"), mmap_mode="r")
+    return dataset
+
+
+def invalidate_dataset(name: str, processed_dir: str | None = None):
+    """
+    Removes the columnar cache of a dataset, so it is converted again on the next load.
+    """
+    processed_dir = dsutils_get_data_processed_dir() if processed_dir is None else processed_dir
+    shutil.rmtree(__cache_path__(name, processed_dir), ignore_errors=True)
@@ -0,0 +1,302 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from datetime import datetime
+import json
+import threading
+import time
+
+
+CATALOGUE_VERSION = 1
+# The catalogue lives in its own hidden directory, so writing it does not change the modification time of the experiments directory
+CATALOGUE_DIR = ".catalogue"
+CATALOGUE_FILE = "catalogue.json"
+
+__CATALOGUES__: dict[str, "ExperimentCatalogue"] = dict()
+__CATALOGUES_LOCK__ = threading.Lock()
+
+
+class ExperimentCatalogue:
+    """
+    Persistent catalogue of the experiments in the experiments directory.
+
+    Every experiment is stored with its `name`, `created_at` timestamp, `description` and `path`, keyed by its lowercased name for O(1) case-insensitive lookups.
+    The catalogue only rescans the experiments directory when its modification time changed, i.e. when an experiment directory was added or removed.
+    """
+
+    def __init__(self, experiments_dir: str):
+        self.experiments_dir = str(experiments_dir)
+        self.catalogue_dir = os.path.join(self.experiments_dir, CATALOGUE_DIR)
+        self.catalogue_file = os.path.join(self.catalogue_dir, CATALOGUE_FILE)
+        self.lock_file = os.path.join(self.catalogue_dir, "catalogue.lock")
+
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict] = dict()
+        self._dir_mtime_ns = -1
+        self._file_signature = None
+
+    #region Persistence
+    def __load__(self):
+        """
+        Loads the catalogue from disk, if it changed since it was last loaded.
+        """
+        try:
+            stat = os.stat(self.catalogue_file)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._file_signature:
+            return
+
+        try:
+            with open(self.catalogue_file, "r") as f:
+                catalogue = json.load(f)
+        except (OSError, ValueError):
+            return
+        if catalogue.get("version") != CATALOGUE_VERSION:
+            return
+
+        self._entries = catalogue["experiments"]
+        self._dir_mtime_ns = int(catalogue["dir_mtime_ns"])
+        self._file_signature = signature
+
+    def __save__(self):
+        """
+        Atomically writes the catalogue to disk. Failing to write the catalogue is not fatal, it will be rebuilt on the next run.
+        """
+        catalogue = {
+            "version": CATALOGUE_VERSION,
+            "dir_mtime_ns": self._dir_mtime_ns,
+            "experiments": self._entries,
+        }
+        tmp_file = f"{self.catalogue_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(catalogue, f, separators=(",", ":"))
+            os.replace(tmp_file, self.catalogue_file)
+            stat = os.stat(self.catalogue_file)
+            self._file_signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+    #endregion
+
+    #region Indexing
+    def __rescan__(self):
+        """
+        Adds experiment directories that are not in the catalogue yet and drops entries whose directory no longer exists.
+
+        Only new directories are stat-ed, existing entries are kept as they are.
+        """
+        seen: set[str] = set()
+        with os.scandir(self.experiments_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                key = entry.name.lower()
+                seen.add(key)
+                if key not in self._entries:
+                    self._entries[key] = {
+                        "name": entry.name,
+                        "created_at": datetime.fromtimestamp(entry.stat().st_mtime).isoformat(timespec="seconds"),
+                        "description": "",
+                        "path": entry.name,
+                    }
+
+        for key in [ key for key in self._entries if key not in seen ]:
+            del self._entries[key]
+
+    def refresh(self):
+        """
+        Brings the catalogue up to date with the experiments directory.
+
+        Returns:
+        ------
+            ExperimentCatalogue: The catalogue itself, to allow chaining.
+
+        Raises:
+        ------
+            FileNotFoundError: If the experiments directory does not exist.
+        """
+        with self._lock:
+            dir_mtime_ns = os.stat(self.experiments_dir).st_mtime_ns
+            if dir_mtime_ns == self._dir_mtime_ns:
+                return self
+
+            os.makedirs(self.catalogue_dir, exist_ok=True)
+            with dsutils_file_lock(self.lock_file):
+                self.__load__()
+                # Creating the catalogue directory may itself have changed the modification time
+                dir_mtime_ns = os.stat(self.experiments_dir).st_mtime_ns
+                if dir_mtime_ns != self._dir_mtime_ns:
+                    self.__rescan__()
+                    self._dir_mtime_ns = dir_mtime_ns if time.time_ns() - dir_mtime_ns > RACY_WINDOW_NS else -1
+                    self.__save__()
+            return self
+
+    def register(self, name: str, description: str = "", created_at: datetime | None = None):
+        """
+        Adds or updates the entry of an experiment whose directory was just created.
+
+        Args:
+        ------
+            name (str): The name of the experiment directory.
+            description (str, optional): The description of the experiment. Defaults to "".
+            created_at (datetime, optional): When the experiment was created. Defaults to now.
+
+        Returns:
+        ------
+            dict: The catalogue entry of the experiment.
+        """
+        return self.register_many([ (name, description) ], created_at)[0]
+
+    def register_many(self, experiments: list[tuple[str, str]], created_at: datetime | None = None):
+        """
+        Adds or updates the entries of many experiments whose directories were just created, writing the catalogue once.
+
+        Args:
+        ------
+            experiments (list[tuple[str, str]]): The name and description of every experiment.
+            created_at (datetime, optional): When the experiments were created. Defaults to now.
+
+        Returns:
+        ------
+            list[dict]: The catalogue entries of the experiments.
+        """
+        if created_at is None:
+            created_at = datetime.now()
+        created_at = created_at.isoformat(timespec="seconds")
+
+        with self._lock:
+            self.refresh()
+            with dsutils_file_lock(self.lock_file):
+                self.__load__()
+                entries = []
+                for name, description in experiments:
+                    entry = { "name": name, "created_at": created_at, "description": description, "path": name }
+                    self._entries[name.lower()] = entry
+                    entries.append(dict(entry))
+                self.__save__()
+            return entries
+    #endregion
+
+    #region Queries
+    def __to_result__(self, entry: dict):
+        """
+        Returns a copy of a catalogue entry with its path made absolute.
+        """
+        result = dict(entry)
+        result["path"] = os.path.join(self.experiments_dir, entry["path"])
+        return result
+
+    def contains(self, name: str):
+        """
+        Returns True if an experiment with the given name exists, ignoring case.
+        """
+        self.refresh()
+        return name.lower() in self._entries
+
+    def __contains__(self, name: str):
+        return self.contains(name)
+
+    def get(self, name: str):
+        """
+        Returns the catalogue entry of the experiment with the given name, ignoring case, or None if it does not exist.
+        """
+        self.refresh()
+        entry = self._entries.get(name.lower())
+        return None if entry is None else self.__to_result__(entry)
+
+    def list(self, name_contains: str | None = None, description_contains: str | None = None, created_after: datetime | None = None, created_before: datetime | None = None):
+        """
+        Returns the catalogue entries matching every given filter, ordered by creation time.
+
+        Args:
+        ------
+            name_contains (str, optional): Only return experiments whose name contains this text, ignoring case.
+            description_contains (str, optional): Only return experiments whose description contains this text, ignoring case.
+            created_after (datetime, optional): Only return experiments created at or after this moment.
+            created_before (datetime, optional): Only return experiments created before this moment.
+
+        Returns:
+        ------
+            list[dict]: The matching catalogue entries.
+        """
+        self.refresh()
+
+        after = None if created_after is None else created_after.isoformat(timespec="seconds")
+        before = None if created_before is None else created_before.isoformat(timespec="seconds")
+        name_contains = None if name_contains is None else name_contains.lower()
+        description_contains = None if description_contains is None else description_contains.lower()
+
+        results = []
+        for key, entry in self._entries.items():
+            if name_contains is not None and name_contains not in key:
+                continue
+            if description_contains is not None and description_contains not in entry["description"].lower():
+                continue
+            if after is not None and entry["created_at"] < after:
+                continue
+            if before is not None and entry["created_at"] >= before:
+                continue
+            results.append(self.__to_result__(entry))
+
+        return sorted(results, key=lambda e: (e["created_at"], e["name"]))
+
+    def names(self):
+        """
+        Returns a snapshot of the lowercased names of all experiments.
+        """
+        self.refresh()
+        return set(self._entries)
+
+    def __len__(self):
+        self.refresh()
+        return len(self._entries)
+    #endregion
+
+
+def get_experiment_catalogue(experiments_dir: str | None = None):
+    """
+    Returns the process-wide `ExperimentCatalogue` of the given experiments directory.
+
+    Args:
+    ------
+        experiments_dir (str, optional): The path to the experiments directory. Defaults to `dsutils_get_experiments_dir()`.
+
+    Returns:
+    ------
+        ExperimentCatalogue: The catalogue of the experiments directory.
+    """
+    if experiments_dir is None:
+        experiments_dir = dsutils_get_experiments_dir()
+    experiments_dir = os.path.abspath(experiments_dir)
+
+    with __CATALOGUES_LOCK__:
+        catalogue = __CATALOGUES__.get(experiments_dir)
+        if catalogue is None:
+            catalogue = ExperimentCatalogue(experiments_dir)
+            __CATALOGUES__[experiments_dir] = catalogue
+    return catalogue
+
+
+def list_experiments(name_contains: str | None = None, description_contains: str | None = None, created_after: datetime | None = None, created_before: datetime | None = None):
+    """
+    Returns the experiments of the current project matching every given filter, ordered by creation time.
+
+    See `ExperimentCatalogue.list()` for the filters.
+
+    Returns:
+    ------
+        list[dict]: The `name`, `created_at`, `description` and absolute `path` of every matching experiment.
+    """
+    return get_experiment_catalogue().list(name_contains, description_contains, created_after, created_before)
+
+
+if __name__ == "__main__":
+    for experiment in list_experiments():
+        dsutils_info(f"{experiment['created_at']}  {experiment['name']}  {experiment['description']}")
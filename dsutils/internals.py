@@ -1,10 +1,72 @@
+import atexit
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import logging
 import os
 import sys
-from datetime import datetime
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, locks are then only held within the current process
+    fcntl = None
 
 
 ENV_FILE = "/.dsutils.env"
 
+__FILE_LOCKS__: dict[str, threading.Lock] = dict()
+__FILE_LOCKS_LOCK__ = threading.Lock()
+
+
+#region Errors
+class DsutilsError(Exception):
+    """
+    Raised instead of exiting the program when DSUtils cannot continue, e.g. because the project has not been set up.
+    Command line scripts log the error and exit instead, unless errors are raised in the current context, see `dsutils_raise_errors()`.
+    """
+
+
+__RAISE_ERRORS__: contextvars.ContextVar[bool] = contextvars.ContextVar("dsutils_raise_errors", default=False)
+
+
+@contextlib.contextmanager
+def dsutils_raise_errors():
+    """
+    Raises a `DsutilsError` within the context where DSUtils would otherwise log an error and exit the program,
+    e.g. when DSUtils is used by a long-running service. Only the current thread, or asyncio task, is affected.
+    """
+    token = __RAISE_ERRORS__.set(True)
+    try:
+        yield
+    finally:
+        __RAISE_ERRORS__.reset(token)
+
+
+def dsutils_exit(*messages: str):
+    """
+    Logs the messages as errors and exits the program, or raises a `DsutilsError` with them when errors are raised in the current context.
+
+    Args:
+    ------
+        *messages (str): The lines of the error.
+
+    Raises:
+    ------
+        DsutilsError: If errors are raised in the current context, see `dsutils_raise_errors()`.
+    """
+    if __RAISE_ERRORS__.get():
+        raise DsutilsError("\n".join(str(m) for m in messages))
+    for message in messages:
+        dsutils_error(message)
+    sys.exit(1)
+#endregion
+
 
 #region Console Methods
 class __LogOptions__:
@@ -45,16 +107,186 @@ def __parse_logoptions__(log_options: list[__LogOptions__] = []):
     return join_options
 
 
-def __dfutils_log__(message: str, log_options: list[__LogOptions__] = []):
+class __ConsoleHandler__(logging.Handler):
     """
-    Logs a message with the specified formatting log_options.
+    Logging handler writing DSUtils messages as `[DSUTILS | HH:MM:SS]: message` lines to stdout.
+
+    Lines are buffered and written when the buffer is full, when an error is logged, at most `LOG_FLUSH_INTERVAL` seconds
+    after being logged, before prompting for input, and at exit. Colour prefixes are computed once per set of options,
+    and left out when stdout is not a terminal or the `NO_COLOR` environment variable is set.
+
+    Worker processes, e.g. of a `ProcessPoolExecutor`, may exit without running atexit handlers or their flush timer,
+    so lines are written right away in them.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.name = "dsutils-console"
+        # None writes to whatever sys.stdout is at the time of writing
+        self.stream = stream
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._timer: threading.Timer | None = None
+        self._prefixes: dict[tuple[str, ...], tuple[str, str]] = dict()
+        self._color_stream = None
+        self._second = -1
+        self._timestamp = ""
+        # multiprocessing is already imported in processes it started, so looking it up costs nothing elsewhere
+        multiprocessing = sys.modules.get("multiprocessing")
+        self._write_through = multiprocessing is not None and multiprocessing.parent_process() is not None
+
+    def after_fork_in_child(self):
+        """
+        Drops the lines and flush timer inherited from the parent, which wrote the lines itself and whose timer thread does not exist here.
+        """
+        self._buffer = []
+        self._buffered = 0
+        self._timer = None
+        self._write_through = True
+
+    def __stream__(self):
+        return sys.stdout if self.stream is None else self.stream
+
+    def prefix(self, log_options: tuple[str, ...]):
+        """
+        Returns the cached `(start, end)` escape codes surrounding the `[DSUTILS | ...]` tag, empty when colours are off.
+        """
+        stream = self.__stream__()
+        if stream is not self._color_stream:
+            self._color_stream = stream
+            self._prefixes.clear()
+        prefix = self._prefixes.get(log_options)
+        if prefix is None:
+            isatty = getattr(stream, "isatty", None)
+            color = isatty is not None and isatty() and "NO_COLOR" not in os.environ
+            prefix = (__parse_logoptions__(list(log_options)), __LogOptions__.END) if color else ("", "")
+            self._prefixes[log_options] = prefix
+        return prefix
+
+    def timestamp(self, created: float):
+        """
+        Returns the `HH:MM:SS` timestamp of a moment, only formatting it again when the second changed.
+        """
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._timestamp = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._timestamp
+
+    def emit(self, record: logging.LogRecord):
+        start, end = self.prefix(__LEVEL_OPTIONS__.get(record.levelno, __LEVEL_OPTIONS__[logging.INFO]))
+        line = f"{start}[DSUTILS | {self.timestamp(record.created)}]:{end} {record.getMessage()}\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+
+        if self._write_through or record.levelno >= logging.ERROR or self._buffered >= LOG_BUFFER_SIZE:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(LOG_FLUSH_INTERVAL, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if len(self._buffer) == 0:
+                return
+            lines = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            try:
+                stream = self.__stream__()
+                stream.write(lines)
+                stream.flush()
+            except (OSError, ValueError):
+                # The stream was closed, e.g. at interpreter shutdown
+                pass
+
+
+SUCCESS = 25
+logging.addLevelName(SUCCESS, "SUCCESS")
+LOG_FLUSH_INTERVAL = 0.2
+LOG_BUFFER_SIZE = 64 * 1024
+__LEVEL_OPTIONS__ = {
+    logging.DEBUG: ( __LogOptions__.clr_CYAN, ),
+    logging.INFO: ( __LogOptions__.clr_WHITE, ),
+    SUCCESS: ( __LogOptions__.clr_GREEN, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ),
+    logging.WARNING: ( __LogOptions__.clr_YELLOW, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ),
+    logging.ERROR: ( __LogOptions__.clr_RED, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ),
+}
+
+__LOGGER__ = logging.getLogger("dsutils")
+__LOGGER__.propagate = False
+for __handler__ in [ h for h in __LOGGER__.handlers if h.name == "dsutils-console" ]:
+    __LOGGER__.removeHandler(__handler__)
+__CONSOLE_HANDLER__ = __ConsoleHandler__()
+__LOGGER__.addHandler(__CONSOLE_HANDLER__)
+__LOG_LEVEL__ = logging.getLevelName(os.environ.get("DSUTILS_LOG_LEVEL", "INFO").upper())
+__LOGGER__.setLevel(__LOG_LEVEL__ if isinstance(__LOG_LEVEL__, int) else logging.INFO)
+atexit.register(__CONSOLE_HANDLER__.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=__CONSOLE_HANDLER__.after_fork_in_child)
+
+
+# The list collecting the messages logged in the current context instead of writing them, see dsutils_capture_logs()
+__LOG_CAPTURE__: contextvars.ContextVar[list[tuple[int, str]] | None] = contextvars.ContextVar("dsutils_log_capture", default=None)
+
+
+def __dfutils_log__(message: str, level: int):
+    """
+    Logs a message at the given level. Messages below the level of the `dsutils` logger return before any formatting.
 
     Args:
     ------
         message (str): The message to log.
-        log_options (list[__LogOptions__], optional): A list of formatting log_options. Defaults to [].
+        level (int): The logging level, e.g. `logging.INFO`.
     """
-    print(f"{__parse_logoptions__(log_options)}[DSUTILS | {datetime.now().strftime('%H:%M:%S')}]:{__LogOptions__.END} {message}")
+    if __LOGGER__.isEnabledFor(level):
+        capture = __LOG_CAPTURE__.get()
+        if capture is not None:
+            capture.append((level, str(message)))
+            return
+        # Building the record directly skips the stack inspection Logger.log() does to find the caller
+        __LOGGER__.handle(__LOGGER__.makeRecord(__LOGGER__.name, level, "", 0, message, (), None))
+
+
+@contextlib.contextmanager
+def dsutils_capture_logs():
+    """
+    Collects the messages logged within the context instead of writing them to the console, e.g. to send them to another process.
+    Only the current thread, or asyncio task, is affected.
+
+    Returns:
+    ------
+        list[tuple[int, str]]: The level and text of every message logged within the context.
+    """
+    messages = []
+    token = __LOG_CAPTURE__.set(messages)
+    try:
+        yield messages
+    finally:
+        __LOG_CAPTURE__.reset(token)
+
+
+def dsutils_set_log_level(level: int | str):
+    """
+    Sets the minimum level of the messages that are logged, e.g. `"WARNING"` to hide info and success messages.
+    The initial level is read from the `DSUTILS_LOG_LEVEL` environment variable, and defaults to `INFO`.
+
+    Args:
+    ------
+        level (int | str): The logging level or its name.
+    """
+    __LOGGER__.setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def dsutils_flush_logs():
+    """
+    Writes the buffered log messages to the console.
+    """
+    __CONSOLE_HANDLER__.flush()
 
 
 def dsutils_info(message: str):
@@ -65,7 +297,7 @@ def dsutils_info(message: str):
     ------
         message (str): The message to log.
     """
-    __dfutils_log__(message, [ __LogOptions__.clr_WHITE ])
+    __dfutils_log__(message, logging.INFO)
 
 
 def dsutils_success(message: str):
@@ -76,7 +308,7 @@ def dsutils_success(message: str):
     ------
         message (str): The message to log.
     """
-    __dfutils_log__(message, [ __LogOptions__.clr_GREEN, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ])
+    __dfutils_log__(message, SUCCESS)
 
 
 def dsutils_warn(message: str):
@@ -87,7 +319,7 @@ def dsutils_warn(message: str):
     ------
         message (str): The message to log.
     """
-    __dfutils_log__(message, [ __LogOptions__.clr_YELLOW, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ])
+    __dfutils_log__(message, logging.WARNING)
     
 
 def dsutils_error(message: str):
@@ -98,7 +330,7 @@ def dsutils_error(message: str):
     ------
         message (str): The message to log.
     """
-    __dfutils_log__(message, [ __LogOptions__.clr_RED, __LogOptions__.trs_BOLD, __LogOptions__.trs_UNDERLINE ])
+    __dfutils_log__(message, logging.ERROR)
 #endregion
     
 
@@ -116,7 +348,10 @@ def dsutils_input(message: str, log_options: list[__LogOptions__] = []):
     ------
         str: The user's input.
     """
-    return input(f"{__parse_logoptions__(log_options)}[DSUTILS | {datetime.now().strftime('%H:%M:%S')}]:{__LogOptions__.END} {message}")
+    # Buffered messages must appear before the prompt
+    dsutils_flush_logs()
+    start, end = __CONSOLE_HANDLER__.prefix(tuple(log_options) if len(log_options) > 0 else __LEVEL_OPTIONS__[logging.INFO])
+    return input(f"{start}[DSUTILS | {__CONSOLE_HANDLER__.timestamp(time.time())}]:{end} {message}")
 
 
 def dsutils_input_options(message: str, options: list[str], log_options: list[__LogOptions__] = []):
@@ -179,184 +414,713 @@ def dsutils_input_yes_no(message: str, log_options: list[__LogOptions__] = []):
 #endregion
 
 
-def dsutils_read_env(project_root: str = os.getcwd()):
+#region Environment Methods
+def __parse_env_file__(env_file: str):
+    """
+    Parses an environment file into a dictionary.
+
+    Every non-empty line is split once on the first `=`, so values may contain `=` themselves.
+
+    Args:
+    ------
+        env_file (str): The path to the environment file.
+
+    Returns:
+    ------
+        dict: A dictionary of the environment variables.
+    """
+    env_dict: dict[str, str] = dict()
+    with open(env_file) as f:
+        for line in f.read().splitlines():
+            if line == "":
+                continue
+            key, _, value = line.partition("=")
+            env_dict[key] = value
+    return env_dict
+
+
+@dataclass(frozen=True, slots=True)
+class DsutilsEnv:
+    """
+    Immutable, typed view of a `.dsutils.env` file with every path resolved up front.
+
+    Build it once with `dsutils_get_env()` and keep the handle around in hot code, instead of calling the `dsutils_get_*` getters in a loop.
+    """
+    project_root: Path
+    project_name: str
+    artifacts_dir: Path
+    data_dir: Path
+    data_processed_dir: Path
+    data_raw_dir: Path
+    experiments_dir: Path
+    sources_file: Path
+
+    @classmethod
+    def from_env_dict(cls, env_dict: dict[str, str]):
+        """
+        Builds a `DsutilsEnv` from the dictionary returned by `dsutils_read_env()`.
+
+        Args:
+        ------
+            env_dict (dict[str, str]): The environment variables.
+
+        Returns:
+        ------
+            DsutilsEnv: The typed environment.
+
+        Raises:
+        ------
+            KeyError: If a required environment variable is missing.
+        """
+        project_root = str(env_dict["PROJECT_ROOT"])
+        return cls(
+            project_root=Path(project_root),
+            project_name=str(env_dict["PROJECT_NAME"]),
+            artifacts_dir=Path(project_root + env_dict["ARTIFACTS_DIR"]),
+            data_dir=Path(project_root + env_dict["DATA_DIR"]),
+            data_processed_dir=Path(project_root + env_dict["DATA_PROCESSED_DIR"]),
+            data_raw_dir=Path(project_root + env_dict["DATA_RAW_DIR"]),
+            experiments_dir=Path(project_root + env_dict["EXPERIMENTS_DIR"]),
+            sources_file=Path(project_root + env_dict["SOURCES_FILE"]),
+        )
+
+
+# Modification times this close to the moment of scanning are not trusted by the caches keyed on them, as a change within the same
+# timestamp tick would go unnoticed (the "racy git" problem). Such entries are simply checked again on the next refresh.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class DsutilsEnvCache:
+    """
+    Process-wide cache of parsed environment files.
+
+    An environment file is parsed once and kept in memory until its modification time, size or inode changes.
+    Every lookup is counted as either a hit or a miss, see `stats()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[tuple[int, int, int], dict[str, str]]] = dict()
+        self._typed: dict[str, tuple[dict[str, str], DsutilsEnv]] = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, env_file: str):
+        """
+        Returns the parsed contents of the environment file, re-reading it only when it changed on disk.
+
+        Args:
+        ------
+            env_file (str): The path to the environment file.
+
+        Returns:
+        ------
+            dict: A dictionary of the environment variables. Callers must not mutate it.
+
+        Raises:
+        ------
+            FileNotFoundError: If the environment file does not exist.
+        """
+        stat = os.stat(env_file)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        with self._lock:
+            entry = self._entries.get(env_file)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with dsutils_span("env_read", file=env_file):
+            env_dict = __parse_env_file__(env_file)
+        with self._lock:
+            self._entries[env_file] = (signature, env_dict)
+        return env_dict
+
+    def get_env(self, env_file: str):
+        """
+        Returns the environment file as a `DsutilsEnv`, rebuilding it only when the file changed on disk.
+
+        Args:
+        ------
+            env_file (str): The path to the environment file.
+
+        Returns:
+        ------
+            DsutilsEnv: The typed environment.
+
+        Raises:
+        ------
+            FileNotFoundError: If the environment file does not exist.
+            KeyError: If a required environment variable is missing.
+        """
+        env_dict = self.get(env_file)
+        typed = self._typed.get(env_file)
+        if typed is not None and typed[0] is env_dict:
+            return typed[1]
+
+        env = DsutilsEnv.from_env_dict(env_dict)
+        with self._lock:
+            self._typed[env_file] = (env_dict, env)
+        return env
+
+    def invalidate(self, env_file: str | None = None):
+        """
+        Drops cached environment files, forcing the next lookup to re-read them.
+
+        Args:
+        ------
+            env_file (str, optional): The environment file to drop. Defaults to None, which drops every cached file.
+        """
+        with self._lock:
+            if env_file is None:
+                self._entries.clear()
+                self._typed.clear()
+            else:
+                self._entries.pop(env_file, None)
+                self._typed.pop(env_file, None)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+        ------
+            dict: A dictionary with the `hits`, `misses` and number of cached `entries`.
+        """
+        with self._lock:
+            return { "hits": self.hits, "misses": self.misses, "entries": len(self._entries) }
+
+
+DSUTILS_ENV_CACHE = DsutilsEnvCache()
+
+
+@functools.lru_cache(maxsize=4096)
+def __find_env_dir__(directory: str):
+    """
+    Returns the closest directory, starting at `directory` and walking up its parents, that contains the environment file.
+
+    Results are cached per directory, including negative results, so every ancestor is only checked once per process.
+    Call `dsutils_invalidate_env()` to clear the cache.
+    """
+    if os.path.isfile(directory + ENV_FILE.replace("/", os.sep)):
+        return directory
+    parent = os.path.dirname(directory)
+    if parent == directory:
+        return None
+    return __find_env_dir__(parent)
+
+
+def dsutils_find_project_root(start: str | None = None):
+    """
+    Finds the root directory of the project by walking up from `start` until a directory containing the environment file is found, like git does for `.git`.
+
+    Args:
+    ------
+        start (str, optional): The directory to start searching from. Defaults to `os.getcwd()`.
+
+    Returns:
+    ------
+        str | None: The root directory of the project, or None if no environment file was found.
+    """
+    if start is None:
+        start = os.getcwd()
+    return __find_env_dir__(os.path.abspath(start))
+
+
+def __env_file_path__(project_root: str | None = None):
+    """
+    Returns the path to the environment file of the project containing `project_root`.
+
+    Falls back to the environment file path inside `project_root` itself when no environment file can be found.
+    """
+    start = os.getcwd() if project_root is None else project_root
+    found = dsutils_find_project_root(start)
+    if found is None:
+        found = start
+    return found + ENV_FILE.replace("/", os.sep)
+
+
+def __get_from_env_cache__(project_root: str | None, getter):
+    """
+    Looks up the environment file of `project_root` with `getter`, exiting the program if it does not exist.
+
+    If a previously discovered environment file has been removed, the discovery cache is cleared and the lookup is retried once.
+    """
+    env = __env_file_path__(project_root)
+    try:
+        return getter(env)
+    except FileNotFoundError:
+        __find_env_dir__.cache_clear()
+        env = __env_file_path__(project_root)
+        try:
+            return getter(env)
+        except FileNotFoundError:
+            __exit_env_file_missing__(env)
+
+
+def __exit_env_file_missing__(env: str):
+    """
+    Prints an error about the missing environment file to the console and exits the program, see `dsutils_exit()`.
+    """
+    dsutils_exit(
+        f"Environment file does not exist:{env}",
+        "This probably means that DSUtils has not been setup for this project.",
+        "Please run the DSUtils setup script before continuing.",
+        "Exiting...",
+    )
+
+
+def __read_env_cached__(project_root: str | None = None):
+    """
+    Returns the cached environment dictionary without copying it.
+
+    If the environment file does not exist, an error is printed to the console and the program exits.
+    """
+    return __get_from_env_cache__(project_root, DSUTILS_ENV_CACHE.get)
+
+
+def dsutils_read_env(project_root: str | None = None):
     """
     Reads the environment file and returns a dictionary of the environment variables.
 
+    The environment file is searched for in `project_root` and its parents, see `dsutils_find_project_root()`.
+    The file is parsed once per process and only re-read when it changes on disk, see `DsutilsEnvCache`.
     If the environment file does not exist, an error is printed to the console and the program exits.
 
     Args:
     ------
-        project_root (str, optional): The root directory of the project. Defaults to `os.getcwd()`.
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         dict: A dictionary of the environment variables.
     """
-    global ENV_FILE
+    return dict(__read_env_cached__(project_root))
 
-    env = project_root + ENV_FILE.replace("/", os.sep)
-    if not os.path.isfile(env):
-        dsutils_error(f"Environment file does not exist:{env}")
-        dsutils_error("This probably means that DSUtils has not been setup for this project.")
-        dsutils_error("Please run the DSUtils setup script before continuing.")
-        dsutils_error("Exiting...")
-        sys.exit(1)
 
-    with open(env) as f:
-        env_vars = f.read().splitlines()
-        env_dict: dict[str, str] = dict()
-        for v in env_vars:
-            env_dict[v.split("=")[0]] = v.split("=")[1]
+def dsutils_get_env(project_root: str | None = None):
+    """
+    Returns the environment of the project as an immutable `DsutilsEnv` with precomputed paths.
 
-    return env_dict
+    The object is built once per environment file and rebuilt only when the file changes on disk.
+    If the environment file does not exist, an error is printed to the console and the program exits.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
+
+    Returns:
+    ------
+        DsutilsEnv: The typed environment of the project.
+    """
+    return __get_from_env_cache__(project_root, DSUTILS_ENV_CACHE.get_env)
+
+
+def dsutils_invalidate_env(project_root: str | None = None):
+    """
+    Drops the cached environment file(s), forcing the next read to parse the file again.
+
+    The cache of discovered project roots is always cleared, so newly created or removed environment files are picked up.
+
+    Args:
+    ------
+        project_root (str, optional): The root directory of the project. Defaults to None, which drops every cached environment file.
+    """
+    __find_env_dir__.cache_clear()
+    if project_root is None:
+        DSUTILS_ENV_CACHE.invalidate()
+    else:
+        DSUTILS_ENV_CACHE.invalidate(project_root + ENV_FILE.replace("/", os.sep))
 
 
-def dsutils_get_project_root():
+def dsutils_env_cache_stats():
+    """
+    Returns the hit and miss counters of the environment cache.
+
+    Returns:
+    ------
+        dict: A dictionary with the `hits`, `misses` and number of cached `entries`.
+    """
+    return DSUTILS_ENV_CACHE.stats()
+#endregion
+
+
+def dsutils_get_project_root(project_root: str | None = None):
     """
     Returns the root directory of the project.
 
-    Equivalent to: `dsutils_read_env()["PROJECT_ROOT"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).project_root)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The root directory of the project.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    return str(project_root)
+    return str(dsutils_get_env(project_root).project_root)
 
 
-def dsutils_get_project_name():
+def dsutils_get_project_name(project_root: str | None = None):
     """
     Returns the name of the project.
 
-    Equivalent to: `dsutils_read_env()["PROJECT_NAME"]`.
+    Equivalent to: `dsutils_get_env(project_root).project_name`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The name of the project.
     """
-    envs = dsutils_read_env()
-    project_name = envs["PROJECT_NAME"]
-    return str(project_name)
+    return dsutils_get_env(project_root).project_name
 
 
-def dsutils_get_artifacts_dir():
+def dsutils_get_artifacts_dir(project_root: str | None = None):
     """
     Returns the path to the artifacts directory.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["ARTIFACTS_DIR"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).artifacts_dir)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the artifacts directory.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    artifacts_dir = envs["ARTIFACTS_DIR"]
-    return str(project_root) + str(artifacts_dir)
+    return str(dsutils_get_env(project_root).artifacts_dir)
 
 
-def dsutils_get_data_dir():
+def dsutils_get_data_dir(project_root: str | None = None):
     """
     Returns the path to the data directory.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["DATA_DIR"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).data_dir)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the data directory.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    data_dir = envs["DATA_DIR"]
-    return str(project_root) + str(data_dir)
+    return str(dsutils_get_env(project_root).data_dir)
 
 
-def dsutils_get_data_processed_dir():
+def dsutils_get_data_processed_dir(project_root: str | None = None):
     """
     Returns the path to the processed data directory.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["DATA_PROCESSED_DIR"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).data_processed_dir)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the processed data directory.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    processed_dir = envs["DATA_PROCESSED_DIR"]
-    return str(project_root) + str(processed_dir)
+    return str(dsutils_get_env(project_root).data_processed_dir)
 
 
-def dsutils_get_data_raw_dir():
+def dsutils_get_data_raw_dir(project_root: str | None = None):
     """
     Returns the path to the raw data directory.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["DATA_RAW_DIR"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).data_raw_dir)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the raw data directory.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    raw_dir = envs["DATA_RAW_DIR"]
-    return str(project_root) + str(raw_dir)
+    return str(dsutils_get_env(project_root).data_raw_dir)
 
 
-def dsutils_get_experiments_dir():
+def dsutils_get_experiments_dir(project_root: str | None = None):
     """
     Returns the path to the experiments directory.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["EXPERIMENTS_DIR"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).experiments_dir)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the experiments directory.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    experiments_dir = envs["EXPERIMENTS_DIR"]
-    return str(project_root) + str(experiments_dir)
+    return str(dsutils_get_env(project_root).experiments_dir)
 
 
-def dsutils_get_sources_file():
+def dsutils_get_sources_file(project_root: str | None = None):
     """
     Returns the path to the sources file.
 
-    Equivalent to: `dsutils_get_project_root() + dsutils_read_env()["SOURCES_FILE"]`.
+    Equivalent to: `str(dsutils_get_env(project_root).sources_file)`.
+
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
 
     Returns:
     ------
         str: The path to the sources file.
     """
-    envs = dsutils_read_env()
-    project_root = envs["PROJECT_ROOT"]
-    sources_file = envs["SOURCES_FILE"]
-    return str(project_root) + str(sources_file)
+    return str(dsutils_get_env(project_root).sources_file)
 
 
-def dsutils_get_sources_file_content():
+def dsutils_get_sources_file_content(project_root: str | None = None):
     """
     Reads the sources file and returns a list of the lines.
 
     If the sources file does not exist, an error is printed to the console and the program exits.
 
+    Args:
+    ------
+        project_root (str, optional): The directory to start searching for the environment file from. Defaults to `os.getcwd()`.
+
     Returns:
     ------
         list: A list of the lines in the sources file.
     """
-    sources_file = dsutils_get_sources_file()
+    sources_file = dsutils_get_sources_file(project_root)
 
     if not os.path.isfile(sources_file):
-        dsutils_error(f"Sources file does not exist: {sources_file}")
-        dsutils_error("This probably means that DSUtils has not been setup for this project.")
-        dsutils_error("Please run the DSUtils setup script before continuing.")
-        dsutils_error("Exiting...")
-        sys.exit(1)
+        dsutils_exit(
+            f"Sources file does not exist: {sources_file}",
+            "This probably means that DSUtils has not been setup for this project.",
+            "Please run the DSUtils setup script before continuing.",
+            "Exiting...",
+        )
 
     with open(sources_file, 'r') as file:
         sources = file.readlines()
-        return sources
\ No newline at end of file
+        return sources
+
+
+#region Locking Methods
+@contextlib.contextmanager
+def dsutils_file_lock(lock_file: str):
+    """
+    Context manager holding an exclusive advisory lock on `lock_file` for the duration of the `with` block.
+
+    The lock is taken with `fcntl.flock`, so it is respected by every process using this function, and by every thread within the current process.
+    On platforms without `fcntl`, the lock only guards against other threads of the current process.
+
+    Args:
+    ------
+        lock_file (str): The path to the lock file. It is created if it does not exist.
+    """
+    lock_file = os.path.abspath(lock_file)
+    with __FILE_LOCKS_LOCK__:
+        thread_lock = __FILE_LOCKS__.setdefault(lock_file, threading.Lock())
+
+    with thread_lock:
+        with open(lock_file, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+#endregion
+
+
+#region Tracing Methods
+TRACE_FILE = ".dsutils.trace.jsonl"
+
+
+class __Span__:
+    """
+    A timed phase of a command, written as one JSON line to the trace file when it ends.
+    """
+    __slots__ = ("command", "phase", "fields", "files", "bytes", "id", "parent", "_start", "_token")
+
+    def __init__(self, phase: str, command: str | None, fields: dict):
+        parent = __CURRENT_SPAN__.get()
+        self.command = command if command is not None else parent.command if parent is not None else phase
+        self.phase = phase
+        self.fields = fields
+        self.files = 0
+        self.bytes = 0
+        self.id = next(__SPAN_IDS__)
+        self.parent = None if parent is None else parent.id
+
+    def add_file(self, nbytes: int = 0):
+        """
+        Records a file written by this phase, and the number of bytes written to it.
+        """
+        self.files += 1
+        self.bytes += nbytes
+
+    def set(self, **fields):
+        """
+        Adds fields to the event of this span.
+        """
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self._token = __CURRENT_SPAN__.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._start
+        __CURRENT_SPAN__.reset(self._token)
+        event = {
+            "ts": time.time() - duration,
+            "pid": os.getpid(),
+            "command": self.command,
+            "phase": self.phase,
+            "id": self.id,
+            "parent": self.parent,
+            "duration_ms": round(duration * 1000, 3),
+            "files": self.files,
+            "bytes": self.bytes,
+            "status": "ok" if exc_type is None else "error",
+        }
+        if exc_type is not None:
+            event["error"] = exc_type.__name__
+        event.update(self.fields)
+        __write_trace_event__(event)
+        return False
+
+
+class __NullSpan__:
+    """
+    The span returned while tracing is disabled, doing nothing.
+    """
+    __slots__ = ()
+
+    def add_file(self, nbytes: int = 0):
+        pass
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+__NULL_SPAN__ = __NullSpan__()
+__CURRENT_SPAN__: contextvars.ContextVar[__Span__ | None] = contextvars.ContextVar("dsutils_span", default=None)
+__SPAN_IDS__ = itertools.count(1)
+__TRACE_LOCK__ = threading.Lock()
+# The trace file, "" to write to the default file of the project, or None while tracing is disabled
+__TRACE_PATH__: str | None = None
+__TRACE_FD__: int | None = None
+
+
+def __write_trace_event__(event: dict):
+    global __TRACE_PATH__, __TRACE_FD__
+
+    line = (json.dumps(event, default=str) + "\n").encode("utf-8")
+    with __TRACE_LOCK__:
+        if __TRACE_PATH__ is None:
+            return
+        if __TRACE_FD__ is None:
+            if __TRACE_PATH__ == "":
+                __TRACE_PATH__ = os.path.join(dsutils_find_project_root() or os.getcwd(), TRACE_FILE)
+            # Appending with O_APPEND keeps the lines of concurrent processes intact
+            __TRACE_FD__ = os.open(__TRACE_PATH__, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(__TRACE_FD__, line)
+
+
+def dsutils_enable_tracing(path: str | None = None):
+    """
+    Starts writing spans as JSON lines to a trace file.
+
+    Tracing can also be enabled for a whole run by setting the `DSUTILS_TRACE` environment variable to `1`, or to the path of the trace file.
+
+    Args:
+    ------
+        path (str, optional): The trace file. Defaults to `.dsutils.trace.jsonl` in the project root, or the working directory outside a project.
+    """
+    global __TRACE_PATH__
+    dsutils_disable_tracing()
+    with __TRACE_LOCK__:
+        __TRACE_PATH__ = "" if path is None else os.path.abspath(path)
+
+
+def dsutils_disable_tracing():
+    """
+    Stops writing spans to the trace file.
+    """
+    global __TRACE_PATH__, __TRACE_FD__
+    with __TRACE_LOCK__:
+        if __TRACE_FD__ is not None:
+            os.close(__TRACE_FD__)
+        __TRACE_PATH__ = None
+        __TRACE_FD__ = None
+
+
+def dsutils_span(phase: str, command: str | None = None, **fields):
+    """
+    Context manager timing a phase of a command. When tracing is enabled, an event is written to the trace file when the phase ends, with its
+    `command`, `phase`, `duration_ms`, the number of `files` and `bytes` recorded with `add_file()`, and any extra fields.
+    While tracing is disabled a shared no-op span is returned, so instrumented code costs a single function call.
+
+    Example:
+    ------
+    ```python
+    with dsutils_span("feature_engineering", rows=len(df)) as span:
+        df.to_csv(path)
+        span.add_file(os.path.getsize(path))
+    ```
+
+    Args:
+    ------
+        phase (str): The name of the phase.
+        command (str, optional): The command the phase belongs to. Defaults to the command of the enclosing span, or the phase itself.
+        **fields: Extra fields to add to the event.
+    """
+    if __TRACE_PATH__ is None:
+        return __NULL_SPAN__
+    return __Span__(phase, command, fields)
+
+
+def dsutils_traced(phase=None, command: str | None = None):
+    """
+    Decorator running a function in a `dsutils_span`. Can be used as `@dsutils_traced` or `@dsutils_traced("phase")`.
+
+    Args:
+    ------
+        phase (str, optional): The name of the phase. Defaults to the qualified name of the function.
+        command (str, optional): The command the phase belongs to. Defaults to the command of the enclosing span, or the phase itself.
+    """
+    def decorator(func):
+        name = phase if isinstance(phase, str) else func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if __TRACE_PATH__ is None:
+                return func(*args, **kwargs)
+            with __Span__(name, command, dict()):
+                return func(*args, **kwargs)
+        return wrapper
+
+    if callable(phase):
+        return decorator(phase)
+    return decorator
+
+
+if os.environ.get("DSUTILS_TRACE", "") not in ["", "0"]:
+    dsutils_enable_tracing(None if os.environ["DSUTILS_TRACE"].lower() in ["1", "true"] else os.environ["DSUTILS_TRACE"])
+#endregion
@@ -0,0 +1,220 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import json
+import threading
+import time
+
+
+INDEX_VERSION = 1
+INDEX_FILE = ".inventory.json"
+LOCK_FILE = ".inventory.lock"
+HASH_ALGORITHM = "blake2b-128"
+CHUNK_SIZE = 1024 * 1024
+
+
+def __hash_file__(path: str):
+    """
+    Returns the BLAKE2b-128 hash of a file, or None if it disappeared. hashlib releases the GIL, so files are hashed in parallel on threads.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+    except FileNotFoundError:
+        return None
+    return hasher.hexdigest()
+
+
+@dataclass
+class InventoryChanges:
+    """
+    The changes found by `Inventory.scan()`, as paths relative to the inventory root.
+
+    Files whose modification time changed but whose content did not are not reported as modified.
+    """
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    moved: list[tuple[str, str]] = field(default_factory=list)
+    hashed: int = 0
+
+    def __bool__(self):
+        return len(self.added) + len(self.removed) + len(self.modified) + len(self.moved) > 0
+
+    def to_dict(self):
+        return { "added": self.added, "removed": self.removed, "modified": self.modified, "moved": [ list(m) for m in self.moved ], "hashed": self.hashed }
+
+
+class Inventory:
+    """
+    Index of every file in the data directory with its size, modification time, inode and content hash.
+
+    The index is stored compactly in the data directory, as `path: [size, mtime_ns, inode, hash]`.
+    A scan only stats files with `os.scandir` and re-hashes the files whose stat data changed, on a thread pool,
+    so rescanning an unchanged directory costs one `stat` per file. Hidden files and directories are not indexed.
+    """
+
+    def __init__(self, root: str | None = None, workers: int | None = None):
+        self.root = os.path.abspath(dsutils_get_data_dir() if root is None else root)
+        self.workers = workers
+        self.index_file = os.path.join(self.root, INDEX_FILE)
+        self.lock_file = os.path.join(self.root, LOCK_FILE)
+
+        self._lock = threading.Lock()
+        self._files: dict[str, list] = dict()
+
+    #region Persistence
+    def __load__(self):
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        if index.get("version") != INDEX_VERSION or index.get("algorithm") != HASH_ALGORITHM:
+            return dict()
+        return index["files"]
+
+    def __save__(self, files: dict[str, list]):
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({ "version": INDEX_VERSION, "algorithm": HASH_ALGORITHM, "files": files }, f, separators=(",", ":"))
+        os.replace(tmp_file, self.index_file)
+    #endregion
+
+    def __walk__(self):
+        """
+        Yields `(relative_path, stat)` for every file under the root, without following symbolic links.
+        """
+        stack = [ "" ]
+        while len(stack) > 0:
+            relative_dir = stack.pop()
+            try:
+                entries = os.scandir(os.path.join(self.root, relative_dir))
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    relative_path = entry.name if relative_dir == "" else f"{relative_dir}/{entry.name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(relative_path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield relative_path, entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+
+    def scan(self):
+        """
+        Brings the index up to date with the files on disk.
+
+        Returns:
+        ------
+            InventoryChanges: The files added, removed, modified and moved since the previous scan.
+        """
+        with self._lock, dsutils_file_lock(self.lock_file):
+            previous = self.__load__()
+            scan_started_ns = time.time_ns()
+
+            files: dict[str, list] = dict()
+            to_hash: list[tuple[str, os.stat_result]] = []
+            for path, stat in self.__walk__():
+                old = previous.get(path)
+                if old is not None and old[0] == stat.st_size and old[1] == stat.st_mtime_ns and old[2] == stat.st_ino:
+                    files[path] = old
+                else:
+                    to_hash.append((path, stat))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                hashes = executor.map(__hash_file__, [ os.path.join(self.root, path) for path, _ in to_hash ])
+                for (path, stat), hash in zip(to_hash, hashes):
+                    if hash is None:
+                        continue
+                    # A file modified within the timestamp granularity of its last hash could keep the same stat data,
+                    # so recently modified files get an invalid modification time and are hashed again on the next scan
+                    mtime_ns = stat.st_mtime_ns if scan_started_ns - stat.st_mtime_ns > RACY_WINDOW_NS else -1
+                    files[path] = [ stat.st_size, mtime_ns, stat.st_ino, hash ]
+
+            changes = self.__diff__(previous, files)
+            changes.hashed = len(to_hash)
+            self.__save__(files)
+            self._files = files
+            return changes
+
+    def __diff__(self, previous: dict[str, list], files: dict[str, list]):
+        changes = InventoryChanges()
+        removed = { (entry[2], entry[3]): path for path, entry in previous.items() if path not in files }
+        for path, entry in files.items():
+            old = previous.get(path)
+            if old is None:
+                source = removed.pop((entry[2], entry[3]), None)
+                if source is None:
+                    changes.added.append(path)
+                else:
+                    changes.moved.append((source, path))
+            elif old[3] != entry[3]:
+                changes.modified.append(path)
+        changes.removed = sorted(removed.values())
+        changes.added.sort()
+        changes.modified.sort()
+        changes.moved.sort()
+        return changes
+
+    def files(self):
+        """
+        Returns the indexed files as of the last scan, or as stored on disk if this inventory was not scanned yet.
+
+        Returns:
+        ------
+            dict[str, dict]: The `size`, `mtime_ns`, `inode` and `hash` of every file, keyed by its path relative to the root.
+        """
+        with self._lock:
+            files = self._files if len(self._files) > 0 else self.__load__()
+        return { path: { "size": e[0], "mtime_ns": e[1], "inode": e[2], "hash": e[3] } for path, e in files.items() }
+
+
+def scan_inventory(root: str | None = None, workers: int | None = None):
+    """
+    Scans the data directory of the current project, or `root`, and returns the changes since the previous scan.
+    """
+    return Inventory(root, workers).scan()
+
+
+def main(argv: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="dsutils inventory", description="Index the files in the data directory and report what changed since the last scan.")
+    parser.add_argument("-r", "--root", type=str, help="The directory to index. Defaults to the data directory of the project.", required=False, default=None)
+    parser.add_argument("-w", "--workers", type=int, help="The number of threads hashing files.", required=False, default=None)
+    parser.add_argument("-j", "--json", action="store_true", help="Print the changes as JSON.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    changes = scan_inventory(args.root, args.workers)
+    if args.json:
+        print(json.dumps(changes.to_dict(), indent=4))
+        return
+
+    for path in changes.added:
+        dsutils_success(f"added:    {path}")
+    for path in changes.modified:
+        dsutils_warn(f"modified: {path}")
+    for source, path in changes.moved:
+        dsutils_info(f"moved:    {source} -> {path}")
+    for path in changes.removed:
+        dsutils_error(f"removed:  {path}")
+    dsutils_info(f"Scanned in {time.perf_counter() - started:.2f}s, hashed {changes.hashed} files.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dataclasses import dataclass, field
+import json
+import stat
+import threading
+
+
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(__file__), "files_and_folders.json")
+# Layout schema a project can provide in its root directory, extending the default schema
+LAYOUT_FILE = "/.dsutils.layout.json"
+# Environment variable with the paths to extra layout schemas, separated by os.pathsep, e.g. to extend the layout of every project of a fleet
+LAYOUT_ENV_VAR = "DSUTILS_LAYOUT"
+
+__PLANS__: dict[tuple[str, ...], tuple[tuple, "LayoutPlan"]] = dict()
+__PLANS_LOCK__ = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class LayoutEntry:
+    """
+    A file or folder of the project layout.
+
+    Attributes:
+    ----------
+    key : str
+        The name of the entry, which is also the name of its environment variable in upper case.
+    path : str
+        The path relative to the project root, starting with a `/`.
+    is_file : bool
+        Whether the entry is a file or a folder.
+    contents : str
+        The contents of a file, empty for folders.
+    """
+    key: str
+    path: str
+    is_file: bool
+    contents: str = ""
+
+    def resolve(self, project_root: str):
+        """
+        Returns the absolute path of the entry in the given project.
+        """
+        return project_root + self.path.replace("/", os.sep)
+
+
+@dataclass
+class LayoutDiff:
+    """
+    The difference between a layout and the files and folders of a project, see `LayoutPlan.diff`.
+
+    Attributes:
+    ----------
+    missing : list[LayoutEntry]
+        The entries that do not exist, in creation order.
+    existing : list[LayoutEntry]
+        The entries that exist.
+    conflicting : list[LayoutEntry]
+        The entries of which the path exists, but is a folder instead of a file or the other way around.
+    """
+    missing: list[LayoutEntry] = field(default_factory=list)
+    existing: list[LayoutEntry] = field(default_factory=list)
+    conflicting: list[LayoutEntry] = field(default_factory=list)
+
+    def is_complete(self):
+        return len(self.missing) == 0 and len(self.conflicting) == 0
+
+
+class LayoutPlan:
+    """
+    A validated project layout, compiled into the order its files and folders must be created in.
+
+    Entries are ordered by depth, so a folder is always created before the files and folders inside it,
+    while entries of the same depth keep the order of their schema.
+    """
+
+    def __init__(self, entries: list[LayoutEntry]):
+        # Entries in schema order, which is the order of the environment variables and of the paths returned by create_files_and_folders
+        self.entries: tuple[LayoutEntry, ...] = tuple(entries)
+        self.ordered: tuple[LayoutEntry, ...] = tuple(sorted(entries, key=lambda entry: entry.path.count("/")))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def files_and_folders(self, project_root: str):
+        """
+        Returns the layout in the format of `files_and_folders.json`, with the paths resolved against the project root.
+        """
+        return {
+            entry.key: { "path": entry.resolve(project_root), "isFile": entry.is_file, "fileContents": entry.contents }
+            for entry in self.entries
+        }
+
+    def diff(self, project_root: str):
+        """
+        Compares the layout with the files and folders of a project in a single pass.
+
+        Every path is looked up at most once, and the entries inside a missing folder are known to be missing without looking them up.
+
+        Args:
+        ------
+            project_root (str): The root directory of the project.
+
+        Returns:
+        ------
+            LayoutDiff: The missing, existing and conflicting entries.
+        """
+        diff = LayoutDiff()
+        missing_dirs: set[str] = set()
+        for entry in self.ordered:
+            # Parents come first, so a missing parent folder is already known
+            if entry.path.rsplit("/", 1)[0] in missing_dirs:
+                diff.missing.append(entry)
+                missing_dirs.add(entry.path)
+                continue
+            try:
+                mode = os.stat(entry.resolve(project_root)).st_mode
+            except FileNotFoundError:
+                diff.missing.append(entry)
+                missing_dirs.add(entry.path)
+                continue
+            if stat.S_ISDIR(mode) != (not entry.is_file):
+                diff.conflicting.append(entry)
+            else:
+                diff.existing.append(entry)
+        return diff
+
+
+#region Schemas
+def __validate_schema__(schema, source: str):
+    """
+    Returns the errors of a layout schema, a mapping of keys to entries with a `path`, `isFile` and optional `fileContents`.
+    An entry of `null` removes the entry with that key from the schemas before it.
+    """
+    if not isinstance(schema, dict):
+        return [ f"{source}: a layout schema must be a JSON object" ]
+
+    errors = []
+    for key, entry in schema.items():
+        if not key.isidentifier():
+            errors.append(f"{source}: '{key}' is not a valid key, keys must be valid environment variable names")
+        if entry is None:
+            continue
+        if not isinstance(entry, dict):
+            errors.append(f"{source}: '{key}' must be an object or null")
+            continue
+        path = entry.get("path")
+        if not isinstance(path, str) or not path.startswith("/") or path == "/":
+            errors.append(f"{source}: '{key}' must have a path starting with a /")
+        elif any(part in ("", ".", "..") for part in path.rstrip("/").split("/")[1:]):
+            errors.append(f"{source}: '{key}' has an invalid path: {path}")
+        if not isinstance(entry.get("isFile"), bool):
+            errors.append(f"{source}: '{key}' must have a boolean isFile")
+        contents = entry.get("fileContents", "")
+        if not isinstance(contents, str) and not (isinstance(contents, list) and all(isinstance(line, str) for line in contents)):
+            errors.append(f"{source}: '{key}' must have fileContents that are a string or a list of strings")
+    return errors
+
+
+def __read_schema__(path: str):
+    with open(path, "r") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from e
+
+
+def load_layout_schema(path: str):
+    """
+    Reads and validates a layout schema.
+
+    Args:
+    ------
+        path (str): The path to the `.json` schema, in the format of `files_and_folders.json`.
+
+    Returns:
+    ------
+        dict: The schema.
+
+    Raises:
+    ------
+        ValueError: If the schema is not valid.
+    """
+    schema = __read_schema__(path)
+    errors = __validate_schema__(schema, path)
+    if len(errors) > 0:
+        raise ValueError("Invalid layout schema:\n" + "\n".join(errors))
+    return schema
+
+
+def compile_layout(*schemas: dict):
+    """
+    Merges layout schemas and compiles them into a plan. Entries of later schemas replace the entries with the same key of earlier ones.
+
+    Args:
+    ------
+        *schemas (dict): The layout schemas, e.g. the default schema and a project schema adding `models` and `reports` folders.
+
+    Returns:
+    ------
+        LayoutPlan: The compiled plan.
+
+    Raises:
+    ------
+        ValueError: If a schema is not valid, two entries have the same path or an entry is inside a file.
+    """
+    return __compile__([ (f"schema {i}", schema) for i, schema in enumerate(schemas) ])
+
+
+def __compile__(schemas: list[tuple[str, dict]]):
+    """
+    Validates and merges the layout schemas, named after their source in the errors, and compiles them into a plan.
+    """
+    errors = []
+    merged: dict[str, dict] = dict()
+    for source, schema in schemas:
+        schema_errors = __validate_schema__(schema, source)
+        errors += schema_errors
+        if len(schema_errors) == 0:
+            for key, entry in schema.items():
+                if entry is None:
+                    merged.pop(key, None)
+                else:
+                    merged[key] = entry
+    if len(errors) > 0:
+        raise ValueError("Invalid layout schema:\n" + "\n".join(errors))
+
+    entries = []
+    for key, entry in merged.items():
+        contents = entry.get("fileContents", "") if entry["isFile"] else ""
+        if isinstance(contents, list):
+            contents = "\n".join(contents)
+        entries.append(LayoutEntry(key, entry["path"].rstrip("/"), entry["isFile"], contents))
+
+    paths = dict()
+    files = [ entry.path + "/" for entry in entries if entry.is_file ]
+    for entry in entries:
+        if entry.path in paths:
+            errors.append(f"'{entry.key}' has the same path as '{paths[entry.path]}': {entry.path}")
+        paths[entry.path] = entry.key
+        if any(entry.path.startswith(file) for file in files):
+            errors.append(f"'{entry.key}' is inside a file: {entry.path}")
+    if len(errors) > 0:
+        raise ValueError("Invalid layout:\n" + "\n".join(errors))
+    return LayoutPlan(entries)
+#endregion
+
+
+#region Cache
+def __schema_files__(project_root: str | None):
+    """
+    Returns the layout schemas of a project: the default schema, the schemas of the `DSUTILS_LAYOUT` environment variable and the project schema.
+    """
+    files = [ DEFAULT_SCHEMA ]
+    files += [ os.path.abspath(path) for path in os.environ.get(LAYOUT_ENV_VAR, "").split(os.pathsep) if path != "" ]
+    if project_root is not None:
+        files.append(project_root + LAYOUT_FILE.replace("/", os.sep))
+    return tuple(files)
+
+
+def __signature__(path: str):
+    try:
+        file_stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def get_layout_plan(project_root: str | None = None):
+    """
+    Returns the compiled layout of a project, loading and validating its schemas only once per process or when one of them changes.
+
+    Args:
+    ------
+        project_root (str, optional): The root directory of the project, whose `.dsutils.layout.json` extends the layout.
+            Defaults to only the default schema and the schemas of the `DSUTILS_LAYOUT` environment variable.
+
+    Returns:
+    ------
+        LayoutPlan: The compiled plan.
+
+    Raises:
+    ------
+        ValueError: If a schema is not valid.
+    """
+    files = __schema_files__(project_root)
+    signatures = tuple(__signature__(path) for path in files)
+    with __PLANS_LOCK__:
+        cached = __PLANS__.get(files)
+        if cached is not None and cached[0] == signatures:
+            return cached[1]
+
+    with dsutils_span("layout_compile", schemas=len(files)):
+        schemas = []
+        for i, path in enumerate(files):
+            # The project schema is optional, the other schemas must exist
+            if project_root is not None and i == len(files) - 1 and signatures[i] is None:
+                continue
+            schemas.append((path, __read_schema__(path)))
+        plan = __compile__(schemas)
+    with __PLANS_LOCK__:
+        __PLANS__[files] = (signatures, plan)
+    return plan
+
+
+def clear_layout_cache():
+    """
+    Forgets every compiled layout, e.g. after changing a schema within the same clock tick.
+    """
+    with __PLANS_LOCK__:
+        __PLANS__.clear()
+#endregion
+
+
+def main(argv: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m dsutils layout", description="Compare the layout of a project with its files and folders.")
+    parser.add_argument("-p", "--projectroot", default=None, help="The root directory of the project. Defaults to the project of the working directory.")
+    args = parser.parse_args(argv)
+
+    project_root = dsutils_get_project_root() if args.projectroot is None else os.path.abspath(args.projectroot)
+    try:
+        diff = get_layout_plan(project_root).diff(project_root)
+    except ValueError as e:
+        dsutils_exit(e)
+    for entry in diff.missing:
+        dsutils_warn(f"missing: {entry.path}")
+    for entry in diff.conflicting:
+        dsutils_error(f"not a {'file' if entry.is_file else 'folder'}: {entry.path}")
+    if not diff.is_complete():
+        sys.exit(1)
+    dsutils_success(f"All {len(diff.existing)} files and folders of the layout exist.")
+
+
+if __name__ == "__main__":
+    main()
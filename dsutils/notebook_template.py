@@ -0,0 +1,139 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+import json
+import re
+import threading
+
+
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(__file__), "notebook_template.ipynb")
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+__TEMPLATES__: dict[str, tuple[tuple[int, int], "NotebookTemplate"]] = dict()
+__TEMPLATES_LOCK__ = threading.Lock()
+
+
+class NotebookTemplate:
+    """
+    A notebook (`.ipynb`) template with `{{placeholder}}` fields inside its JSON strings.
+
+    The template is parsed and serialised once, then split into literal segments and placeholder names.
+    Rendering only joins the segments with the JSON-escaped values, so it is cheap and always produces valid JSON,
+    whatever quotes, backslashes or newlines the values contain.
+    """
+
+    def __init__(self, notebook: dict):
+        if not isinstance(notebook, dict) or not isinstance(notebook.get("cells"), list):
+            raise ValueError("A notebook template must be a JSON object with a 'cells' list.")
+
+        parts = PLACEHOLDER.split(json.dumps(notebook, indent=4))
+        # re.split alternates between literal segments and captured placeholder names
+        self.segments: list[str] = parts[0::2]
+        self.fields: list[str] = parts[1::2]
+
+    @classmethod
+    def from_file(cls, path: str):
+        """
+        Parses the notebook template at the given path.
+
+        Args:
+        ------
+            path (str): The path to the `.ipynb` template.
+
+        Returns:
+        ------
+            NotebookTemplate: The compiled template.
+
+        Raises:
+        ------
+            ValueError: If the file is not a valid notebook.
+        """
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def render(self, **values):
+        """
+        Fills in the placeholders of the template.
+
+        Args:
+        ------
+            **values: The value of every placeholder. Values are converted with `str()`.
+
+        Returns:
+        ------
+            str: The notebook as a JSON string.
+
+        Raises:
+        ------
+            KeyError: If no value was given for a placeholder of the template.
+        """
+        escaped: dict[str, str] = dict()
+        for field in self.fields:
+            if field not in escaped:
+                if field not in values:
+                    raise KeyError(f"No value given for notebook template placeholder '{field}'.")
+                # Strip the surrounding quotes, the placeholder is already inside a JSON string
+                escaped[field] = json.dumps(str(values[field]))[1:-1]
+
+        rendered = [ self.segments[0] ]
+        for field, segment in zip(self.fields, self.segments[1:]):
+            rendered.append(escaped[field])
+            rendered.append(segment)
+        return "".join(rendered) + "\n"
+
+
+def load_notebook_template(path: str | None = None):
+    """
+    Returns the compiled notebook template at the given path, parsing it only once per process or when the file changes.
+
+    Args:
+    ------
+        path (str, optional): The path to the `.ipynb` template. Defaults to the template shipped with DSUtils.
+
+    Returns:
+    ------
+        NotebookTemplate: The compiled template.
+    """
+    if path is None:
+        path = DEFAULT_TEMPLATE
+    path = os.path.abspath(path)
+
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with __TEMPLATES_LOCK__:
+        cached = __TEMPLATES__.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    template = NotebookTemplate.from_file(path)
+    with __TEMPLATES_LOCK__:
+        __TEMPLATES__[path] = (signature, template)
+    return template
+
+
+def get_notebook_template(env_vars: dict[str, str] | None = None):
+    """
+    Returns the notebook template of the project.
+
+    Projects can provide their own template by setting `NOTEBOOK_TEMPLATE` in the `.dsutils.env` file to a path relative to the project root.
+    Otherwise the template shipped with DSUtils is used.
+
+    Args:
+    ------
+        env_vars (dict[str, str], optional): The environment variables of the project. Defaults to `dsutils_read_env()`.
+
+    Returns:
+    ------
+        NotebookTemplate: The compiled template.
+    """
+    if env_vars is None:
+        env_vars = dsutils_read_env()
+
+    template = env_vars.get("NOTEBOOK_TEMPLATE")
+    if template is None or template == "":
+        return load_notebook_template()
+    return load_notebook_template(env_vars["PROJECT_ROOT"] + template)
@@ -0,0 +1,276 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import quote
+import hashlib
+import json
+import shutil
+
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_VERSION = 1
+# Encoded records of a shard are buffered up to this many bytes before they are written, bounding the memory used per shard
+SHARD_BUFFER_SIZE = 1024 * 1024
+
+
+class __ShardWriter__:
+    """
+    Streams the records of one shard to its file as JSON lines, while keeping count of its rows and its SHA-256 checksum.
+
+    At most `SHARD_BUFFER_SIZE` bytes of encoded records are buffered. Full buffers are written on the executor, if given,
+    one at a time per shard so the file is written in order, while the next buffer is filled.
+    """
+
+    def __init__(self, path: str, key: tuple, executor: ThreadPoolExecutor | None = None):
+        self.path = path
+        self.key = key
+        self.rows = 0
+        self._executor = executor
+        self._hash = hashlib.sha256()
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._pending: Future | None = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def add(self, record: dict):
+        line = json.dumps(record) + "\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        self.rows += 1
+        if self._buffered >= SHARD_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        if len(self._buffer) == 0:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer = []
+        self._buffered = 0
+        # Wait for the previous write, so at most one buffer per shard is in flight
+        if self._pending is not None:
+            self._pending.result()
+        if self._executor is None:
+            self.__write__(data)
+        else:
+            self._pending = self._executor.submit(self.__write__, data)
+
+    def __write__(self, data: bytes):
+        self._hash.update(data)
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def close(self):
+        """
+        Writes the remaining records and waits for the writes of the shard.
+
+        Returns:
+        ------
+            tuple[int, str]: The number of rows and the SHA-256 checksum of the shard.
+        """
+        self.flush()
+        if self._pending is not None:
+            self._pending.result()
+        return self.rows, self._hash.hexdigest()
+
+
+def __read_shard__(path: str, checksum: str | None = None):
+    with open(path, "rb") as f:
+        data = f.read()
+    if checksum is not None and hashlib.sha256(data).hexdigest() != checksum:
+        raise ValueError(f"Shard checksum does not match its manifest: {path}")
+    return [ json.loads(line) for line in data.splitlines() if line.strip() != b"" ]
+
+
+def __records__(dataset):
+    """
+    Returns the records of a dataset given either as records or as a dict of equally long columns.
+    """
+    if isinstance(dataset, dict):
+        columns = list(dataset)
+        # NumPy arrays are converted to lists, so their values are plain Python values that can be serialized
+        values = [ dataset[column].tolist() if hasattr(dataset[column], "tolist") else dataset[column] for column in columns ]
+        return ( dict(zip(columns, row)) for row in zip(*values) )
+    return dataset
+
+
+def __partition_dir__(by: list[str], partition: tuple):
+    return os.path.join(*[ f"{quote(column, safe='')}={quote(str(value), safe='')}" for column, value in zip(by, partition) ]) if len(by) > 0 else ""
+
+
+def write_partitioned(dataset, name: str, by: str | list[str] | None = None, n_shards: int = 1, processed_dir: str | None = None, workers: int | None = None):
+    """
+    Writes a dataset into the processed data directory, split into partitions and shards that can be read in parallel.
+
+    Records are grouped into one directory per value of the `by` columns (`<name>/year=2024/region=eu/`), and every partition
+    is split into up to `n_shards` JSON lines files. Records are streamed into their shard as they are read from the dataset,
+    so at most `SHARD_BUFFER_SIZE` bytes per shard are held in memory, rather than the whole dataset. The shards are written on a thread pool.
+    A manifest records the partition values, row count and SHA-256 checksum of every shard.
+    The dataset is written next to its final location and swapped in when complete, so readers never see a partial dataset.
+
+    Example:
+    ------
+    ```python
+    write_partitioned(records, "sales", by="year", n_shards=8)
+    recent = list(read_partitioned("sales", where=lambda p: p["year"] >= 2023))
+    ```
+
+    Args:
+    ------
+        dataset (Iterable[dict] | dict[str, Sequence]): The records, or a dict of equally long columns (e.g. from `load_dataset()`).
+        name (str): The name of the dataset, a path relative to the processed data directory.
+        by (str | list[str], optional): The columns to partition by. Defaults to no partitioning.
+        n_shards (int, optional): The number of shards per partition. Defaults to 1.
+        processed_dir (str, optional): The processed data directory. Defaults to the one of the current project.
+        workers (int, optional): The number of threads writing shards, 1 to write in the current thread. Defaults to the `ThreadPoolExecutor` default.
+
+    Returns:
+    ------
+        dict: The manifest of the written dataset.
+
+    Raises:
+    ------
+        ValueError: If `n_shards` is less than 1, or a record has no value for a partition column.
+    """
+    if n_shards < 1:
+        raise ValueError("The number of shards must be at least 1.")
+    by = [] if by is None else [ by ] if isinstance(by, str) else list(by)
+    processed_dir = dsutils_get_data_processed_dir() if processed_dir is None else processed_dir
+
+    dataset_dir = os.path.join(processed_dir, name)
+    tmp_dir = f"{dataset_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    executor = None if workers == 1 else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dsutils-shards")
+    try:
+        # The shards of every partition, in the order the partitions were first seen
+        partitions: dict[tuple, list[__ShardWriter__ | None]] = dict()
+        counts: dict[tuple, int] = dict()
+        for index, record in enumerate(__records__(dataset)):
+            try:
+                key = tuple([ record[column] for column in by ])
+            except KeyError as e:
+                raise ValueError(f"Record {index} has no value for partition column {e}.") from None
+            if key not in partitions:
+                partitions[key] = [ None ] * n_shards
+                counts[key] = 0
+            # Spread the records of a partition evenly over its shards
+            shard = counts[key] % n_shards
+            if partitions[key][shard] is None:
+                path = os.path.join(__partition_dir__(by, key), f"part-{shard:05d}.jsonl")
+                partitions[key][shard] = __ShardWriter__(os.path.join(tmp_dir, path), key, executor)
+            partitions[key][shard].add(record)
+            counts[key] += 1
+
+        writers = [ writer for shards in partitions.values() for writer in shards if writer is not None ]
+        results = [ writer.close() for writer in writers ]
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "by": by,
+            "rows": sum([ rows for rows, _ in results ]),
+            "shards": [
+                { "path": os.path.relpath(writer.path, tmp_dir), "partition": dict(zip(by, writer.key)), "rows": rows, "checksum": checksum }
+                for writer, (rows, checksum) in zip(writers, results)
+            ],
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=4)
+
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.replace(tmp_dir, dataset_dir)
+    except BaseException:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return manifest
+
+
+def read_manifest(name: str, processed_dir: str | None = None):
+    """
+    Returns the manifest of a partitioned dataset.
+
+    Raises:
+    ------
+        FileNotFoundError: If the dataset does not exist.
+    """
+    processed_dir = dsutils_get_data_processed_dir() if processed_dir is None else processed_dir
+    with open(os.path.join(processed_dir, name, MANIFEST_FILE), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported partition manifest version: {manifest.get('version')}")
+    return manifest
+
+
+def __matches__(partition: dict, where: Callable[[dict], bool] | dict | None):
+    if where is None:
+        return True
+    if isinstance(where, dict):
+        return all([ partition.get(column) == value for column, value in where.items() ])
+    return where(partition)
+
+
+def select_shards(name: str, where: Callable[[dict], bool] | dict | None = None, processed_dir: str | None = None):
+    """
+    Returns the manifest entries of the shards whose partition matches `where`, with absolute paths, without reading any shard.
+
+    Use it to distribute the shards of a dataset over parallel jobs.
+
+    Args:
+    ------
+        name (str): The name of the dataset.
+        where (Callable[[dict], bool] | dict, optional): A predicate on the partition values of a shard, or a dict of values they must equal. Defaults to all shards.
+        processed_dir (str, optional): The processed data directory. Defaults to the one of the current project.
+
+    Returns:
+    ------
+        list[dict]: The `path`, `partition`, `rows` and `checksum` of every selected shard.
+    """
+    processed_dir = dsutils_get_data_processed_dir() if processed_dir is None else processed_dir
+    manifest = read_manifest(name, processed_dir)
+    dataset_dir = os.path.join(processed_dir, name)
+    return [ dict(shard, path=os.path.join(dataset_dir, shard["path"])) for shard in manifest["shards"] if __matches__(shard["partition"], where) ]
+
+
+def read_partitioned(name: str, where: Callable[[dict], bool] | dict | None = None, verify: bool = False, processed_dir: str | None = None, workers: int = 4):
+    """
+    Reads the records of a partitioned dataset, only opening the shards whose partition matches `where`.
+
+    Shards are read on a thread pool, at most `workers` shards ahead of the consumer, and their records yielded in manifest order.
+
+    Args:
+    ------
+        name (str): The name of the dataset.
+        where (Callable[[dict], bool] | dict, optional): A predicate on the partition values of a shard, or a dict of values they must equal. Defaults to all shards.
+        verify (bool, optional): Check the checksum of every shard read. Defaults to False.
+        processed_dir (str, optional): The processed data directory. Defaults to the one of the current project.
+        workers (int, optional): The number of shards read concurrently. Defaults to 4.
+
+    Returns:
+    ------
+        Iterator[dict]: The records of the selected shards.
+
+    Raises:
+    ------
+        FileNotFoundError: If the dataset does not exist.
+        ValueError: If `verify` is set and a shard does not match its checksum.
+    """
+    shards = select_shards(name, where, processed_dir)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = []
+        for shard in shards:
+            pending.append(executor.submit(__read_shard__, shard["path"], shard["checksum"] if verify else None))
+            if len(pending) > workers:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
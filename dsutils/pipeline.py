@@ -0,0 +1,270 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dsutils.step_cache import __source_hash__
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+import glob
+import hashlib
+import json
+
+
+MANIFEST_FILE = ".pipeline.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class PipelineStep:
+    """
+    A transformation registered on a `Pipeline`.
+
+    Attributes:
+    ----------
+    name : str
+        The unique name of the step.
+    func : Callable[[list[str], str], None]
+        The transformation, called with the list of input paths and the processed data directory.
+    inputs : list[str]
+        Glob patterns relative to the raw data directory.
+    outputs : list[str]
+        Paths relative to the processed data directory the step produces.
+    depends_on : list[str]
+        Names of the steps whose outputs are also inputs of this step.
+    """
+    name: str
+    func: object
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    depends_on: list[str] = field(default_factory=list)
+
+
+def __hash_file__(path: str):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def __run_step__(func, inputs: list[str], output_dir: str):
+    """
+    Runs a step in a worker process.
+    """
+    func(inputs, output_dir)
+
+
+class Pipeline:
+    """
+    Runs transformation steps from the raw data directory into the processed data directory, like make or DVC.
+
+    For every step the manifest records the hash of its code, and the size, modification time and hash of every input file.
+    A step only runs again when its code changed, its inputs changed, one of its outputs is missing or one of the steps it depends on ran.
+    Input files are only re-hashed when their size or modification time changed, so a rebuild without changes is just a few `stat` calls.
+    Independent steps run in parallel on a process pool, so step functions must be defined at module level.
+
+    Example:
+    ------
+    ```python
+    pipeline = Pipeline()
+
+    @pipeline.step(inputs=["sales/*.csv"], outputs=["sales.parquet"])
+    def combine_sales(inputs: list[str], output_dir: str):
+        ...
+
+    pipeline.run()
+    ```
+    """
+
+    def __init__(self, raw_dir: str | None = None, processed_dir: str | None = None):
+        self._raw_dir = raw_dir
+        self._processed_dir = processed_dir
+        self.steps: dict[str, PipelineStep] = dict()
+
+    @property
+    def raw_dir(self):
+        if self._raw_dir is None:
+            self._raw_dir = dsutils_get_data_raw_dir()
+        return self._raw_dir
+
+    @property
+    def processed_dir(self):
+        if self._processed_dir is None:
+            self._processed_dir = dsutils_get_data_processed_dir()
+        return self._processed_dir
+
+    @property
+    def manifest_file(self):
+        return os.path.join(self.processed_dir, MANIFEST_FILE)
+
+    #region Registration
+    def add_step(self, func, inputs: list[str] | None = None, outputs: list[str] | None = None, depends_on: list[str] | None = None, name: str | None = None):
+        """
+        Registers a step. See `PipelineStep` for the arguments.
+
+        Returns:
+        ------
+            PipelineStep: The registered step.
+
+        Raises:
+        ------
+            ValueError: If a step with the same name exists, or a dependency is not registered.
+        """
+        name = func.__name__ if name is None else name
+        if name in self.steps:
+            raise ValueError(f"A pipeline step with this name already exists: {name}")
+        for dependency in depends_on or []:
+            if dependency not in self.steps:
+                raise ValueError(f"Pipeline step {name} depends on unknown step: {dependency}")
+
+        step = PipelineStep(name, func, list(inputs or []), list(outputs or []), list(depends_on or []))
+        self.steps[name] = step
+        return step
+
+    def step(self, inputs: list[str] | None = None, outputs: list[str] | None = None, depends_on: list[str] | None = None, name: str | None = None):
+        """
+        Decorator registering a function as a step. See `add_step()`.
+        """
+        def decorator(func):
+            self.add_step(func, inputs, outputs, depends_on, name)
+            return func
+        return decorator
+    #endregion
+
+    #region Manifest
+    def __load_manifest__(self):
+        try:
+            with open(self.manifest_file, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return dict()
+        if manifest.get("version") != MANIFEST_VERSION:
+            return dict()
+        return manifest["steps"]
+
+    def __save_manifest__(self, steps: dict):
+        tmp_file = f"{self.manifest_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({ "version": MANIFEST_VERSION, "steps": steps }, f, indent=4)
+        os.replace(tmp_file, self.manifest_file)
+    #endregion
+
+    #region Fingerprints
+    def __input_paths__(self, step: PipelineStep):
+        """
+        Returns the sorted input files of a step: the files matching its patterns and the outputs of its dependencies.
+        """
+        paths = set()
+        for pattern in step.inputs:
+            paths.update([ p for p in glob.glob(os.path.join(self.raw_dir, pattern), recursive=True) if os.path.isfile(p) ])
+        for dependency in step.depends_on:
+            paths.update([ os.path.join(self.processed_dir, output) for output in self.steps[dependency].outputs ])
+        return sorted(paths)
+
+    def __fingerprint__(self, step: PipelineStep, previous: dict):
+        """
+        Returns the fingerprint of the inputs of a step, reusing the previous hash of every file whose size and modification time did not change.
+        """
+        previous_inputs = previous.get("inputs", {})
+        inputs = dict()
+        for path in self.__input_paths__(step):
+            stat = os.stat(path)
+            old = previous_inputs.get(path)
+            if old is not None and old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+                inputs[path] = old
+            else:
+                inputs[path] = [ stat.st_size, stat.st_mtime_ns, __hash_file__(path) ]
+        return { "code": __source_hash__(step.func), "inputs": inputs }
+
+    def __is_up_to_date__(self, step: PipelineStep, previous: dict, fingerprint: dict):
+        if previous.get("code") != fingerprint["code"]:
+            return False
+        previous_inputs = previous.get("inputs", {})
+        if previous_inputs.keys() != fingerprint["inputs"].keys():
+            return False
+        if any([ previous_inputs[p][2] != v[2] for p, v in fingerprint["inputs"].items() ]):
+            return False
+        return all([ os.path.exists(os.path.join(self.processed_dir, output)) for output in step.outputs ])
+    #endregion
+
+    def run(self, force: bool = False, workers: int | None = None):
+        """
+        Runs every step that is out of date, in dependency order.
+
+        Args:
+        ------
+            force (bool, optional): Run every step, even if it is up to date. Defaults to False.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs. With 1, steps run in the current process.
+
+        Returns:
+        ------
+            dict[str, str]: The status of every step, either `"ran"` or `"skipped"`.
+
+        Raises:
+        ------
+            Exception: The first exception raised by a step. Steps that completed are still recorded in the manifest.
+        """
+        manifest = self.__load_manifest__()
+        status: dict[str, str] = dict()
+        pending = dict(self.steps)
+        running = dict()
+        error = None
+
+        def __complete__(name: str, fingerprint: dict):
+            missing = [ output for output in self.steps[name].outputs if not os.path.exists(os.path.join(self.processed_dir, output)) ]
+            if len(missing) > 0:
+                raise FileNotFoundError(f"Pipeline step {name} did not produce its outputs: {', '.join(missing)}")
+            manifest[name] = fingerprint
+            status[name] = "ran"
+            dsutils_success(f"Pipeline step {name} ran")
+
+        def __schedule__(executor):
+            for name, step in list(pending.items()):
+                if any([ dependency not in status for dependency in step.depends_on ]):
+                    continue
+                del pending[name]
+
+                fingerprint = self.__fingerprint__(step, manifest.get(name, {}))
+                dependency_ran = any([ status[dependency] == "ran" for dependency in step.depends_on ])
+                if not force and not dependency_ran and self.__is_up_to_date__(step, manifest.get(name, {}), fingerprint):
+                    # Store refreshed modification times, so the files are not hashed again next time
+                    manifest[name] = dict(manifest[name], inputs=fingerprint["inputs"])
+                    status[name] = "skipped"
+                    continue
+
+                args = (step.func, list(fingerprint["inputs"]), self.processed_dir)
+                if executor is None:
+                    __run_step__(*args)
+                    __complete__(name, fingerprint)
+                else:
+                    running[executor.submit(__run_step__, *args)] = (name, fingerprint)
+
+        try:
+            if workers == 1:
+                while len(pending) > 0:
+                    __schedule__(None)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    __schedule__(executor)
+                    while len(running) > 0:
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name, fingerprint = running.pop(future)
+                            try:
+                                future.result()
+                                __complete__(name, fingerprint)
+                            except Exception as e:
+                                dsutils_error(f"Pipeline step {name} failed: {e}")
+                                error = error or e
+                        if error is None:
+                            __schedule__(executor)
+        finally:
+            self.__save_manifest__(manifest)
+
+        if error is not None:
+            raise error
+        return status
@@ -0,0 +1,182 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dsutils.create_files_and_folders import LAYOUT_VERSION
+from collections.abc import Iterable
+from datetime import datetime
+import json
+
+
+REGISTRY_VERSION = 1
+REGISTRY_FILE = "projects.json"
+LOCK_FILE = "projects.lock"
+
+
+def get_dsutils_home():
+    """
+    Returns the directory of the per-user DSUtils files, the `DSUTILS_HOME` environment variable or `~/.dsutils`.
+    """
+    home = os.environ.get("DSUTILS_HOME", "")
+    if home == "":
+        home = os.path.join(os.path.expanduser("~"), ".dsutils")
+    return os.path.abspath(home)
+
+
+class ProjectRegistry:
+    """
+    Central registry of the projects DSUtils has been set up for, so tools operating on every project do not need to crawl the filesystem.
+
+    The registry is a `projects.json` file in the DSUtils home directory, mapping the root directory of every project to its
+    `name`, `layout_version`, `registered_at` and `updated_at`. Writers hold a lock on the registry and replace the file atomically,
+    readers never block.
+    """
+
+    def __init__(self, home: str | None = None):
+        self.home = get_dsutils_home() if home is None else os.path.abspath(home)
+        self.registry_file = os.path.join(self.home, REGISTRY_FILE)
+        self.lock_file = os.path.join(self.home, LOCK_FILE)
+
+    #region Persistence
+    def __read__(self):
+        """
+        Returns the projects in the registry file, none if it does not exist or has another version.
+        """
+        try:
+            with open(self.registry_file, "r") as f:
+                registry = json.load(f)
+        except FileNotFoundError:
+            return dict()
+        if not isinstance(registry, dict) or registry.get("version") != REGISTRY_VERSION:
+            return dict()
+        return registry["projects"]
+
+    def __write__(self, projects: dict[str, dict]):
+        tmp_file = f"{self.registry_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump({ "version": REGISTRY_VERSION, "projects": projects }, f, indent=4)
+            os.replace(tmp_file, self.registry_file)
+        finally:
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+    #endregion
+
+    def projects(self, layout_version: int | None = None):
+        """
+        Returns the registered projects, sorted by root directory.
+
+        Args:
+        ------
+            layout_version (int, optional): Only return the projects with this layout version. Defaults to every project.
+
+        Returns:
+        ------
+            list[dict]: The `root`, `name`, `layout_version`, `registered_at` and `updated_at` of every project.
+        """
+        return [
+            { "root": root, **entry }
+            for root, entry in sorted(self.__read__().items())
+            if layout_version is None or entry["layout_version"] == layout_version
+        ]
+
+    def register(self, roots: Iterable[str], layout_version: int = LAYOUT_VERSION):
+        """
+        Adds projects to the registry, or updates the layout version of projects already in it, with a single write.
+
+        Args:
+        ------
+            roots (Iterable[str]): The root directories of the projects.
+            layout_version (int, optional): The layout version of the projects. Defaults to `LAYOUT_VERSION`.
+        """
+        roots = [ os.path.abspath(root) for root in roots ]
+        if len(roots) == 0:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+
+        os.makedirs(self.home, exist_ok=True)
+        with dsutils_file_lock(self.lock_file):
+            projects = self.__read__()
+            for root in roots:
+                entry = projects.get(root, { "registered_at": now })
+                entry.update({ "name": os.path.basename(root), "layout_version": layout_version, "updated_at": now })
+                projects[root] = entry
+            self.__write__(projects)
+
+    def unregister(self, roots: Iterable[str]):
+        """
+        Removes projects from the registry.
+
+        Returns:
+        ------
+            list[str]: The root directories that were removed.
+        """
+        roots = [ os.path.abspath(root) for root in roots ]
+        if not os.path.isfile(self.registry_file):
+            return []
+        with dsutils_file_lock(self.lock_file):
+            projects = self.__read__()
+            removed = [ root for root in roots if projects.pop(root, None) is not None ]
+            if len(removed) > 0:
+                self.__write__(projects)
+        return removed
+
+    def prune(self):
+        """
+        Removes the projects whose environment file no longer exists from the registry.
+
+        Returns:
+        ------
+            list[str]: The root directories that were removed.
+        """
+        missing = [ root for root in self.__read__() if not os.path.isfile(root + ENV_FILE.replace("/", os.sep)) ]
+        return self.unregister(missing)
+
+
+def register_projects(roots: Iterable[str], layout_version: int = LAYOUT_VERSION, home: str | None = None):
+    """
+    Adds projects to the registry in the DSUtils home directory, see `ProjectRegistry.register`.
+    """
+    ProjectRegistry(home).register(roots, layout_version)
+
+
+def list_projects(layout_version: int | None = None, home: str | None = None):
+    """
+    Returns the projects in the registry in the DSUtils home directory, see `ProjectRegistry.projects`.
+    """
+    return ProjectRegistry(home).projects(layout_version)
+
+
+def main(argv: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m dsutils projects", description="List the projects DSUtils has been set up for.")
+    parser.add_argument("-l", "--layout-version", type=int, default=None, help="Only list the projects with this layout version.")
+    parser.add_argument("-j", "--json", action="store_true", help="Print the projects as JSON.")
+    parser.add_argument("--prune", action="store_true", help="Remove the projects whose environment file no longer exists first.")
+    args = parser.parse_args(argv)
+
+    registry = ProjectRegistry()
+    if args.prune:
+        for root in registry.prune():
+            if args.json:
+                # Keep stdout valid JSON
+                print(f"removed: {root}", file=sys.stderr)
+            else:
+                dsutils_warn(f"removed: {root}")
+        # The console buffers log messages, write them before the listing printed below
+        dsutils_flush_logs()
+
+    projects = registry.projects(args.layout_version)
+    if args.json:
+        print(json.dumps(projects, indent=4))
+        return
+    for project in projects:
+        print(f"{project['root']}\tlayout v{project['layout_version']}\tupdated {project['updated_at']}")
+
+
+if __name__ == "__main__":
+    main()
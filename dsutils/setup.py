@@ -5,8 +5,12 @@ if __name__ == "__main__":
     sys.path.insert(0, dsutils_path)
 
 from dsutils.internals import *
-from dsutils.create_files_and_folders import create_files_and_folders, __get_files_and_folders_from_json__, __remove_files_and_folders__
+from dsutils.create_files_and_folders import LAYOUT_VERSION, create_files_and_folders, __get_files_and_folders_from_json__, __remove_files_and_folders__
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import argparse
+import contextvars
+import logging
 
 
 PROJECT_ROOT = None
@@ -35,17 +39,58 @@ DSUTILS_FINISHED = """
 def __cleanup__():
     global CREATED_FILES_AND_FOLDERS_CALLED
 
+    if PROJECT_ROOT is None:
+        return
     try:
-        if os.path.isfile(ENV_FILE):
-            os.remove(ENV_FILE)
+        env_file_path = PROJECT_ROOT + ENV_FILE.replace("/", os.sep)
+        if os.path.isfile(env_file_path):
+            os.remove(env_file_path)
         if CREATED_FILES_AND_FOLDERS_CALLED:
-            __remove_files_and_folders__()
+            __remove_files_and_folders__(PROJECT_ROOT)
     except Exception as e:
         dsutils_error("Exception occured while cleaning up:")
         dsutils_error(e)
 
 
-def setup():
+def __write_env_file__(project_root: str, created_paths: list[str]):
+    """
+    Writes the environment file of the project, with the paths of the created files and folders relative to the project root.
+
+    Returns:
+    ------
+        str: The path to the environment file.
+    """
+    env_file_path = project_root + ENV_FILE.replace("/", os.sep)
+    env_vars = [
+        ("PROJECT_ROOT", project_root),
+        ("PROJECT_NAME", os.path.basename(project_root))
+    ]
+    for key, value in zip(__get_files_and_folders_from_json__(project_root), created_paths):
+        if key != "env_file":
+            env_vars.append((str(key).upper(), value.replace(project_root, "")))
+
+    with dsutils_span("env_write") as span:
+        env_content = "\n".join([ f"{v[0]}={v[1]}" for v in env_vars ])
+        with open(env_file_path, "w") as f:
+            f.write(env_content)
+        span.add_file(len(env_content))
+    dsutils_invalidate_env(project_root)
+    return env_file_path
+
+
+def __register_projects__(roots: list[str]):
+    """
+    Adds the projects to the project registry. Failing to do so does not fail the setup, as the projects themselves are usable.
+    """
+    from dsutils.project_registry import register_projects
+    try:
+        register_projects(roots, LAYOUT_VERSION)
+    except Exception as e:
+        dsutils_warn(f"Could not add the project to the project registry: {e}")
+
+
+@dsutils_traced("setup")
+def setup(argv: list[str] | None = None):
     """
     Creates the .dsutils.env file in the project root directory
     
@@ -57,7 +102,7 @@ def setup():
 
     parser = argparse.ArgumentParser(description='Initialize DSUtils for the given project.')
     parser.add_argument('-p', '--projectroot', default=None, help='The path (relative or absolute) to the root directory of the project you want to use DSUtils with.')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     PROJECT_ROOT = args.projectroot
 
     dsutils_info(DSUTILS_START)
@@ -111,23 +156,12 @@ def setup():
         #endregion
 
         #region Create environment file
-        env_vars = [
-            ("PROJECT_ROOT", PROJECT_ROOT),
-            ("PROJECT_NAME", os.path.basename(PROJECT_ROOT))
-        ]
-        for key, value in zip(__get_files_and_folders_from_json__(PROJECT_ROOT), created_paths):
-            if key != "env_file":
-                env_vars.append((str(key).upper(), value.replace(PROJECT_ROOT, "")))
-
-        with open(env_file_path, "w") as f:
-            for i, v in enumerate(env_vars):
-                f.write(f"{v[0]}={v[1]}")
-                if i < len(env_vars) - 1:
-                    f.write("\n")
-
+        __write_env_file__(PROJECT_ROOT, created_paths)
         dsutils_success(f"Created DSUtils environment file at: {env_file_path}")
         #endregion
 
+        __register_projects__([ PROJECT_ROOT ])
+
         # TODO: Update gitignore
 
         dsutils_success(DSUTILS_FINISHED)
@@ -138,5 +172,98 @@ def setup():
         sys.exit(1)
 
 
+def __setup_project__(project_root: str, overwrite: bool):
+    """
+    Creates the files and folders and the environment file of a single project without asking the user anything.
+
+    Returns:
+    ------
+        dict: The `root` of the project, its `status` (`created`, `skipped` or `failed`), the `error` if it failed,
+        and the `messages` logged while setting it up, as `(level, message)` pairs.
+    """
+    env_file_path = project_root + ENV_FILE.replace("/", os.sep)
+    with dsutils_raise_errors(), dsutils_capture_logs() as messages:
+        try:
+            if not os.path.isdir(project_root):
+                raise FileNotFoundError(f"The project root directory does not exist: {project_root}")
+            if os.path.isfile(env_file_path) and not overwrite:
+                result = { "root": project_root, "status": "skipped", "error": None }
+            else:
+                if os.path.isfile(env_file_path):
+                    os.remove(env_file_path)
+                created_paths = create_files_and_folders(project_root)
+                __write_env_file__(project_root, created_paths)
+                result = { "root": project_root, "status": "created", "error": None }
+        except Exception as e:
+            # Any error, e.g. an invalid layout schema of the project, only fails this project and not the whole batch
+            result = { "root": project_root, "status": "failed", "error": str(e) or type(e).__name__ }
+    result["messages"] = messages
+    return result
+
+
+@dsutils_traced("setup_many")
+def setup_many(roots: Iterable[str], workers: int | None = None, overwrite: bool = False):
+    """
+    Sets up DSUtils for many projects at once, without asking the user anything, e.g. when provisioning a fleet of projects.
+
+    The files and folders and environment file of every project are created in parallel on a thread pool.
+    A project that fails to be set up does not affect the others, and the created projects are added to the project registry with a single write.
+
+    Args:
+    ------
+        roots (Iterable[str]): The root directories of the projects. They must already exist.
+        workers (int, optional): The number of threads used to set up the projects. Defaults to the `ThreadPoolExecutor` default.
+        overwrite (bool, optional): Set up projects that already have an environment file again, instead of skipping them. Defaults to False.
+
+    Returns:
+    ------
+        list[dict]: The `root`, `status` (`created`, `skipped` or `failed`), `error` and logged `messages` of every project, in the order of `roots`.
+    """
+    roots = list(dict.fromkeys([ os.path.abspath(str(root).strip()) for root in roots ]))
+    if len(roots) == 0:
+        return []
+
+    # Every thread runs in a copy of the context, so raising errors and capturing logs only applies to its own project
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dsutils-setup") as executor:
+        futures = [ executor.submit(contextvars.copy_context().run, __setup_project__, root, overwrite) for root in roots ]
+        results = [ future.result() for future in futures ]
+
+    __register_projects__([ result["root"] for result in results if result["status"] == "created" ])
+    return results
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m dsutils setup", description='Initialize DSUtils for one project interactively, or for many projects at once.')
+    parser.add_argument('roots', nargs='*', help='The root directories of the projects to set up without asking anything.')
+    parser.add_argument('-p', '--projectroot', default=None, help='The path (relative or absolute) to the root directory of the project you want to use DSUtils with.')
+    parser.add_argument('-f', '--from-file', default=None, help='A file listing the root directories of the projects to set up, one per line.')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='The number of projects set up in parallel.')
+    parser.add_argument('-o', '--overwrite', action='store_true', help='Set up projects that already have an environment file again.')
+    args = parser.parse_args(argv)
+
+    roots = list(args.roots)
+    if args.from_file is not None:
+        with open(args.from_file, "r") as f:
+            roots += [ line.strip() for line in f if line.strip() != "" and not line.startswith("#") ]
+
+    if len(roots) == 0:
+        setup([] if args.projectroot is None else [ "-p", args.projectroot ])
+        return
+
+    results = setup_many(roots, workers=args.workers, overwrite=args.overwrite)
+    for result in results:
+        for level, message in result["messages"]:
+            if level >= logging.WARNING:
+                dsutils_warn(f"{result['root']}: {message}")
+        if result["status"] == "created":
+            dsutils_success(f"created: {result['root']}")
+        elif result["status"] == "skipped":
+            dsutils_warn(f"skipped, environment file already exists: {result['root']}")
+        else:
+            dsutils_error(f"failed: {result['root']}: {result['error']}")
+    if any(result["status"] == "failed" for result in results):
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    setup()
\ No newline at end of file
+    main()
\ No newline at end of file
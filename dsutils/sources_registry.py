@@ -0,0 +1,454 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+import json
+import threading
+
+
+INDEX_VERSION = 2
+INDEX_HEADER = f"dsutils-sources-index {INDEX_VERSION}\n"
+TAIL_LENGTH = 64
+# Number of checkpoints appended to the index before it is compacted into a single one
+COMPACT_AFTER = 256
+
+__REGISTRIES__: dict[str, "SourcesRegistry"] = dict()
+__REGISTRIES_LOCK__ = threading.Lock()
+
+
+def format_row(source_id: int, name: str, description: str, url: str, citation: str):
+    """
+    Formats a source as a row of the sources file.
+
+    Returns:
+    ------
+        str: The row, i.e. `id;'name';'description';'url';'citation'`, without a line ending.
+    """
+    return f"{source_id};'{name}';'{description}';'{url}';'{citation}'"
+
+
+def __parse_row__(line: bytes):
+    """
+    Parses the id and name of a row of the sources file.
+
+    Args:
+    ------
+        line (bytes): A single row of the sources file, without the line ending.
+
+    Returns:
+    ------
+        tuple[int, str] | None: The id and name of the row, or None if the row is the header or malformed.
+    """
+    fields = line.split(b";", 2)
+    if len(fields) < 2:
+        return None
+    try:
+        source_id = int(fields[0])
+    except ValueError:
+        return None
+    name = fields[1].strip().strip(b"'").decode("utf-8")
+    return source_id, name
+
+
+class SourcesRegistry:
+    """
+    Index over the sources file, mapping every source name to the byte offset of its row and tracking the highest id.
+
+    The index is persisted next to the sources file and kept up to date incrementally: when the sources file only grew,
+    just the appended bytes are parsed, and only their names are appended to the index file.
+    If the sources file was rewritten, the index is rebuilt from scratch and the index file rewritten.
+    This makes name validation, id allocation and adding sources constant time, regardless of the number of sources.
+
+    The index file is a header line followed by checkpoint records, one JSON object per line, with the `size`, `mtime_ns`,
+    `max_id` and `tail` of the sources file they cover and the byte offsets of the `names` added since the previous record.
+    A record that can not be parsed, e.g. of a process that stopped while appending it, is skipped.
+    """
+
+    def __init__(self, sources_file: str):
+        self.sources_file = str(sources_file)
+        self.index_file = os.path.join(os.path.dirname(self.sources_file), "." + os.path.basename(self.sources_file) + ".index")
+        self.lock_file = os.path.join(os.path.dirname(self.sources_file), "." + os.path.basename(self.sources_file) + ".lock")
+
+        self._lock = threading.RLock()
+        self._names: dict[str, int] = dict()
+        self._max_id = -1
+        # Size of the indexed part of the sources file, which ends at the start of its last row
+        self._size = 0
+        # Size of the sources file when it was last parsed
+        self._end = 0
+        self._mtime_ns = -1
+        self._tail = b""
+        # The name, offset and id of the last row. It has no line ending yet, so it may still be being appended by another
+        # process, and is parsed again on every refresh rather than indexed
+        self._last: tuple[str, int, int] | None = None
+        self._loaded = False
+        # Whether the index file holds the current index up to its last checkpoint, so records can be appended to it
+        self._index_valid = False
+        self._checkpoints = 0
+
+    #region Persistence
+    def __record__(self, names: dict[str, int]):
+        """
+        Returns a checkpoint record of the index, with the given names, as a line of the index file.
+        """
+        record = { "size": self._size, "mtime_ns": self._mtime_ns, "max_id": self._max_id, "tail": self._tail.hex(), "names": names }
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def __load_index__(self):
+        """
+        Loads the persisted index from disk, if it exists and is readable.
+        """
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except (OSError, ValueError):
+            return
+        if lines[0] != INDEX_HEADER.strip():
+            return
+
+        names: dict[str, int] = dict()
+        record = None
+        checkpoints = 0
+        for line in lines[1:]:
+            try:
+                checkpoint = json.loads(line)
+                names.update(checkpoint["names"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            record = checkpoint
+            checkpoints += 1
+        if record is None:
+            return
+
+        self._names = names
+        self._size = int(record["size"])
+        self._end = self._size
+        self._mtime_ns = int(record["mtime_ns"])
+        self._max_id = int(record["max_id"])
+        self._tail = bytes.fromhex(record["tail"])
+        self._index_valid = True
+        self._checkpoints = checkpoints
+
+    def __write_index__(self):
+        """
+        Atomically rewrites the index file with a single checkpoint. Failing to write the index is not fatal, it will be rebuilt on the next run.
+        """
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(INDEX_HEADER + self.__record__(self._names))
+            os.replace(tmp_file, self.index_file)
+            self._index_valid = True
+            self._checkpoints = 1
+        except OSError:
+            self._index_valid = False
+            if os.path.isfile(tmp_file):
+                os.remove(tmp_file)
+
+    def __append_index__(self, added: dict[str, int]):
+        """
+        Appends a checkpoint with the names of the rows that were indexed incrementally to the index file, with a single write.
+        The index file is compacted instead once it holds `COMPACT_AFTER` checkpoints, or rewritten if it is missing.
+        """
+        if not self._index_valid or self._checkpoints >= COMPACT_AFTER:
+            self.__write_index__()
+            return
+        record = self.__record__(added)
+        try:
+            with open(self.index_file, "a+", encoding="utf-8") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end == 0:
+                    # The index file was removed since it was loaded
+                    self._index_valid = False
+                else:
+                    # Start on a new line if a process stopped in the middle of appending, so its incomplete record is skipped
+                    f.seek(end - 1)
+                    if f.read(1) != "\n":
+                        record = "\n" + record
+                    f.write(record)
+                    self._checkpoints += 1
+        except OSError:
+            self._index_valid = False
+        if not self._index_valid:
+            self.__write_index__()
+    #endregion
+
+    #region Indexing
+    def __index_from__(self, file, offset: int):
+        """
+        Parses every row of the sources file starting at `offset` and adds it to the index.
+
+        Args:
+        ------
+            file (BinaryIO): The opened sources file.
+            offset (int): The byte offset to start parsing from.
+
+        Returns:
+        ------
+            dict[str, int]: The byte offset of every parsed row, by name.
+        """
+        file.seek(offset)
+        data = file.read()
+        lines = data.split(b"\n")
+
+        added: dict[str, int] = dict()
+        position = offset
+        for line in lines[:-1]:
+            row = __parse_row__(line.rstrip(b"\r"))
+            if row is not None:
+                source_id, name = row
+                self._names[name] = position
+                added[name] = position
+                if source_id > self._max_id:
+                    self._max_id = source_id
+            position += len(line) + 1
+
+        # Rows are written with a leading line ending, so the last row may be cut off by a write still in progress
+        last = __parse_row__(lines[-1].rstrip(b"\r"))
+        self._last = None if last is None else (last[1], position, last[0])
+        self._size = position
+        self._end = offset + len(data)
+        file.seek(max(0, self._size - TAIL_LENGTH))
+        self._tail = file.read(min(TAIL_LENGTH, self._size))
+        return added
+
+    def __can_index_incrementally__(self, file, size: int):
+        """
+        Returns True if the sources file only grew since it was last indexed.
+        """
+        if not self._loaded or size < self._size:
+            return False
+        file.seek(max(0, self._size - TAIL_LENGTH))
+        return file.read(len(self._tail)) == self._tail
+
+    def refresh(self):
+        """
+        Brings the index up to date with the sources file.
+
+        Returns:
+        ------
+            SourcesRegistry: The registry itself, to allow chaining.
+
+        Raises:
+        ------
+            FileNotFoundError: If the sources file does not exist.
+        """
+        with self._lock:
+            if not self._loaded:
+                self.__load_index__()
+                self._loaded = self._mtime_ns != -1
+
+            stat = os.stat(self.sources_file)
+            if self._loaded and stat.st_mtime_ns == self._mtime_ns and stat.st_size == self._end:
+                return self
+
+            with open(self.sources_file, "rb") as file:
+                incremental = self.__can_index_incrementally__(file, stat.st_size)
+                if incremental:
+                    added = self.__index_from__(file, self._size)
+                else:
+                    self._names = dict()
+                    self._max_id = -1
+                    self.__index_from__(file, 0)
+
+            self._mtime_ns = stat.st_mtime_ns
+            self._loaded = True
+            if incremental:
+                self.__append_index__(added)
+            else:
+                self.__write_index__()
+            return self
+    #endregion
+
+    #region Queries
+    def __has__(self, name: str):
+        """
+        Returns True if the index or the last row contains the name, without refreshing.
+        """
+        return name in self._names or (self._last is not None and self._last[0] == name)
+
+    def contains(self, name: str):
+        """
+        Returns True if a source with the given name is registered.
+        """
+        self.refresh()
+        return self.__has__(name)
+
+    def offset(self, name: str):
+        """
+        Returns the byte offset of the row of the source with the given name, or None if it does not exist.
+        """
+        self.refresh()
+        if self._last is not None and self._last[0] == name:
+            return self._last[1]
+        return self._names.get(name)
+
+    def next_id(self):
+        """
+        Returns the id the next source should be registered with.
+        """
+        self.refresh()
+        return max(self._max_id, -1 if self._last is None else self._last[2]) + 1
+
+    def names(self):
+        """
+        Returns a snapshot of all registered source names.
+        """
+        self.refresh()
+        return set(self._names) | (set() if self._last is None else { self._last[0] })
+
+    def __contains__(self, name: str):
+        return self.contains(name)
+
+    def __len__(self):
+        return len(self.names())
+    #endregion
+
+    #region Writing
+    def writer(self):
+        """
+        Returns a `SourcesWriter`, which holds the lock on the sources file for a whole batch of sources.
+
+        Example:
+        ------
+        ```python
+        with get_sources_registry().writer() as writer:
+            if not writer.contains("iris"):
+                writer.add("iris", "Iris flower data set", "https://archive.ics.uci.edu/dataset/53/iris", "Fisher, R. A. (1936)")
+        ```
+        """
+        return SourcesWriter(self)
+
+    def append(self, rows: list[str]):
+        """
+        Appends rows to the sources file with a single buffered write, while holding the lock on the sources file.
+
+        Rows must already be formatted, see `format_row()`. Use `writer()` instead to allocate ids atomically.
+
+        Args:
+        ------
+            rows (list[str]): The rows to append.
+        """
+        if len(rows) == 0:
+            return
+        with dsutils_file_lock(self.lock_file):
+            self.__write_rows__(rows)
+
+    def __write_rows__(self, rows: list[str]):
+        """
+        Appends rows to the sources file with a single write. The caller must hold the lock.
+        """
+        with open(self.sources_file, "a") as file:
+            file.write("".join([ f"\n{row}" for row in rows ]))
+    #endregion
+
+
+class SourcesWriter:
+    """
+    Batched writer for the sources file, obtained through `SourcesRegistry.writer()`.
+
+    While the `with` block is active the advisory lock on the sources file is held, so name checks and id allocation
+    cannot race with other writers. Added rows are buffered and written with a single write when the block exits without an exception.
+    """
+
+    def __init__(self, registry: SourcesRegistry):
+        self.registry = registry
+        self.rows: list[str] = []
+        self._pending_names: set[str] = set()
+        self._next_id = 0
+        self._lock = None
+
+    def __enter__(self):
+        self._lock = dsutils_file_lock(self.registry.lock_file)
+        self._lock.__enter__()
+        try:
+            self._next_id = self.registry.next_id()
+        except BaseException:
+            self._lock.__exit__(*sys.exc_info())
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self._lock.__exit__(exc_type, exc_value, traceback)
+        return False
+
+    def contains(self, name: str):
+        """
+        Returns True if a source with the given name exists, or was added earlier in this batch.
+
+        The registry was refreshed when the lock was taken and nobody else can write while it is held, so no refresh is needed here.
+        """
+        return name in self._pending_names or self.registry.__has__(name)
+
+    def __contains__(self, name: str):
+        return self.contains(name)
+
+    def add(self, name: str, description: str, url: str, citation: str):
+        """
+        Allocates the next id for the source and buffers its row.
+
+        Returns:
+        ------
+            str: The formatted row.
+        """
+        row = format_row(self._next_id, name, description, url, citation)
+        self._next_id += 1
+        self._pending_names.add(name)
+        self.rows.append(row)
+        return row
+
+    def flush(self):
+        """
+        Writes the buffered rows to the sources file.
+        """
+        if len(self.rows) == 0:
+            return
+        self.registry.__write_rows__(self.rows)
+        self.rows = []
+        self._pending_names = set()
+
+
+def get_sources_registry(sources_file: str | None = None):
+    """
+    Returns the process-wide `SourcesRegistry` of the given sources file.
+
+    If the sources file does not exist, an error is printed to the console and the program exits.
+
+    Args:
+    ------
+        sources_file (str, optional): The path to the sources file. Defaults to `dsutils_get_sources_file()`.
+
+    Returns:
+    ------
+        SourcesRegistry: The registry of the sources file.
+    """
+    if sources_file is None:
+        sources_file = dsutils_get_sources_file()
+    sources_file = os.path.abspath(sources_file)
+
+    if not os.path.isfile(sources_file):
+        dsutils_exit(
+            f"Sources file does not exist: {sources_file}",
+            "This probably means that DSUtils has not been setup for this project.",
+            "Please run the DSUtils setup script before continuing.",
+            "Exiting...",
+        )
+
+    with __REGISTRIES_LOCK__:
+        registry = __REGISTRIES__.get(sources_file)
+        if registry is None:
+            registry = SourcesRegistry(sources_file)
+            __REGISTRIES__[sources_file] = registry
+    return registry
+
+
+if __name__ == "__main__":
+    registry = get_sources_registry().refresh()
+    dsutils_info(f"Indexed {len(registry)} sources, next id: {registry.next_id()}")
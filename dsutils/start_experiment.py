@@ -5,23 +5,20 @@ if __name__ == "__main__":
     sys.path.insert(0, dsutils_path)
     
 from dsutils.internals import *
-import argparse
+from dsutils.experiment_catalogue import get_experiment_catalogue
+from dsutils.notebook_template import NotebookTemplate, get_notebook_template
+import itertools
+import json
 import re
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor
 
 
-parser = argparse.ArgumentParser(description='Starts a new experiment.')
-parser.add_argument('-n', '--name', default=None, help='The name of the experiment.')
-parser.add_argument('-d', '--description', default="", help='The description of the experiment.')
-args = parser.parse_args()
-
-NAME = args.name
-DESCRIPTION = args.description
-
-
-def __validate_NAME__(name: str | None = None):
+def __validate_NAME__(name: str | None = None, existing_names: Container[str] | None = None):
     errors = []
 
-    existing_experiments = os.listdir(dsutils_get_experiments_dir())
+    # A catalogue, or a snapshot of lowercased experiment names when validating many names at once, can be passed
+    catalogue = get_experiment_catalogue() if existing_names is None else existing_names
     allowed_chars = r"[a-zA-Z0-9\s_\-]"
 
     if name == "" or name is None:
@@ -30,7 +27,7 @@ def __validate_NAME__(name: str | None = None):
         errors.append("Experiment name cannot be longer than 50 characters.")
     if name is not None and not re.match(allowed_chars + "+", name):
         errors.append("Experiment name can only contain alphanumeric characters, whitespace, underscores, and hyphens.")
-    if name is not None and name.lower() in [experiment.lower() for experiment in existing_experiments]:
+    if name is not None and name.lower() in catalogue:
         errors.append("An experiment with this name already exists.")
     
     return errors
@@ -44,79 +41,46 @@ def __validate_DESCRIPTION__(description: str | None = None):
     return errors
 
 
-def __generate_notebook_content__(name: str, description: str):
-    name = name.strip()
-    name = name.replace("_", " ")
-    name = name.replace("-", " ")
-    name = name.title()
-
-    description = description.strip()
-
-    env_vars = dsutils_read_env()
-    for k, v in env_vars.items():
-        env_vars[k] = v.replace(os.sep, f"{os.sep}{os.sep}")
-
-    project_dir = env_vars["PROJECT_ROOT"]
-    experiments_dir = env_vars["EXPERIMENTS_DIR"]
-    data_dir = env_vars["DATA_DIR"]
-    processed_dir = env_vars["DATA_PROCESSED_DIR"]
-    raw_dir = env_vars["DATA_RAW_DIR"]
-    artifacts_dir = env_vars["ARTIFACTS_DIR"]
-    sources_file = env_vars["SOURCES_FILE"]
-
-    content = """{
-    "cells": [
-        {
-            "cell_type": "markdown",
-            "metadata": {},
-            "source": [
-                "# """ + name + """\\n",
-                "\\n",
-                \"""" + description + """\"
-            ]
-        },
-        {
-            "cell_type": "code",
-            "execution_count": null,
-            "metadata": {},
-            "outputs": [],
-            "source": [
-                "# DSUtils - ENV variables\\n",
-                "import os",
-                "import sys\\n",
-                "\\n",
-                "# Paths to project files & directories\\n",
-                "project_dir = r'""" + project_dir + """'\\n",
-                "experiments_dir = project_dir + r'""" + experiments_dir + """'\\n",
-                "data_dir = project_dir + r'""" + data_dir + """'\\n",
-                "processed_dir = project_dir + r'""" + processed_dir + """'\\n",
-                "raw_dir = project_dir + r'""" + raw_dir + """'\\n",
-                "artifacts_dir = project_dir + r'""" + artifacts_dir + """'\\n",
-                "sources_file = project_dir + r'""" + sources_file + """'\\n",
-                "\\n",
-                "# Add directories to path\\n",
-                "sys.path.append(project_dir)\\n",
-                "sys.path.append(experiments_dir)\\n",
-                "sys.path.append(data_dir)\\n",
-                "sys.path.append(processed_dir)\\n",
-                "sys.path.append(raw_dir)\\n",
-                "sys.path.append(artifacts_dir)"
-            ]
-        }
-    ],
-    "metadata": {
-        "language_info": {
-            "name": "python"
-        }
-    },
-    "nbformat": 4,
-    "nbformat_minor": 2
-}
-"""
-    return content
-
-
-def start_experiment(name: str | None = None, description: str | None = None):
+def __generate_notebook_content__(name: str, description: str, env_vars: dict[str, str] | None = None, template: NotebookTemplate | None = None):
+    """
+    Renders the notebook of an experiment from the notebook template of the project.
+
+    Args:
+    ----------
+    name : str
+        The name of the experiment.
+    description : str
+        The description of the experiment.
+    env_vars : dict[str, str], optional
+        The environment variables of the project, default `dsutils_read_env()`.
+    template : NotebookTemplate, optional
+        The template to render, default `get_notebook_template(env_vars)`.
+
+    Returns:
+    -------
+    str
+        The notebook as a JSON string.
+    """
+    if env_vars is None:
+        env_vars = dsutils_read_env()
+    if template is None:
+        template = get_notebook_template(env_vars)
+
+    return template.render(
+        title=name.strip().replace("_", " ").replace("-", " ").title(),
+        description=description.strip(),
+        project_dir=env_vars["PROJECT_ROOT"],
+        experiments_dir=env_vars["EXPERIMENTS_DIR"],
+        data_dir=env_vars["DATA_DIR"],
+        processed_dir=env_vars["DATA_PROCESSED_DIR"],
+        raw_dir=env_vars["DATA_RAW_DIR"],
+        artifacts_dir=env_vars["ARTIFACTS_DIR"],
+        sources_file=env_vars["SOURCES_FILE"],
+    )
+
+
+@dsutils_traced("start_experiment")
+def start_experiment(name: str | None = None, description: str | None = None, interactive: bool = False, project_root: str | None = None):
     """
     Creates a new experiment directory and notebook.
 
@@ -126,6 +90,10 @@ def start_experiment(name: str | None = None, description: str | None = None):
         The name of the experiment.
     description : str | None
         The description of the experiment.
+    interactive : bool
+        Whether to prompt the user to rectify invalid arguments, default False.
+    project_root : str | None
+        The root directory of the project, default the project of the working directory.
 
     Returns
     -------
@@ -138,13 +106,11 @@ def start_experiment(name: str | None = None, description: str | None = None):
         If the experiments directory does not exist.
     ValueError
         If any arguments are invalid.
-        Only raised when called from another script.
+        Only raised when not in interactive mode.
     """
-    global NAME, DESCRIPTION
-
     try:
         # Verify experiments directory exists
-        experiments_dir = dsutils_get_experiments_dir()
+        experiments_dir = dsutils_get_experiments_dir(project_root)
         if not os.path.exists(experiments_dir):
             dsutils_error("The experiments directory does not exist.")
             dsutils_error("This probably means that DSUtils has not been setup for this project.")
@@ -152,36 +118,30 @@ def start_experiment(name: str | None = None, description: str | None = None):
             raise FileNotFoundError(f"The experiments directory does not exist: {experiments_dir}")
 
         # Parse arguments
-        def __parse_var__(var: str | None = None, glb = str | None):
-            if var is not None:
-                return var.strip()
-            elif glb is not None:
-                return glb.strip()
-            else:
-                return ""
-            
-        NAME = __parse_var__(name, NAME).lower().replace(" ", "_").replace("-", "_")
-        DESCRIPTION = __parse_var__(description, DESCRIPTION)
+        name = __normalize_name__(name or "")
+        description = (description or "").strip()
 
         # Validate arguments
-        name_errors = __validate_NAME__(NAME)
-        description_errors = __validate_DESCRIPTION__(DESCRIPTION)
+        catalogue = get_experiment_catalogue(experiments_dir)
+        with dsutils_span("validation"):
+            name_errors = __validate_NAME__(name, catalogue)
+            description_errors = __validate_DESCRIPTION__(description)
 
         # Interactive mode when called from command line
         # Will prompt user to rectify invalid arguments
-        if __name__ == "__main__":
+        if interactive:
             while len(name_errors) > 0:
                 for error in name_errors:
                     dsutils_warn(error)
-                NAME = dsutils_input("Experiment name: ")
-                NAME = NAME.strip()
-                name_errors = __validate_NAME__(NAME)
+                name = dsutils_input("Experiment name: ")
+                name = name.strip()
+                name_errors = __validate_NAME__(name, catalogue)
             while len(description_errors) > 0:
                 for error in description_errors:
                     dsutils_warn(error)
-                DESCRIPTION = dsutils_input("Experiment description: ")
-                DESCRIPTION = DESCRIPTION.strip()
-                description_errors = __validate_DESCRIPTION__(DESCRIPTION)
+                description = dsutils_input("Experiment description: ")
+                description = description.strip()
+                description_errors = __validate_DESCRIPTION__(description)
         # Non-interactive mode when called from another script
         # Will raise ValueError if any arguments are invalid
         else:
@@ -189,7 +149,7 @@ def start_experiment(name: str | None = None, description: str | None = None):
             if len(joined_errors) > 0:
                 raise ValueError("Invalid argument values:\n"+ '\n'.join(joined_errors))
             
-        dir_name = NAME
+        dir_name = name
         notebook_name = dir_name + ".ipynb"
         dir_path = os.path.join(experiments_dir, dir_name)
         notebook_path = os.path.join(dir_path, notebook_name)
@@ -201,10 +161,15 @@ def start_experiment(name: str | None = None, description: str | None = None):
             raise FileExistsError(f"An experiment with this name already exists: {dir_name}")
 
         # Create experiment
-        notebook_content = __generate_notebook_content__(NAME, DESCRIPTION)
-        os.mkdir(dir_path)
-        with open(notebook_path, "w") as f:
-            f.write(notebook_content)
+        with dsutils_span("template_rendering"):
+            notebook_content = __generate_notebook_content__(name, description, dsutils_read_env(project_root))
+        with dsutils_span("filesystem_writes") as span:
+            os.mkdir(dir_path)
+            with open(notebook_path, "w") as f:
+                f.write(notebook_content)
+            span.add_file(len(notebook_content))
+        with dsutils_span("catalogue"):
+            catalogue.register(dir_name, description)
 
         # Print success message
         dsutils_success(f"Successfully created experiment: {dir_name}")
@@ -214,5 +179,187 @@ def start_experiment(name: str | None = None, description: str | None = None):
         sys.exit(1)
 
 
+def __normalize_name__(name: str):
+    return name.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def __expand_specs__(specs: list[dict] | dict):
+    """
+    Expands a sweep spec into a list of experiment names and descriptions.
+
+    A spec is either a list of `{"name": ..., "description": ...}` dictionaries, or a grid of the form:
+    ```json
+    {
+        "name": "lr_{lr}_bs_{batch_size}",
+        "description": "Learning rate {lr} with batch size {batch_size}",
+        "grid": { "lr": [0.1, 0.01], "batch_size": [32, 64] }
+    }
+    ```
+    The name and description of a grid are formatted with every combination of the grid values.
+
+    Returns:
+    -------
+    list[tuple[str, str]]
+        The normalized name and the description of every experiment.
+    """
+    if isinstance(specs, dict):
+        grid = specs.get("grid", {})
+        keys = list(grid)
+        experiments = []
+        for values in itertools.product(*[ grid[k] for k in keys ]):
+            params = dict(zip(keys, values))
+            experiments.append({
+                "name": str(specs["name"]).format(**params),
+                "description": str(specs.get("description", "")).format(**params),
+            })
+        specs = experiments
+
+    return [ (__normalize_name__(str(spec.get("name") or "")), str(spec.get("description") or "").strip()) for spec in specs ]
+
+
+def __create_experiment__(dir_path: str, notebook_path: str, notebook_content: str):
+    os.mkdir(dir_path)
+    with open(notebook_path, "w") as f:
+        f.write(notebook_content)
+
+
+@dsutils_traced("start_experiments")
+def start_experiments(specs: list[dict] | dict, workers: int | None = None, project_root: str | None = None):
+    """
+    Creates many experiment directories and notebooks at once, e.g. for a hyperparameter sweep.
+
+    Every name is validated against a single snapshot of the experiment catalogue before anything is created.
+    The environment is read and the notebook template compiled once, and the directories are created in parallel on a thread pool.
+
+    Parameters
+    ----------
+    specs : list[dict] | dict
+        A list of `{"name": ..., "description": ...}` dictionaries, or a grid spec. See `__expand_specs__`.
+    workers : int | None
+        The number of threads used to create the experiments. Defaults to the `ThreadPoolExecutor` default.
+    project_root : str | None
+        The root directory of the project, default the project of the working directory.
+
+    Returns
+    -------
+    manifest : list[dict]
+        The `name`, `description`, `path` and `notebook` path of every created experiment.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the experiments directory does not exist.
+    ValueError
+        If any experiment name or description is invalid. No experiment is created in that case.
+    """
+    experiments_dir = dsutils_get_experiments_dir(project_root)
+    if not os.path.exists(experiments_dir):
+        raise FileNotFoundError(f"The experiments directory does not exist: {experiments_dir}")
+
+    experiments = __expand_specs__(specs)
+
+    # Validate every experiment against one snapshot, including the experiments earlier in the batch
+    with dsutils_span("validation", experiments=len(experiments)):
+        catalogue = get_experiment_catalogue(experiments_dir)
+        existing_names = catalogue.names()
+        errors = []
+        for name, description in experiments:
+            experiment_errors = __validate_NAME__(name, existing_names) + __validate_DESCRIPTION__(description)
+            errors += [ f"{name}: {error}" for error in experiment_errors ]
+            existing_names.add(name.lower())
+    if len(errors) > 0:
+        raise ValueError("Invalid argument values:\n" + '\n'.join(errors))
+
+    with dsutils_span("template_rendering", experiments=len(experiments)):
+        env_vars = dsutils_read_env(project_root)
+        template = get_notebook_template(env_vars)
+        manifest = []
+        for name, description in experiments:
+            dir_path = os.path.join(experiments_dir, name)
+            manifest.append({
+                "name": name,
+                "description": description,
+                "path": dir_path,
+                "notebook": os.path.join(dir_path, name + ".ipynb"),
+                "content": __generate_notebook_content__(name, description, env_vars, template),
+            })
+
+    with dsutils_span("filesystem_writes") as span:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [ executor.submit(__create_experiment__, e["path"], e["notebook"], e["content"]) for e in manifest ]
+        created = []
+        for e, future in zip(manifest, futures):
+            content = e.pop("content")
+            if future.exception() is None:
+                created.append(e)
+                span.add_file(len(content))
+
+    with dsutils_span("catalogue"):
+        catalogue.register_many([ (e["name"], e["description"]) for e in created ])
+
+    for e, future in zip(manifest, futures):
+        if future.exception() is not None:
+            dsutils_error(f"Failed to create experiment {e['name']}: {future.exception()}")
+            raise future.exception()
+
+    dsutils_success(f"Successfully created {len(created)} experiments")
+    return created
+
+
+def __start_experiments_from_spec__(spec_path: str, manifest_path: str | None = None, workers: int | None = None):
+    """
+    Command line mode of `start_experiments`, creating every experiment in the given JSON sweep spec.
+    """
+    with open(spec_path, "r") as f:
+        specs = json.load(f)
+
+    manifest = start_experiments(specs, workers)
+
+    if manifest_path is not None:
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=4)
+    else:
+        for e in manifest:
+            dsutils_info(e["path"])
+
+
+def __build_parser__():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Starts a new experiment.')
+    parser.add_argument('-n', '--name', default=None, help='The name of the experiment.')
+    parser.add_argument('-d', '--description', default="", help='The description of the experiment.')
+    parser.add_argument('-s', '--spec', default=None, help='Path to a JSON sweep spec (a list of experiments or a grid) to create many experiments at once.')
+    parser.add_argument('-m', '--manifest', default=None, help='Path to write the JSON manifest of the experiments created from a sweep spec to.')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='The number of threads used to create the experiments of a sweep spec.')
+    return parser
+
+
+def __run__(args, interactive: bool = True):
+    """
+    Runs the command line script with the parsed arguments, also used by the DSUtils daemon to run forwarded calls.
+    """
+    if args.spec is not None:
+        __start_experiments_from_spec__(args.spec, args.manifest, args.workers)
+    else:
+        start_experiment(args.name, args.description, interactive=interactive)
+
+
+def main(argv: list[str] | None = None, forward: bool = True):
+    """
+    Command line entry point, parsing `argv` (default `sys.argv[1:]`) and starting an experiment interactively or the experiments of a sweep spec.
+    The call is forwarded to the DSUtils daemon of the project when one is running, unless `forward` is False.
+    """
+    if forward:
+        from dsutils.daemon_client import forward_command
+        exit_code = forward_command("start_experiment", sys.argv[1:] if argv is None else argv)
+        if exit_code is not None:
+            if exit_code != 0:
+                sys.exit(exit_code)
+            return
+
+    __run__(__build_parser__().parse_args(argv))
+
+
 if __name__ == "__main__":
-    start_experiment()
\ No newline at end of file
+    main()
@@ -0,0 +1,260 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+import functools
+import hashlib
+import inspect
+import pickle
+import shutil
+import threading
+import time
+import uuid
+
+
+CACHE_DIR = ".cache"
+
+
+def __source_hash__(func):
+    """
+    Returns a hash of the source code of a function, falling back to its bytecode when the source is not available.
+    """
+    try:
+        source = inspect.getsource(func).encode("utf-8")
+    except (OSError, TypeError):
+        source = func.__code__.co_code + repr(func.__code__.co_consts).encode("utf-8")
+    return hashlib.sha256(source).hexdigest()
+
+
+def __canonical__(value):
+    """
+    Returns a serialization of a value that is the same in every process, whatever its hash seed.
+
+    Plain data is serialized with its type, dictionaries and sets in sorted order, as the order of their items
+    depends on the hash seed or on the order they were built in. Other objects fall back to pickle.
+
+    Raises:
+    ------
+        pickle.PicklingError, TypeError, AttributeError: If a value that is not plain data cannot be pickled.
+    """
+    if value is None or type(value) in (bool, int, float, complex, str):
+        return f"{type(value).__name__}:{value!r}".encode("utf-8")
+    if type(value) in (bytes, bytearray):
+        return b"bytes:" + repr(bytes(value)).encode("utf-8")
+    if type(value) in (list, tuple):
+        items = [ __canonical__(item) for item in value ]
+    elif type(value) in (set, frozenset):
+        items = sorted([ __canonical__(item) for item in value ])
+    elif type(value) is dict:
+        items = sorted([ __canonical__(k) + b"=" + __canonical__(v) for k, v in value.items() ])
+    else:
+        return b"pickle:" + pickle.dumps(value, protocol=4)
+    # The length prefixes keep the boundaries between items unambiguous
+    return f"{type(value).__name__}[{len(items)}](".encode("utf-8") + b"".join([ b"%d:" % len(item) + item for item in items ]) + b")"
+
+
+class StepCache:
+    """
+    Persistent cache of the results of one function, stored under the artifacts directory.
+
+    Every result is pickled into its own file, named after a hash of the function's source code and its arguments.
+    A file's modification time is when the result was computed (used for the TTL), its access time when it was last used (used for LRU eviction).
+    """
+
+    def __init__(self, func, max_size: int | None = None, ttl: float | None = None, cache_dir: str | None = None):
+        self.func = func
+        self.max_size = max_size
+        self.ttl = ttl
+        self.source_hash = __source_hash__(func)
+
+        self._cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def cache_dir(self):
+        """
+        The directory holding the results of the function. Resolved on first use, so decorating does not require a DSUtils project.
+        """
+        if self._cache_dir is None:
+            self._cache_dir = os.path.join(dsutils_get_artifacts_dir(), CACHE_DIR)
+        return os.path.join(self._cache_dir, f"{self.func.__module__}.{self.func.__qualname__}")
+
+    def key(self, args: tuple, kwargs: dict):
+        """
+        Returns the cache key of a call, a hash of the function's source code and the canonical serialization of the arguments.
+        The key is the same in every process, so results are found again after restarting the kernel, see `__canonical__()`.
+
+        Raises:
+        ------
+            pickle.PicklingError, TypeError, AttributeError: If the arguments cannot be pickled.
+        """
+        hasher = hashlib.sha256(self.source_hash.encode("utf-8"))
+        hasher.update(__canonical__((args, kwargs)))
+        return hasher.hexdigest()
+
+    def __record__(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def __load__(self, path: str):
+        """
+        Returns `(True, result)` if a valid result is cached at `path`, `(False, None)` otherwise.
+        Results that are expired or cannot be unpickled are removed.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False, None
+
+        if self.ttl is not None and time.time() - stat.st_mtime > self.ttl:
+            os.remove(path)
+            return False, None
+
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except Exception:
+            # Unpickling runs arbitrary code, e.g. a stale result whose class was moved or renamed raises an ImportError or AttributeError
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return False, None
+
+        # Mark the result as recently used, keeping its modification time for the TTL
+        os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        return True, result
+
+    def __store__(self, path: str, result):
+        """
+        Atomically writes a result to the cache, and evicts the least recently used results if the cache grew too large.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}-{uuid.uuid4().hex}.tmp"
+        with open(tmp_file, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+
+        if self.max_size is not None:
+            self.__evict__(keep=path)
+
+    def __evict__(self, keep: str):
+        """
+        Removes the least recently used results until the cache fits in `max_size` bytes. The result at `keep` is never removed.
+        """
+        entries = []
+        total = 0
+        with os.scandir(os.path.dirname(keep)) as files:
+            for entry in files:
+                if entry.name.endswith(".pkl"):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def __call__(self, *args, **kwargs):
+        try:
+            key = self.key(args, kwargs)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            dsutils_warn(f"Not caching {self.func.__qualname__}, its arguments cannot be pickled: {e}")
+            return self.func(*args, **kwargs)
+
+        path = os.path.join(self.cache_dir, f"{key}.pkl")
+        hit, result = self.__load__(path)
+        self.__record__(hit)
+        if hit:
+            return result
+
+        result = self.func(*args, **kwargs)
+        self.__store__(path, result)
+        return result
+
+    def cache_info(self):
+        """
+        Returns the hit, miss and eviction counters of this process, and the number and total size of the cached results.
+
+        Returns:
+        ------
+            dict: The `hits`, `misses`, `evictions`, `entries` and `size` of the cache.
+        """
+        entries = 0
+        size = 0
+        if os.path.isdir(self.cache_dir):
+            with os.scandir(self.cache_dir) as files:
+                for entry in files:
+                    if entry.name.endswith(".pkl"):
+                        entries += 1
+                        size += entry.stat().st_size
+        with self._lock:
+            return { "hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": entries, "size": size }
+
+    def cache_clear(self):
+        """
+        Removes every cached result of the function.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def cache(func=None, *, max_size: int | None = None, ttl: float | None = None, cache_dir: str | None = None):
+    """
+    Decorator persisting the results of a function under the artifacts directory, so expensive steps survive kernel restarts.
+
+    Results are keyed on a hash of the function's source code and its arguments: editing the function invalidates its results.
+    Arguments and results must be picklable; calls with unpicklable arguments are not cached.
+
+    Example:
+    ------
+    ```python
+    @dsutils.cache(max_size=10 * 1024**3, ttl=24 * 60 * 60)
+    def build_features(path: str):
+        ...
+
+    build_features.cache_info()
+    ```
+
+    Args:
+    ------
+        max_size (int, optional): The maximum total size in bytes of the function's results, least recently used results are evicted first. Defaults to no limit.
+        ttl (float, optional): The number of seconds a result stays valid. Defaults to forever.
+        cache_dir (str, optional): The directory to store results in. Defaults to `.cache` inside the artifacts directory.
+
+    Returns:
+    ------
+        Callable: The wrapped function, with `cache_info()` and `cache_clear()` methods.
+    """
+    def decorator(func):
+        step_cache = StepCache(func, max_size, ttl, cache_dir)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return step_cache(*args, **kwargs)
+
+        wrapper.cache_info = step_cache.cache_info
+        wrapper.cache_clear = step_cache.cache_clear
+        wrapper.step_cache = step_cache
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
@@ -0,0 +1,244 @@
+# Add the dsutils directory to the path so that we can import from it when running this file directly
+import os, sys
+if __name__ == "__main__":
+    dsutils_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    sys.path.insert(0, dsutils_path)
+
+from dsutils.internals import *
+from dataclasses import dataclass
+import csv
+import json
+import queue
+import threading
+try:
+    import numpy as np
+except ImportError:
+    # Optional dependency, only required for batches of arrays
+    np = None
+
+
+BUFFER_SIZE = 1024 * 1024
+__DONE__ = object()
+
+
+@dataclass
+class RecordBatch:
+    """
+    A batch of consecutive records read by `stream_records()`.
+
+    Attributes:
+    ----------
+    records : list[dict] | None
+        The records, or None if the batch was read as arrays.
+    arrays : dict[str, numpy.ndarray] | None
+        One array per column, if the batch was read as arrays.
+    start_offset : int
+        The byte offset in the file of the first record.
+    end_offset : int
+        The byte offset right after the last record. Pass it as `offset` to `stream_records()` to resume after this batch.
+    """
+    records: list[dict] | None
+    start_offset: int
+    end_offset: int
+    arrays: dict | None = None
+
+    def __len__(self):
+        if self.records is None:
+            return len(next(iter(self.arrays.values()), []))
+        return len(self.records)
+
+
+def __to_array__(values: list):
+    if not any([ isinstance(v, float) for v in values ]):
+        try:
+            return np.array(values, dtype=np.int64)
+        except (ValueError, TypeError, OverflowError):
+            pass
+    try:
+        return np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        pass
+    if all([ isinstance(v, str) for v in values ]):
+        return np.array(values)
+    return np.array(values, dtype=object)
+
+
+def __to_arrays__(records: list[dict]):
+    """
+    Converts records into one array per column. Numeric columns become int64 or float64 arrays, other columns string or object arrays.
+    """
+    columns = dict()
+    for record in records:
+        for key in record:
+            columns[key] = None
+    return { column: __to_array__([ record.get(column) for record in records ]) for column in columns }
+
+
+def __read_header__(path: str):
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), None)
+    if header is None:
+        raise ValueError(f"CSV file has no header: {path}")
+    return header
+
+
+def __read_records__(path: str, offset: int):
+    """
+    Yields `(record, end_offset)` for every record in a .csv or .jsonl file, starting at a byte offset.
+
+    For CSV files, an offset of 0 skips the header, any other offset must be the start of a record.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in [".csv", ".jsonl"]:
+        raise ValueError(f"Unsupported file type '{extension}', expected a .csv or .jsonl file.")
+
+    header = __read_header__(path) if extension == ".csv" else None
+    with open(path, "rb", buffering=BUFFER_SIZE) as f:
+        f.seek(offset)
+        position = offset
+
+        if extension == ".jsonl":
+            for line in f:
+                position += len(line)
+                if line.strip() == b"":
+                    continue
+                try:
+                    yield json.loads(line), position
+                except ValueError as e:
+                    raise ValueError(f"Invalid JSON line ending at byte {position}: {e}") from e
+            return
+
+        # csv.reader only pulls the lines of one record at a time, so `position` is always the end of the last record read
+        def __lines__():
+            nonlocal position
+            for line in f:
+                position += len(line)
+                yield line.decode("utf-8")
+
+        reader = csv.reader(__lines__())
+        if offset == 0:
+            next(reader, None)
+        for row in reader:
+            if len(row) == 0:
+                continue
+            if len(row) != len(header):
+                raise ValueError(f"CSV record ending at byte {position} has {len(row)} values, expected {len(header)}.")
+            yield dict(zip(header, row)), position
+
+
+def __read_batches__(path: str, batch_size: int, offset: int, as_arrays: bool):
+    records = []
+    start_offset = offset
+    end_offset = offset
+    for record, end_offset in __read_records__(path, offset):
+        records.append(record)
+        if len(records) == batch_size:
+            yield __make_batch__(records, start_offset, end_offset, as_arrays)
+            records = []
+            start_offset = end_offset
+    if len(records) > 0:
+        yield __make_batch__(records, start_offset, end_offset, as_arrays)
+
+
+def __make_batch__(records: list[dict], start_offset: int, end_offset: int, as_arrays: bool):
+    if as_arrays:
+        return RecordBatch(None, start_offset, end_offset, __to_arrays__(records))
+    return RecordBatch(records, start_offset, end_offset)
+
+
+def __prefetch__(batches, depth: int):
+    """
+    Iterates over `batches` on a background thread, keeping up to `depth` batches ready ahead of the consumer.
+
+    The thread only starts reading a batch once one of `depth + 1` slots is free, and the consumer frees the slot of a batch
+    when it asks for the next one, so at most `depth + 1` batches exist at any time: the one being processed and the ones read ahead.
+    Exceptions raised while reading are re-raised in the consumer. Closing the iterator early stops the thread.
+    """
+    buffer = queue.Queue()
+    slots = threading.Semaphore(depth + 1)
+    stop = threading.Event()
+
+    def __acquire__():
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def __produce__():
+        try:
+            while __acquire__():
+                batch = next(batches, __DONE__)
+                buffer.put((batch, None))
+                if batch is __DONE__:
+                    return
+        except BaseException as e:
+            buffer.put((None, e))
+        finally:
+            batches.close()
+
+    thread = threading.Thread(target=__produce__, name="dsutils-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch, error = buffer.get()
+            if error is not None:
+                raise error
+            if batch is __DONE__:
+                return
+            yield batch
+            # The consumer is done with the batch it was given
+            slots.release()
+    finally:
+        stop.set()
+        thread.join()
+
+
+def stream_records(name: str, batch_size: int = 10_000, offset: int = 0, as_arrays: bool = False, prefetch: int = 2, raw_dir: str | None = None):
+    """
+    Streams the records of a raw .csv or .jsonl file in fixed-size batches, so files larger than memory can be processed.
+
+    The next batches are read on a background thread while the current one is processed, so reading overlaps with computing.
+    At most `batch_size * (prefetch + 1)` records are held in memory at any time.
+
+    Example:
+    ------
+    ```python
+    offset = 0
+    for batch in stream_records("events.jsonl", batch_size=50_000, as_arrays=True):
+        totals += batch.arrays["amount"].sum()
+        offset = batch.end_offset    # Save to resume later with stream_records(..., offset=offset)
+    ```
+
+    Args:
+    ------
+        name (str): The path of the file, relative to the raw data directory unless absolute.
+        batch_size (int, optional): The number of records per batch. Defaults to 10000.
+        offset (int, optional): The byte offset to resume from, the `end_offset` of a previous batch. Defaults to the start of the file.
+        as_arrays (bool, optional): Yield batches of NumPy arrays, one per column, instead of records. Requires numpy. Defaults to False.
+        prefetch (int, optional): The number of batches to read ahead on a background thread, 0 to read on the calling thread. Defaults to 2.
+        raw_dir (str, optional): The raw data directory. Defaults to the one of the current project.
+
+    Returns:
+    ------
+        Iterator[RecordBatch]: The batches of records.
+
+    Raises:
+    ------
+        ImportError: If `as_arrays` is set and numpy is not installed.
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file is not a .csv or .jsonl file, or contains an invalid record.
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+    if as_arrays and np is None:
+        raise ImportError("Streaming arrays requires numpy, install it with `pip install numpy`.")
+
+    if not os.path.isabs(name):
+        name = os.path.join(dsutils_get_data_raw_dir() if raw_dir is None else raw_dir, name)
+    if not os.path.isfile(name):
+        raise FileNotFoundError(f"Raw data file does not exist: {name}")
+
+    batches = __read_batches__(name, batch_size, offset, as_arrays)
+    if prefetch <= 0:
+        return batches
+    return __prefetch__(batches, prefetch)
@@ -0,0 +1,154 @@
+import unittest
+from unittest.mock import patch
+from dsutils.add_source import add_source, add_sources_bulk, main
+import json
+import os
+import shutil
+
+
+HEADER = "id;name;description;url;citation"
+
+
+class TestAddSource(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_add_source_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.sources_file = os.path.join(self.test_dir, 'sources.csv')
+        with open(self.sources_file, 'w') as f:
+            f.write(HEADER)
+
+        # Point the sources registry at the test sources file instead of discovering a project
+        self.patcher = patch('dsutils.sources_registry.dsutils_get_sources_file', return_value=self.sources_file)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __read_rows__(self):
+        with open(self.sources_file, 'r') as f:
+            return f.read().split('\n')[1:]
+
+
+    def test_UNIT_add_source_appends_row(self):
+        """
+        Tests that a valid source is appended to the sources file.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        row = add_source(' iris ', 'The iris dataset', 'https://example.com/iris', 'Fisher, 1936')
+
+        #====      Assert      ====#
+        self.assertEqual(self.__read_rows__(), [ row ])
+        self.assertIn("'iris'", row)
+
+
+    def test_UNIT_add_source_invalid_arguments_raise_ValueError(self):
+        """
+        Tests that invalid arguments raise a ValueError outside of interactive mode, without prompting.
+        """
+        #====      Arange      ====#
+        add_source('iris', 'The iris dataset', 'https://example.com/iris', 'Fisher, 1936')
+
+        #====       Act        ====#
+        with patch('dsutils.add_source.dsutils_input') as mock_input, self.assertRaises(ValueError) as context:
+            add_source('iris', '', 'not a url', 'Fisher, 1936')
+
+        #====      Assert      ====#
+        mock_input.assert_not_called()
+        self.assertIn("already exists", str(context.exception))
+        self.assertEqual(len(self.__read_rows__()), 1)
+
+
+    def test_UNIT_add_source_interactive_prompts_for_invalid_arguments(self):
+        """
+        Tests that interactive mode prompts for every invalid argument until it is valid.
+        """
+        #====      Arange      ====#
+        answers = [ 'iris', 'The iris dataset', 'https://example.com/iris' ]
+
+        #====       Act        ====#
+        with patch('dsutils.add_source.dsutils_input', side_effect=answers) as mock_input:
+            row = add_source('not valid!', None, 'not a url', 'Fisher, 1936', interactive=True)
+
+        #====      Assert      ====#
+        self.assertEqual(mock_input.call_count, 3)
+        self.assertEqual(self.__read_rows__(), [ row ])
+
+
+    def test_UNIT_add_sources_bulk_reports_rejected_sources(self):
+        """
+        Tests that a bulk import appends the valid sources and reports duplicates within the batch.
+        """
+        #====      Arange      ====#
+        sources = [
+            { "name": "iris", "description": "d", "url": "https://example.com", "citation": "c" },
+            { "name": "iris", "description": "d", "url": "https://example.com", "citation": "c" },
+            { "name": "titanic", "description": "d", "url": "https://example.com", "citation": "c" },
+        ]
+
+        #====       Act        ====#
+        report = add_sources_bulk(sources)
+
+        #====      Assert      ====#
+        self.assertEqual(len(report.added), 2)
+        self.assertEqual([ e["index"] for e in report.errors ], [ 1 ])
+        self.assertEqual(self.__read_rows__(), report.added)
+
+
+    def test_SYSTEM_main_from_file_rejects_invalid_lines_and_imports_the_rest(self):
+        """
+        Tests that lines of a bulk import file that are not valid JSON or not an object are reported with their line number,
+        without stopping the import of the other lines.
+        """
+        #====      Arange      ====#
+        source_file = os.path.join(self.test_dir, 'sources.jsonl')
+        report_file = os.path.join(self.test_dir, 'report.json')
+        lines = [
+            json.dumps({ "name": "iris", "description": "d", "url": "https://example.com", "citation": "c" }),
+            '{ "name": "broken", ',
+            '[1, 2]',
+            '',
+            json.dumps({ "name": "titanic", "description": "d", "url": "https://example.com", "citation": "c" }),
+        ]
+        with open(source_file, 'w') as f:
+            f.write('\n'.join(lines))
+
+        #====       Act        ====#
+        with self.assertRaises(SystemExit) as exit:
+            main([ '-f', source_file, '-r', report_file ], forward=False)
+        with open(report_file, 'r') as f:
+            report = json.load(f)
+
+        #====      Assert      ====#
+        self.assertEqual(exit.exception.code, 1)
+        self.assertEqual(len(report["added"]), 2)
+        self.assertEqual([ error["line"] for error in report["errors"] ], [ 2, 3 ])
+        self.assertIn("Invalid JSON", report["errors"][0]["errors"][0])
+        self.assertIn("must be an object", report["errors"][1]["errors"][0])
+        self.assertEqual(self.__read_rows__(), report["added"])
+
+
+    def test_SYSTEM_main_parses_the_given_arguments(self):
+        """
+        Tests that the command line entry point parses the given arguments rather than the ones of the host process.
+        """
+        #====      Arange      ====#
+        argv = [ '-n', 'iris', '-d', 'The iris dataset', '-u', 'https://example.com/iris', '-c', 'Fisher, 1936' ]
+
+        #====       Act        ====#
+        with patch('sys.argv', [ 'host', '--unknown-flag' ]):
+            main(argv)
+
+        #====      Assert      ====#
+        self.assertEqual(len(self.__read_rows__()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import patch
+from dsutils.artifact_store import ArtifactStore
+import io
+import os
+import shutil
+
+
+class TestArtifactStore(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_artifact_store_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.store = ArtifactStore(self.test_dir)
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __count_blobs__(self):
+        return sum([ len(files) for _, _, files in os.walk(self.store.blobs_dir) ])
+
+
+    def test_UNIT_ArtifactStore_identical_content_is_stored_once(self):
+        """
+        Tests that two artifacts with the same content share one blob.
+        """
+        #====      Arange      ====#
+        data = b'model weights'
+
+        #====       Act        ====#
+        first = self.store.save_bytes('baseline', 'model.bin', data)
+        second = self.store.save_bytes('tuned', 'model.bin', data)
+
+        #====      Assert      ====#
+        self.assertEqual(first, second)
+        self.assertEqual(self.__count_blobs__(), 1)
+        self.assertEqual(self.store.load_bytes('tuned', 'model.bin'), data)
+
+
+    def test_UNIT_ArtifactStore_resaving_identical_content_does_not_write(self):
+        """
+        Tests that re-saving an artifact with unchanged content neither writes a blob nor the manifest.
+        """
+        #====      Arange      ====#
+        self.store.save_object('baseline', 'model.pkl', { 'weights': [1, 2, 3] })
+
+        #====       Act        ====#
+        with patch.object(self.store, '__save_manifest__') as mock_save_manifest, patch.object(self.store, '__commit_tmp__') as mock_commit:
+            self.store.save_object('baseline', 'model.pkl', { 'weights': [1, 2, 3] })
+
+        #====      Assert      ====#
+        mock_save_manifest.assert_not_called()
+        mock_commit.assert_not_called()
+
+
+    def test_UNIT_ArtifactStore_streams_and_loads_objects(self):
+        """
+        Tests that streamed artifacts and pickled objects can be loaded back.
+        """
+        #====      Arange      ====#
+        stream = io.BytesIO(b'x' * 3_000_000)
+
+        #====       Act        ====#
+        self.store.save_stream('baseline', 'large.bin', stream)
+        self.store.save_object('baseline', 'params.pkl', { 'lr': 0.1 })
+
+        #====      Assert      ====#
+        self.assertEqual(self.store.load_bytes('baseline', 'large.bin'), b'x' * 3_000_000)
+        self.assertEqual(self.store.load_object('baseline', 'params.pkl'), { 'lr': 0.1 })
+        self.assertEqual(sorted(self.store.list('baseline')), ['baseline/large.bin', 'baseline/params.pkl'])
+        self.assertEqual(os.listdir(self.store.tmp_dir), [])
+
+
+    def test_UNIT_ArtifactStore_gc_removes_unreferenced_blobs(self):
+        """
+        Tests that only blobs no longer referenced by any artifact are removed by gc.
+        """
+        #====      Arange      ====#
+        self.store.save_bytes('baseline', 'a.bin', b'shared')
+        self.store.save_bytes('tuned', 'a.bin', b'shared')
+        self.store.save_bytes('tuned', 'b.bin', b'unique')
+
+        #====       Act        ====#
+        self.store.delete('baseline', 'a.bin')
+        self.store.delete('tuned', 'b.bin')
+        freed = self.store.gc()
+
+        #====      Assert      ====#
+        self.assertEqual(freed, len(b'unique'))
+        self.assertEqual(self.__count_blobs__(), 1)
+        self.assertEqual(self.store.load_bytes('tuned', 'a.bin'), b'shared')
+        self.assertFalse(self.store.exists('baseline', 'a.bin'))
+
+
+    def test_UNIT_ArtifactStore_gc_while_saving_does_not_remove_new_blobs(self):
+        """
+        Tests that an artifact saved while gc runs refers to a blob that exists, both for content whose unreferenced blob
+        gc removes in between, and for streamed content.
+        """
+        #====      Arange      ====#
+        self.store.save_bytes('baseline', 'a.bin', b'reused')
+        self.store.delete('baseline', 'a.bin')
+        record = self.store.__record__
+
+        def gc_then_record(*args):
+            self.store.gc()
+            return record(*args)
+
+        #====       Act        ====#
+        with patch.object(self.store, '__record__', side_effect=gc_then_record):
+            self.store.save_bytes('tuned', 'a.bin', b'reused')
+            with self.store.writer('tuned', 'b.bin') as writer:
+                writer.write(b'streamed')
+
+        #====      Assert      ====#
+        self.assertEqual(self.store.load_bytes('tuned', 'a.bin'), b'reused')
+        self.assertEqual(self.store.load_bytes('tuned', 'b.bin'), b'streamed')
+        self.assertEqual(self.store.gc(), 0)
+
+
+    def test_UNIT_ArtifactStore_missing_artifact_raises_KeyError(self):
+        """
+        Tests that loading an artifact that was never saved raises a KeyError.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        with self.assertRaises(KeyError):
+            self.store.load_bytes('baseline', 'missing.bin')
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+from unittest.mock import patch
+from dsutils.async_api import async_start_experiment, async_add_source, async_create_files_and_folders, set_async_max_workers, MAX_WORKERS
+from dsutils.internals import DsutilsError, ENV_FILE
+import asyncio
+import os
+import shutil
+import threading
+import time
+
+
+class TestAsyncApi(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_async_api_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __make_project__(self, name: str):
+        """
+        Creates a project with an experiments directory, an empty sources file and an environment file.
+        """
+        root = os.path.join(self.test_dir, name)
+        os.makedirs(os.path.join(root, 'experiments'))
+        with open(os.path.join(root, 'sources.csv'), 'w') as f:
+            f.write("id;name;description;url;citation")
+        env_vars = {
+            "PROJECT_ROOT": root,
+            "PROJECT_NAME": name,
+            "ARTIFACTS_DIR": "/artifacts",
+            "DATA_DIR": "/data",
+            "DATA_PROCESSED_DIR": "/data/processed",
+            "DATA_RAW_DIR": "/data/raw",
+            "EXPERIMENTS_DIR": "/experiments",
+            "SOURCES_FILE": "/sources.csv",
+        }
+        with open(root + ENV_FILE, 'w') as f:
+            f.write("\n".join([ f"{k}={v}" for k, v in env_vars.items() ]))
+        return root
+
+
+    def test_SYSTEM_async_start_experiment_in_many_projects_concurrently(self):
+        """
+        Tests that experiments of different projects can be created concurrently from one event loop.
+        """
+        #====      Arange      ====#
+        roots = [ self.__make_project__('first'), self.__make_project__('second') ]
+
+        async def run():
+            return await asyncio.gather(*[
+                async_start_experiment(f"experiment {i}", "An experiment", project_root=root)
+                for root in roots for i in range(3)
+            ])
+
+        #====       Act        ====#
+        paths = asyncio.run(run())
+
+        #====      Assert      ====#
+        self.assertEqual(len(paths), 6)
+        for root in roots:
+            self.assertEqual(sorted(os.listdir(os.path.join(root, 'experiments'))), [ '.catalogue', 'experiment_0', 'experiment_1', 'experiment_2' ])
+
+
+    def test_UNIT_async_start_experiment_without_project_raises_DsutilsError(self):
+        """
+        Tests that a missing environment file raises a DsutilsError rather than exiting the program.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        with self.assertRaises(DsutilsError) as context:
+            asyncio.run(async_start_experiment("experiment", "An experiment", project_root=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertIn("Environment file does not exist", str(context.exception))
+
+
+    def test_UNIT_async_add_source_raises_ValueError_for_invalid_arguments(self):
+        """
+        Tests that valid sources are added and invalid ones raise a ValueError instead of prompting.
+        """
+        #====      Arange      ====#
+        root = self.__make_project__('project')
+
+        async def run():
+            row = await async_add_source("iris", "The iris dataset", "https://example.com", "Fisher", project_root=root)
+            with self.assertRaises(ValueError):
+                await async_add_source("iris", "", "https://example.com", "Fisher", project_root=root)
+            return row
+
+        #====       Act        ====#
+        row = asyncio.run(run())
+
+        #====      Assert      ====#
+        with open(os.path.join(root, 'sources.csv'), 'r') as f:
+            self.assertEqual(f.read().split('\n')[1:], [ row ])
+
+
+    def test_SYSTEM_async_create_files_and_folders_in_many_projects(self):
+        """
+        Tests that the files and folders of different projects are created concurrently.
+        """
+        #====      Arange      ====#
+        roots = [ os.path.join(self.test_dir, 'first'), os.path.join(self.test_dir, 'second') ]
+        for root in roots:
+            os.mkdir(root)
+
+        async def run():
+            return await asyncio.gather(*[ async_create_files_and_folders(root) for root in roots ])
+
+        #====       Act        ====#
+        results = asyncio.run(run())
+
+        #====      Assert      ====#
+        for root, paths in zip(roots, results):
+            self.assertTrue(all(path.startswith(root) for path in paths))
+            self.assertTrue(os.path.isdir(os.path.join(root, 'experiments')))
+
+
+    def test_UNIT_set_async_max_workers_bounds_concurrent_calls(self):
+        """
+        Tests that no more blocking calls run at once than the executor has threads.
+        """
+        #====      Arange      ====#
+        running, peak = [ 0 ], [ 0 ]
+        lock = threading.Lock()
+
+        def slow_start_experiment(*args, **kwargs):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        async def run():
+            await asyncio.gather(*[ async_start_experiment(f"experiment {i}", "An experiment") for i in range(6) ])
+
+        #====       Act        ====#
+        set_async_max_workers(2)
+        try:
+            with patch('dsutils.async_api.start_experiment', side_effect=slow_start_experiment):
+                asyncio.run(run())
+        finally:
+            set_async_max_workers(MAX_WORKERS)
+
+        #====      Assert      ====#
+        self.assertEqual(peak[0], 2)
+        with self.assertRaises(ValueError):
+            set_async_max_workers(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
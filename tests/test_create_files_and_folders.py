@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch
-from dsutils.create_files_and_folders import create_files_and_folders, __get_files_and_folders_from_json__, __remove_files_and_folders__
+from dsutils.create_files_and_folders import create_files_and_folders, __get_files_and_folders_from_json__, __remove_files_and_folders__, STAGING_PREFIX, JOURNAL_FILE
+from dsutils.layout import clear_layout_cache
 import os
+import socket
 import json
 import shutil
 
@@ -16,6 +18,8 @@ class TestCreateFilesAndFolders(unittest.TestCase):
         # Create the test directory
         self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_create_files_and_folders_dir/')
         os.mkdir(self.test_dir)            
+        # Compile the layout again, so patches of json.load apply
+        clear_layout_cache()
 
     def tearDown(self):
         # Remove the contents of the test directory
@@ -44,7 +48,7 @@ class TestCreateFilesAndFolders(unittest.TestCase):
 
         # Check if all files and folders passed to the function are returned
         for fReal, fResult in zip(json_data, result):
-            self.assertEqual(fResult, json_data[fReal]["path"])
+            self.assertEqual(fResult, self.test_dir + json_data[fReal]["path"])
 
         # Check if all files and folders are created
         for f in result:
@@ -183,5 +187,105 @@ class TestCreateFilesAndFolders(unittest.TestCase):
             self.assertFalse(os.path.exists(f))
 
 
+    @patch('dsutils.create_files_and_folders.dsutils_info')
+    @patch('dsutils.create_files_and_folders.dsutils_success')
+    @patch('dsutils.create_files_and_folders.dsutils_warn')
+    @patch('dsutils.create_files_and_folders.dsutils_error')
+    def test_SYSTEM_failed_create_only_removes_what_it_created(self, mock_cfaf_error, mock_cfaf_warn, mock_cfaf_success, mock_cfaf_info):
+        """
+        Tests that a failure while moving the files and folders into place removes the ones that were moved,
+        and keeps the files and folders that existed before.
+        - The data directory and sources file already exist
+        - Moving the second missing path into place fails
+        """
+        #====      Arange      ====#
+        os.mkdir(os.path.join(self.test_dir, 'data'))
+        with open(os.path.join(self.test_dir, 'sources.csv'), 'w') as f:
+            f.write('existing')
+        rename = os.rename
+        calls = []
+
+        def failing_rename(src, dst):
+            calls.append(dst)
+            if len(calls) == 2:
+                raise OSError("Disk full")
+            rename(src, dst)
+
+        #====       Act        ====#
+        with patch('dsutils.create_files_and_folders.os.rename', side_effect=failing_rename):
+            with self.assertRaises(SystemExit):
+                create_files_and_folders(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertEqual(sorted(os.listdir(self.test_dir)), [ 'data', 'sources.csv' ])
+        self.assertEqual(os.listdir(os.path.join(self.test_dir, 'data')), [])
+        with open(os.path.join(self.test_dir, 'sources.csv'), 'r') as f:
+            self.assertEqual(f.read(), 'existing')
+
+
+    @patch('dsutils.create_files_and_folders.dsutils_info')
+    @patch('dsutils.create_files_and_folders.dsutils_success')
+    @patch('dsutils.create_files_and_folders.dsutils_warn')
+    @patch('dsutils.create_files_and_folders.dsutils_error')
+    def test_SYSTEM_create_does_not_replace_paths_created_while_moving(self, mock_cfaf_error, mock_cfaf_warn, mock_cfaf_success, mock_cfaf_info):
+        """
+        Tests that a file or empty folder another process creates after the layout was compared with the project is not replaced,
+        and is kept when the files and folders that were moved are removed again.
+        """
+        import dsutils.create_files_and_folders as cfaf
+        for name, create in (('sources.csv', lambda path: open(path, 'w').write('other')), ('experiments', os.mkdir)):
+            with self.subTest(name=name):
+                #====      Arange      ====#
+                project_root = os.path.join(self.test_dir, f'{name}_project')
+                os.mkdir(project_root)
+                path = os.path.join(project_root, name)
+                move = cfaf.__move_no_replace__
+
+                def move_after_other_process(source, destination):
+                    if destination == path:
+                        create(path)
+                    move(source, destination)
+
+                #====       Act        ====#
+                with patch('dsutils.create_files_and_folders.__move_no_replace__', side_effect=move_after_other_process):
+                    with self.assertRaises(SystemExit):
+                        create_files_and_folders(project_root)
+
+                #====      Assert      ====#
+                self.assertEqual(os.listdir(project_root), [ name ])
+                if os.path.isfile(path):
+                    with open(path, 'r') as f:
+                        self.assertEqual(f.read(), 'other')
+
+
+    @patch('dsutils.create_files_and_folders.dsutils_info')
+    @patch('dsutils.create_files_and_folders.dsutils_success')
+    @patch('dsutils.create_files_and_folders.dsutils_warn')
+    def test_SYSTEM_create_rolls_back_unfinished_setup_of_stopped_process(self, mock_cfaf_warn, mock_cfaf_success, mock_cfaf_info):
+        """
+        Tests that the paths recorded in the journal of a process that stopped before committing are removed,
+        and that nothing is left in the staging directory once the files and folders are created.
+        - A stopped process moved an experiments directory with a notebook into the project
+        """
+        #====      Arange      ====#
+        leftover = os.path.join(self.test_dir, 'experiments')
+        os.makedirs(os.path.join(leftover, 'half_written'))
+        staging_dir = os.path.join(self.test_dir, STAGING_PREFIX + 'stopped')
+        os.mkdir(staging_dir)
+        with open(os.path.join(staging_dir, JOURNAL_FILE), 'w') as f:
+            f.write(json.dumps({ "version": 1, "pid": 2 ** 22 + 1, "host": socket.gethostname(), "project_root": self.test_dir }) + "\n")
+            f.write(json.dumps({ "path": leftover }) + "\n")
+
+        #====       Act        ====#
+        result = create_files_and_folders(self.test_dir)
+
+        #====      Assert      ====#
+        mock_cfaf_warn.assert_called()
+        self.assertEqual(sorted(os.listdir(self.test_dir)), [ 'artifacts', 'data', 'experiments', 'sources.csv' ])
+        self.assertEqual(os.listdir(leftover), [])
+        for f in result:
+            self.assertTrue(os.path.exists(f))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,206 @@
+import unittest
+from dsutils.daemon_client import SOCKET_FILE, DaemonNotRunningError, find_daemon, forward_command, request
+from dsutils.internals import ENV_FILE
+from unittest.mock import patch
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        # Create a project in the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_daemon_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.makedirs(os.path.join(self.test_dir, 'experiments'))
+        with open(os.path.join(self.test_dir, 'sources.csv'), 'w') as f:
+            f.write("id;name;description;url;citation")
+        env_vars = {
+            "PROJECT_ROOT": self.test_dir,
+            "PROJECT_NAME": "test_daemon_dir",
+            "ARTIFACTS_DIR": "/artifacts",
+            "DATA_DIR": "/data",
+            "DATA_PROCESSED_DIR": "/data/processed",
+            "DATA_RAW_DIR": "/data/raw",
+            "EXPERIMENTS_DIR": "/experiments",
+            "SOURCES_FILE": "/sources.csv",
+        }
+        with open(self.test_dir + ENV_FILE, 'w') as f:
+            f.write("\n".join([ f"{k}={v}" for k, v in env_vars.items() ]))
+        self.socket_path = os.path.join(self.test_dir, SOCKET_FILE)
+        self.daemon = None
+
+    def tearDown(self):
+        # Stop the daemon, if started
+        if self.daemon is not None:
+            try:
+                request("shutdown", self.socket_path)
+                self.daemon.wait(timeout=10)
+            except Exception:
+                self.daemon.kill()
+                self.daemon.wait()
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __start_daemon__(self, stderr=None):
+        self.daemon = subprocess.Popen([ sys.executable, '-m', 'dsutils', 'serve', '-p', self.test_dir ], cwd=PACKAGE_ROOT, stdout=subprocess.DEVNULL, stderr=stderr, text=True)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                return request("ping", self.socket_path)
+            except (DaemonNotRunningError, OSError):
+                time.sleep(0.05)
+        self.fail("The daemon did not start")
+
+    def __run_cli__(self, *args: str):
+        env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+        return subprocess.run([ sys.executable, '-m', 'dsutils', *args ], cwd=self.test_dir, env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+
+
+    def test_UNIT_find_daemon_stops_at_project_root(self):
+        """
+        Tests that a daemon of an enclosing project is not used for a nested project.
+        """
+        #====      Arange      ====#
+        nested = os.path.join(self.test_dir, 'nested')
+        os.makedirs(os.path.join(nested, 'sub'))
+        open(self.socket_path, 'w').close()
+        open(nested + ENV_FILE, 'w').close()
+
+        #====       Act        ====#
+        found_outer = find_daemon(os.path.join(self.test_dir, 'experiments'))
+        found_nested = find_daemon(os.path.join(nested, 'sub'))
+
+        #====      Assert      ====#
+        self.assertEqual(found_outer, self.socket_path)
+        self.assertIsNone(found_nested)
+
+
+    def test_UNIT_forward_command_without_daemon_runs_locally(self):
+        """
+        Tests that calls are not forwarded when no daemon is running, or the socket was left behind by one.
+        """
+        #====      Arange      ====#
+        open(self.socket_path, 'w').close()
+
+        #====       Act        ====#
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            stale = forward_command("add_source", [ '-n', 'iris' ])
+        finally:
+            os.chdir(cwd)
+
+        #====      Assert      ====#
+        self.assertIsNone(stale)
+
+
+    def test_UNIT_forward_command_reports_lost_connection(self):
+        """
+        Tests that a daemon closing the connection without responding fails the command with a message, instead of a traceback.
+        """
+        #====      Arange      ====#
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(os.path.relpath(self.socket_path))
+        server.listen(1)
+
+        def accept_and_close():
+            connection, _ = server.accept()
+            connection.recv(65536)
+            connection.close()
+        thread = threading.Thread(target=accept_and_close)
+        thread.start()
+
+        #====       Act        ====#
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                exit_code = forward_command("add_source", [ '-n', 'iris' ])
+        finally:
+            os.chdir(cwd)
+            thread.join()
+            server.close()
+
+        #====      Assert      ====#
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Lost the connection to the DSUtils daemon", stderr.getvalue())
+
+
+    def test_SYSTEM_daemon_shuts_down_cleanly_with_open_connections(self):
+        """
+        Tests that stopping the daemon while a client is still connected closes the connection without logging errors.
+        """
+        #====      Arange      ====#
+        self.__start_daemon__(stderr=subprocess.PIPE)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(os.path.relpath(self.socket_path))
+
+        #====       Act        ====#
+        try:
+            request("shutdown", self.socket_path)
+            _, stderr = self.daemon.communicate(timeout=10)
+            closed = client.recv(1)
+        finally:
+            client.close()
+        self.daemon = None
+
+        #====      Assert      ====#
+        self.assertEqual(closed, b'')
+        self.assertNotIn("Traceback", stderr)
+        self.assertNotIn("CancelledError", stderr)
+
+
+    def test_SYSTEM_daemon_serves_requests(self):
+        """
+        Tests that the daemon creates experiments, looks up paths and raises the errors of failed requests in the client.
+        """
+        #====      Arange      ====#
+        ping = self.__start_daemon__()
+
+        #====       Act        ====#
+        path = request("start_experiment", self.socket_path, name="Baseline", description="A first baseline")
+        experiments_dir = request("path", self.socket_path, key="experiments_dir")
+        with self.assertRaises(ValueError):
+            request("start_experiment", self.socket_path, name="baseline", description="Again")
+
+        #====      Assert      ====#
+        self.assertEqual(ping["project_root"], self.test_dir)
+        self.assertEqual(experiments_dir, os.path.join(self.test_dir, 'experiments'))
+        self.assertTrue(os.path.isfile(os.path.join(path, 'baseline.ipynb')))
+
+
+    def test_SYSTEM_cli_forwards_to_daemon(self):
+        """
+        Tests that the command line scripts are run by the daemon when it is running, and report invalid arguments.
+        """
+        #====      Arange      ====#
+        self.__start_daemon__()
+        args = [ 'add_source', '-n', 'iris', '-d', 'The iris dataset', '-u', 'https://example.com', '-c', 'Fisher' ]
+
+        #====       Act        ====#
+        added = self.__run_cli__(*args)
+        duplicate = self.__run_cli__(*args)
+        served = request("ping", self.socket_path)["requests"]
+
+        #====      Assert      ====#
+        self.assertEqual(added.returncode, 0, added.stderr)
+        self.assertEqual(duplicate.returncode, 1)
+        self.assertIn("already exists", duplicate.stderr)
+        self.assertGreaterEqual(served, 3)
+        with open(os.path.join(self.test_dir, 'sources.csv'), 'r') as f:
+            self.assertEqual(len(f.read().split('\n')), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
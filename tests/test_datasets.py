@@ -0,0 +1,156 @@
+import unittest
+from unittest.mock import patch
+from dsutils.datasets import load_dataset, invalidate_dataset
+import dsutils.datasets
+import os
+import shutil
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@patch('dsutils.datasets.dsutils_info')
+class TestDatasets(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_datasets_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        self.raw_dir = os.path.join(self.test_dir, 'raw')
+        self.processed_dir = os.path.join(self.test_dir, 'processed')
+        os.makedirs(self.raw_dir)
+        os.makedirs(self.processed_dir)
+        self.__write_raw__('id,price,name,discount\n1,2.5,apple,3\n2,3,"pear, large",\n3,1e3,kiwi,5\n')
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __write_raw__(self, content: str):
+        with open(os.path.join(self.raw_dir, 'sales.csv'), 'w') as f:
+            f.write(content)
+
+    def __load__(self, columns=None):
+        return load_dataset('sales', columns, raw_dir=self.raw_dir, processed_dir=self.processed_dir)
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_SYSTEM_load_dataset_converts_columns_to_memory_mapped_arrays(self, mock_info):
+        """
+        Tests that a CSV is loaded as one memory-mapped array per column, with inferred dtypes.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        dataset = self.__load__()
+
+        #====      Assert      ====#
+        self.assertEqual(list(dataset), ['id', 'price', 'name', 'discount'])
+        self.assertIsInstance(dataset['id'], np.memmap)
+        self.assertEqual(dataset['id'].dtype, np.int64)
+        self.assertEqual(dataset['price'].tolist(), [2.5, 3.0, 1000.0])
+        self.assertEqual(dataset['name'].tolist(), ['apple', 'pear, large', 'kiwi'])
+        self.assertTrue(np.isnan(dataset['discount'][1]))
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_load_dataset_integers_beyond_int64_are_strings(self, mock_info):
+        """
+        Tests that a column with an integer too large for an int64, e.g. a long ID, is loaded as strings instead of overflowing.
+        """
+        #====      Arange      ====#
+        self.__write_raw__('id,count\n123456789012345678901234,1\n42,-9223372036854775808\n')
+
+        #====       Act        ====#
+        dataset = self.__load__()
+
+        #====      Assert      ====#
+        self.assertEqual(dataset['id'].tolist(), ['123456789012345678901234', '42'])
+        self.assertEqual(dataset['count'].dtype, np.int64)
+        self.assertEqual(dataset['count'].tolist(), [1, -9223372036854775808])
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_load_dataset_reuses_cache(self, mock_info):
+        """
+        Tests that the CSV is only converted on first access.
+        """
+        #====      Arange      ====#
+        self.__load__()
+
+        #====       Act        ====#
+        with patch('dsutils.datasets.__convert__') as mock_convert:
+            dataset = self.__load__(['name'])
+
+        #====      Assert      ====#
+        mock_convert.assert_not_called()
+        self.assertEqual(list(dataset), ['name'])
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_load_dataset_rebuilds_cache_when_raw_file_changed(self, mock_info):
+        """
+        Tests that the cache is invalidated when the raw file changes.
+        """
+        #====      Arange      ====#
+        self.__load__()
+        self.__write_raw__('id,price\n7,1.5\n8,2.5\n')
+
+        #====       Act        ====#
+        dataset = self.__load__()
+
+        #====      Assert      ====#
+        self.assertEqual(list(dataset), ['id', 'price'])
+        self.assertEqual(dataset['id'].tolist(), [7, 8])
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_load_dataset_unknown_column_raises_ValueError(self, mock_info):
+        """
+        Tests that requesting a column the dataset does not have raises a ValueError.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError):
+            self.__load__(['quantity'])
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_invalidate_dataset_removes_cache(self, mock_info):
+        """
+        Tests that an invalidated dataset is converted again on the next load.
+        """
+        #====      Arange      ====#
+        self.__load__()
+
+        #====       Act        ====#
+        invalidate_dataset('sales', processed_dir=self.processed_dir)
+        with patch('dsutils.datasets.__convert__', wraps=dsutils.datasets.__convert__) as mock_convert:
+            self.__load__()
+
+        #====      Assert      ====#
+        mock_convert.assert_called_once()
+
+
+    def test_UNIT_load_dataset_without_numpy_raises_ImportError(self, mock_info):
+        """
+        Tests that load_dataset() explains numpy is required when it is not installed.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        with patch('dsutils.datasets.np', None), self.assertRaises(ImportError):
+            self.__load__()
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from dsutils.experiment_catalogue import ExperimentCatalogue
+from datetime import datetime
+import os
+import shutil
+
+
+class TestExperimentCatalogue(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_experiment_catalogue_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_ExperimentCatalogue_contains_ignores_case(self):
+        """
+        Tests that existing experiment directories are found regardless of case, and files are ignored.
+        """
+        #====      Arange      ====#
+        os.mkdir(os.path.join(self.test_dir, 'baseline_model'))
+        with open(os.path.join(self.test_dir, 'notes.txt'), 'w') as f:
+            f.write('')
+        catalogue = ExperimentCatalogue(self.test_dir)
+
+        #====       Act        ====#
+        result = catalogue.contains('Baseline_Model')
+
+        #====      Assert      ====#
+        self.assertTrue(result)
+        self.assertFalse(catalogue.contains('notes.txt'))
+        self.assertEqual(len(catalogue), 1)
+
+
+    def test_UNIT_ExperimentCatalogue_picks_up_added_and_removed_directories(self):
+        """
+        Tests that the catalogue follows directories being created and removed after the first refresh.
+        """
+        #====      Arange      ====#
+        os.mkdir(os.path.join(self.test_dir, 'first'))
+        catalogue = ExperimentCatalogue(self.test_dir)
+        catalogue.refresh()
+
+        #====       Act        ====#
+        os.mkdir(os.path.join(self.test_dir, 'second'))
+        os.rmdir(os.path.join(self.test_dir, 'first'))
+
+        #====      Assert      ====#
+        self.assertTrue(catalogue.contains('second'))
+        self.assertFalse(catalogue.contains('first'))
+
+
+    def test_SYSTEM_ExperimentCatalogue_register_persists_description(self):
+        """
+        Tests that a registered experiment and its description are visible to a new catalogue instance.
+        """
+        #====      Arange      ====#
+        os.mkdir(os.path.join(self.test_dir, 'baseline_model'))
+        ExperimentCatalogue(self.test_dir).register('baseline_model', 'A first baseline')
+
+        #====       Act        ====#
+        result = ExperimentCatalogue(self.test_dir).get('BASELINE_MODEL')
+
+        #====      Assert      ====#
+        self.assertEqual(result['name'], 'baseline_model')
+        self.assertEqual(result['description'], 'A first baseline')
+        self.assertEqual(result['path'], os.path.join(self.test_dir, 'baseline_model'))
+
+
+    def test_UNIT_ExperimentCatalogue_list_applies_filters(self):
+        """
+        Tests that list only returns the experiments matching every filter, ordered by creation time.
+        """
+        #====      Arange      ====#
+        catalogue = ExperimentCatalogue(self.test_dir)
+        for name, description, created_at in [
+            ('lr_0_1', 'learning rate sweep', datetime(2024, 1, 1)),
+            ('lr_0_01', 'learning rate sweep', datetime(2024, 2, 1)),
+            ('baseline', 'baseline model', datetime(2024, 3, 1)),
+        ]:
+            os.mkdir(os.path.join(self.test_dir, name))
+            catalogue.register(name, description, created_at)
+
+        #====       Act        ====#
+        sweep = catalogue.list(description_contains='SWEEP')
+        recent_sweep = catalogue.list(name_contains='lr_', created_after=datetime(2024, 1, 15))
+
+        #====      Assert      ====#
+        self.assertEqual([ e['name'] for e in sweep ], ['lr_0_1', 'lr_0_01'])
+        self.assertEqual([ e['name'] for e in recent_sweep ], ['lr_0_01'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import unittest
+import dsutils
+import os
+import subprocess
+import sys
+import time
+
+
+# Startup budget of `import dsutils`, measured in a fresh interpreter
+IMPORT_BUDGET_S = 0.05
+# Startup budget of the command line scripts, which import the internals and their dependencies, measured in a fresh interpreter
+SCRIPT_IMPORT_BUDGET_S = 0.08
+SCRIPTS = ("dsutils.add_source", "dsutils.start_experiment", "dsutils.setup", "dsutils.inventory", "dsutils.layout")
+# Budget of `python -m dsutils <command> --help` on top of starting the interpreter itself
+CLI_BUDGET_S = 0.1
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def __run_python__(code: str, *args: str):
+    return subprocess.run([ sys.executable, '-c', code, *args ], cwd=PACKAGE_ROOT, capture_output=True, text=True)
+
+
+def __time_python__(*args: str, runs: int = 3):
+    """
+    Returns the fastest wall time of a few runs of the interpreter with the given arguments, to ignore noise.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([ sys.executable, *args ], cwd=PACKAGE_ROOT, capture_output=True, check=True)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+class TestInit(unittest.TestCase):
+    def test_SYSTEM_import_dsutils_within_budget(self):
+        """
+        Tests that importing the package takes less than the startup budget, taking the fastest of a few runs to ignore noise.
+        """
+        #====      Arange      ====#
+        code = "import time; start = time.perf_counter(); import dsutils; print(time.perf_counter() - start)"
+
+        #====       Act        ====#
+        durations = [ float(__run_python__(code).stdout) for _ in range(3) ]
+
+        #====      Assert      ====#
+        self.assertLess(min(durations), IMPORT_BUDGET_S)
+
+
+    def test_SYSTEM_import_scripts_within_budget(self):
+        """
+        Tests that importing every command line script takes less than the script startup budget, taking the fastest of a few runs to ignore noise.
+        """
+        #====      Arange      ====#
+        code = "import importlib, sys, time; start = time.perf_counter(); importlib.import_module(sys.argv[1]); print(time.perf_counter() - start)"
+
+        #====       Act        ====#
+        durations = { script: min([ float(__run_python__(code, script).stdout) for _ in range(3) ]) for script in SCRIPTS }
+
+        #====      Assert      ====#
+        for script, duration in durations.items():
+            self.assertLess(duration, SCRIPT_IMPORT_BUDGET_S, script)
+
+
+    def test_SYSTEM_cli_help_within_budget(self):
+        """
+        Tests that printing the help of a command takes less than the command line budget on top of starting the interpreter.
+        """
+        #====      Arange      ====#
+        interpreter = __time_python__('-c', 'pass')
+
+        #====       Act        ====#
+        durations = { command: __time_python__('-m', 'dsutils', command, '--help') for command in ('add_source', 'start_experiment', 'setup') }
+
+        #====      Assert      ====#
+        for command, duration in durations.items():
+            self.assertLess(duration - interpreter, CLI_BUDGET_S, command)
+
+
+    def test_SYSTEM_import_dsutils_does_not_import_submodules(self):
+        """
+        Tests that importing the package imports none of its submodules, nor argparse.
+        """
+        #====      Arange      ====#
+        code = "import sys, dsutils; print(' '.join(m for m in sys.modules if m.startswith('dsutils.') or m == 'argparse'))"
+
+        #====       Act        ====#
+        result = __run_python__(code)
+
+        #====      Assert      ====#
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+    def test_SYSTEM_import_inventory_does_not_import_catalogue_or_argparse(self):
+        """
+        Tests that importing the inventory imports neither the experiment catalogue nor argparse, which is only needed by its command line.
+        """
+        #====      Arange      ====#
+        code = "import sys, dsutils.inventory; print(' '.join(m for m in sys.modules if m in ('dsutils.experiment_catalogue', 'argparse')))"
+
+        #====       Act        ====#
+        result = __run_python__(code)
+
+        #====      Assert      ====#
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+
+    def test_SYSTEM_import_library_modules_does_not_import_argparse(self):
+        """
+        Tests that the modules used as a library only import argparse when their command line is run.
+        """
+        #====      Arange      ====#
+        code = "import sys, dsutils.layout, dsutils.create_files_and_folders, dsutils.async_api, dsutils.project_registry; print('argparse' in sys.modules)"
+
+        #====       Act        ====#
+        result = __run_python__(code)
+
+        #====      Assert      ====#
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+    def test_SYSTEM_import_scripts_does_not_parse_argv(self):
+        """
+        Tests that the command line scripts can be imported by a process with unrelated command line arguments.
+        """
+        #====      Arange      ====#
+        code = "import dsutils.add_source, dsutils.start_experiment, dsutils.setup"
+
+        #====       Act        ====#
+        result = __run_python__(code, '--unknown-flag', 'value')
+
+        #====      Assert      ====#
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+    def test_UNIT_getattr_loads_public_names_lazily(self):
+        """
+        Tests that public names resolve to the objects of their submodule, and submodules to the submodule itself.
+        """
+        #====      Arange      ====#
+        from dsutils.inventory import Inventory
+        import dsutils.start_experiment
+
+        #====       Act        ====#
+        inventory = dsutils.Inventory
+        module = dsutils.start_experiment
+
+        #====      Assert      ====#
+        self.assertIs(inventory, Inventory)
+        self.assertIs(module.start_experiments, dsutils.start_experiments)
+        self.assertIn('load_dataset', dir(dsutils))
+        with self.assertRaises(AttributeError):
+            dsutils.does_not_exist
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,22 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from dsutils.internals import dsutils_read_env, ENV_FILE
+from dsutils.internals import dsutils_read_env, dsutils_get_env, dsutils_find_project_root, dsutils_invalidate_env, DsutilsEnv, DsutilsEnvCache, ENV_FILE
+from dsutils.internals import dsutils_info, dsutils_error, dsutils_input, dsutils_set_log_level, dsutils_flush_logs
+from dsutils.internals import dsutils_span, dsutils_traced, dsutils_enable_tracing, dsutils_disable_tracing
+import json
+import dsutils.internals
+import io
+from dataclasses import FrozenInstanceError
+from pathlib import Path
 import os
 import shutil
+import subprocess
+import sys
+import textwrap
+
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
 
 class TestInternals(unittest.TestCase):
     def setUp(self):
@@ -53,5 +67,307 @@ class TestInternals(unittest.TestCase):
         self.assertEqual(cm.exception.code, 1)
 
 
+    def test_UNIT_DsutilsEnvCache_counts_hits_and_misses(self):
+        """
+        Test that the environment cache only parses the file once while it is unchanged
+        """
+        #====      Arange      ====#
+        env_file = self.test_dir + ENV_FILE
+        with open(env_file, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+        cache = DsutilsEnvCache()
+
+        #====      Act      ====#
+        first = cache.get(env_file)
+        second = cache.get(env_file)
+
+        #====      Assert      ====#
+        self.assertEqual(first, {'TEST_VAR_1': 'test_var_value_1'})
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+
+    def test_UNIT_DsutilsEnvCache_reloads_when_file_changes(self):
+        """
+        Test that the environment cache re-reads the file when its size or modification time changes
+        """
+        #====      Arange      ====#
+        env_file = self.test_dir + ENV_FILE
+        with open(env_file, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+        cache = DsutilsEnvCache()
+        cache.get(env_file)
+
+        #====      Act      ====#
+        with open(env_file, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1\nTEST_VAR_2=a=b')
+        result = cache.get(env_file)
+
+        #====      Assert      ====#
+        self.assertEqual(result, {'TEST_VAR_1': 'test_var_value_1', 'TEST_VAR_2': 'a=b'})
+        self.assertEqual(cache.stats()['misses'], 2)
+
+
+    def test_UNIT_DsutilsEnvCache_invalidate_forces_reload(self):
+        """
+        Test that invalidating the environment cache forces the next lookup to parse the file again
+        """
+        #====      Arange      ====#
+        env_file = self.test_dir + ENV_FILE
+        with open(env_file, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+        cache = DsutilsEnvCache()
+        cache.get(env_file)
+
+        #====      Act      ====#
+        cache.invalidate(env_file)
+        cache.get(env_file)
+
+        #====      Assert      ====#
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(cache.stats()['hits'], 0)
+
+
+    def test_UNIT_dsutils_read_env_returns_copy(self):
+        """
+        Test that mutating the result of dsutils_read_env does not affect later reads
+        """
+        #====      Arange      ====#
+        with open(self.test_dir + ENV_FILE, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+        dsutils_invalidate_env(self.test_dir)
+
+        #====      Act      ====#
+        dsutils_read_env(self.test_dir)['TEST_VAR_1'] = 'changed'
+        result = dsutils_read_env(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertEqual(result['TEST_VAR_1'], 'test_var_value_1')
+
+
+    def test_UNIT_dsutils_get_env_returns_precomputed_paths(self):
+        """
+        Test that dsutils_get_env returns a DsutilsEnv with every path joined to the project root
+        """
+        #====      Arange      ====#
+        dict_to_write = {
+            'PROJECT_ROOT': self.test_dir,
+            'PROJECT_NAME': 'test_internals_dir',
+            'ARTIFACTS_DIR': '/artifacts',
+            'DATA_DIR': '/data',
+            'DATA_PROCESSED_DIR': '/data/processed',
+            'DATA_RAW_DIR': '/data/raw',
+            'EXPERIMENTS_DIR': '/experiments',
+            'SOURCES_FILE': '/sources.csv'
+        }
+        with open(self.test_dir + ENV_FILE, 'w') as f:
+            f.write('\n'.join([f'{key}={value}' for key, value in dict_to_write.items()]))
+        dsutils_invalidate_env(self.test_dir)
+
+        #====      Act      ====#
+        result = dsutils_get_env(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertIsInstance(result, DsutilsEnv)
+        self.assertIs(result, dsutils_get_env(self.test_dir))
+        self.assertEqual(result.project_root, Path(self.test_dir))
+        self.assertEqual(result.project_name, 'test_internals_dir')
+        self.assertEqual(result.data_raw_dir, Path(self.test_dir + '/data/raw'))
+        self.assertEqual(result.sources_file, Path(self.test_dir + '/sources.csv'))
+        with self.assertRaises(FrozenInstanceError):
+            result.project_name = 'changed'
+
+
+    def test_UNIT_dsutils_read_env_finds_env_file_in_parent_directory(self):
+        """
+        Test that dsutils_read_env walks up the parent directories to find the environment file
+        """
+        #====      Arange      ====#
+        nested_dir = os.path.join(self.test_dir, 'experiments', 'nested')
+        os.makedirs(nested_dir)
+        with open(self.test_dir + ENV_FILE, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+        dsutils_invalidate_env()
+
+        #====      Act      ====#
+        result = dsutils_read_env(nested_dir)
+
+        #====      Assert      ====#
+        self.assertEqual(result, {'TEST_VAR_1': 'test_var_value_1'})
+        self.assertEqual(dsutils_find_project_root(nested_dir), self.test_dir)
+
+
+    def test_UNIT_dsutils_find_project_root_caches_negative_results_until_invalidated(self):
+        """
+        Test that a directory without an environment file stays cached as such until the cache is invalidated
+        """
+        #====      Arange      ====#
+        dsutils_invalidate_env()
+        before = dsutils_find_project_root(self.test_dir)
+        with open(self.test_dir + ENV_FILE, 'w') as f:
+            f.write('TEST_VAR_1=test_var_value_1')
+
+        #====      Act      ====#
+        cached = dsutils_find_project_root(self.test_dir)
+        dsutils_invalidate_env()
+        after = dsutils_find_project_root(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertIsNone(before)
+        self.assertIsNone(cached)
+        self.assertEqual(after, self.test_dir)
+
+
+    def test_UNIT_dsutils_info_is_buffered_until_flushed(self):
+        """
+        Test that log messages are buffered, and written without colours to a stream that is not a terminal
+        """
+        #====      Arange      ====#
+        stream = io.StringIO()
+
+        #====      Act      ====#
+        with patch.object(dsutils.internals.__CONSOLE_HANDLER__, 'stream', stream):
+            dsutils_info('first')
+            dsutils_info('second')
+            before = stream.getvalue()
+            dsutils_flush_logs()
+
+        #====      Assert      ====#
+        self.assertEqual(before, '')
+        self.assertRegex(stream.getvalue(), r'^\[DSUTILS \| \d\d:\d\d:\d\d\]: first\n\[DSUTILS \| \d\d:\d\d:\d\d\]: second\n$')
+
+
+    def test_UNIT_dsutils_error_is_written_immediately(self):
+        """
+        Test that logging an error writes the buffered messages right away
+        """
+        #====      Arange      ====#
+        stream = io.StringIO()
+
+        #====      Act      ====#
+        with patch.object(dsutils.internals.__CONSOLE_HANDLER__, 'stream', stream):
+            dsutils_info('context')
+            dsutils_error('failure')
+
+        #====      Assert      ====#
+        self.assertIn('context', stream.getvalue())
+        self.assertIn('failure', stream.getvalue())
+
+
+    def test_UNIT_dsutils_set_log_level_filters_before_formatting(self):
+        """
+        Test that messages below the log level never reach the handler
+        """
+        #====      Arange      ====#
+        dsutils_set_log_level('WARNING')
+
+        #====      Act      ====#
+        with patch.object(dsutils.internals.__CONSOLE_HANDLER__, 'emit') as mock_emit:
+            dsutils_info('hidden')
+        dsutils_set_log_level('INFO')
+
+        #====      Assert      ====#
+        mock_emit.assert_not_called()
+
+
+    @patch('builtins.input', return_value='y')
+    def test_UNIT_dsutils_input_flushes_logs_first(self, mock_input):
+        """
+        Test that buffered messages are written before prompting for input
+        """
+        #====      Arange      ====#
+        stream = io.StringIO()
+
+        #====      Act      ====#
+        with patch.object(dsutils.internals.__CONSOLE_HANDLER__, 'stream', stream):
+            dsutils_info('before prompt')
+            result = dsutils_input('continue?')
+
+        #====      Assert      ====#
+        self.assertEqual(result, 'y')
+        self.assertIn('before prompt', stream.getvalue())
+
+
+    def test_UNIT_dsutils_span_writes_nested_events(self):
+        """
+        Test that spans are written as JSON lines, inheriting the command of the enclosing span
+        """
+        #====      Arange      ====#
+        trace_file = os.path.join(self.test_dir, 'trace.jsonl')
+
+        @dsutils_traced('my_command')
+        def command():
+            with dsutils_span('write', rows=2) as span:
+                span.add_file(10)
+                span.add_file(5)
+
+        #====      Act      ====#
+        dsutils_enable_tracing(trace_file)
+        try:
+            command()
+        finally:
+            dsutils_disable_tracing()
+
+        #====      Assert      ====#
+        with open(trace_file) as f:
+            inner, outer = [ json.loads(line) for line in f ]
+        self.assertEqual((inner['command'], inner['phase'], inner['files'], inner['bytes'], inner['rows']), ('my_command', 'write', 2, 15, 2))
+        self.assertEqual(inner['parent'], outer['id'])
+        self.assertEqual((outer['command'], outer['phase'], outer['status']), ('my_command', 'my_command', 'ok'))
+
+
+    def test_UNIT_dsutils_span_does_nothing_when_tracing_is_disabled(self):
+        """
+        Test that no event is written while tracing is disabled
+        """
+        #====      Arange      ====#
+        dsutils_disable_tracing()
+
+        #====      Act      ====#
+        with patch('dsutils.internals.__write_trace_event__') as mock_write:
+            with dsutils_span('phase') as span:
+                span.add_file(10)
+
+        #====      Assert      ====#
+        mock_write.assert_not_called()
+
+
+    def test_SYSTEM_dsutils_info_in_process_pool_workers_is_written(self):
+        """
+        Test that messages logged by fork and spawn started ProcessPoolExecutor workers are written, even though the workers exit without running atexit handlers
+        """
+        #====      Arange      ====#
+        script = textwrap.dedent("""
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            from dsutils.internals import dsutils_info
+
+            def work(i):
+                dsutils_info(f"worker {i}")
+                return i
+
+            if __name__ == "__main__":
+                dsutils_info("parent")
+                for method in ("fork", "spawn"):
+                    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context(method)) as executor:
+                        list(executor.map(work, [ f"{method} {i}" for i in range(3) ]))
+        """)
+
+        #====      Act      ====#
+        script_file = os.path.join(self.test_dir, 'log_from_workers.py')
+        with open(script_file, 'w') as f:
+            f.write(script)
+        env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+        result = subprocess.run([ sys.executable, script_file ], cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+        #====      Assert      ====#
+        self.assertEqual(result.returncode, 0, result.stderr)
+        for method in ("fork", "spawn"):
+            for i in range(3):
+                self.assertIn(f"worker {method} {i}", result.stdout)
+        self.assertEqual(result.stdout.count("parent"), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
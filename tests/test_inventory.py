@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch
+from dsutils.inventory import Inventory
+import dsutils.inventory
+import os
+import shutil
+import time
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_inventory_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.makedirs(os.path.join(self.test_dir, 'raw'))
+        os.makedirs(os.path.join(self.test_dir, 'processed'))
+        self.__write__('raw/a.csv', 'a')
+        self.__write__('raw/b.csv', 'b')
+        self.__write__('processed/c.csv', 'c')
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __write__(self, path: str, content: str):
+        path = os.path.join(self.test_dir, path)
+        with open(path, 'w') as f:
+            f.write(content)
+        # Move the modification time out of the racy window, so the file is trusted on the next scan
+        past = time.time_ns() - 10_000_000_000
+        os.utime(path, ns=(past, past))
+
+
+    def test_UNIT_Inventory_scan_indexes_all_files(self):
+        """
+        Tests that the first scan reports every file as added, and skips hidden files.
+        """
+        #====      Arange      ====#
+        self.__write__('.hidden', 'x')
+
+        #====       Act        ====#
+        changes = Inventory(self.test_dir).scan()
+
+        #====      Assert      ====#
+        self.assertEqual(changes.added, ['processed/c.csv', 'raw/a.csv', 'raw/b.csv'])
+        self.assertEqual(changes.hashed, 3)
+        self.assertTrue(os.path.isfile(os.path.join(self.test_dir, '.inventory.json')))
+
+
+    def test_UNIT_Inventory_rescan_without_changes_does_not_hash(self):
+        """
+        Tests that files whose stat data did not change are not hashed again.
+        """
+        #====      Arange      ====#
+        Inventory(self.test_dir).scan()
+
+        #====       Act        ====#
+        with patch('dsutils.inventory.__hash_file__') as mock_hash:
+            changes = Inventory(self.test_dir).scan()
+
+        #====      Assert      ====#
+        mock_hash.assert_not_called()
+        self.assertFalse(changes)
+
+
+    def test_UNIT_Inventory_scan_detects_changes(self):
+        """
+        Tests that added, removed, modified and moved files are reported, and touched files are not.
+        """
+        #====      Arange      ====#
+        Inventory(self.test_dir).scan()
+        self.__write__('raw/a.csv', 'changed')
+        self.__write__('raw/d.csv', 'd')
+        os.remove(os.path.join(self.test_dir, 'raw/b.csv'))
+        os.rename(os.path.join(self.test_dir, 'processed/c.csv'), os.path.join(self.test_dir, 'processed/e.csv'))
+        self.__write__('processed/e.csv', 'c')
+
+        #====       Act        ====#
+        changes = Inventory(self.test_dir).scan()
+
+        #====      Assert      ====#
+        self.assertEqual(changes.added, ['raw/d.csv'])
+        self.assertEqual(changes.removed, ['raw/b.csv'])
+        self.assertEqual(changes.modified, ['raw/a.csv'])
+        self.assertEqual(changes.moved, [('processed/c.csv', 'processed/e.csv')])
+
+
+    def test_UNIT_Inventory_recently_modified_files_are_hashed_again(self):
+        """
+        Tests that files modified within the racy window are not trusted on the next scan.
+        """
+        #====      Arange      ====#
+        with open(os.path.join(self.test_dir, 'raw/a.csv'), 'w') as f:
+            f.write('now')
+        Inventory(self.test_dir).scan()
+
+        #====       Act        ====#
+        with patch('dsutils.inventory.__hash_file__', wraps=dsutils.inventory.__hash_file__) as mock_hash:
+            changes = Inventory(self.test_dir).scan()
+
+        #====      Assert      ====#
+        self.assertEqual(mock_hash.call_count, 1)
+        self.assertFalse(changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
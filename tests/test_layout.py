@@ -0,0 +1,160 @@
+import unittest
+from unittest.mock import patch
+from dsutils.layout import LAYOUT_FILE, compile_layout, get_layout_plan, clear_layout_cache, load_layout_schema
+from dsutils.create_files_and_folders import create_files_and_folders
+import json
+import os
+import shutil
+
+
+JSON_DATA_FILE = os.path.abspath(os.path.dirname(__file__) + '/../dsutils/files_and_folders.json')
+with open(JSON_DATA_FILE) as f:
+    json_data = json.load(f)
+
+
+class TestLayout(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_layout_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        clear_layout_cache()
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __write_project_schema__(self, schema: dict):
+        with open(self.test_dir + LAYOUT_FILE, 'w') as f:
+            json.dump(schema, f)
+
+
+    def test_UNIT_compile_layout_merges_schemas_in_dependency_order(self):
+        """
+        Tests that a schema extending the default layout adds, replaces and removes entries, and that folders come before their contents.
+        - The interim data folder and a models folder with a readme are added
+        - The sources file is removed
+        - The artifacts folder is moved
+        """
+        #====      Arange      ====#
+        extension = {
+            "data_interim_dir": { "path": "/data/interim", "isFile": False },
+            "models_readme": { "path": "/models/README.md", "isFile": True, "fileContents": [ "# Models", "" ] },
+            "models_dir": { "path": "/models", "isFile": False },
+            "sources_file": None,
+            "artifacts_dir": { "path": "/output/artifacts", "isFile": False },
+        }
+
+        #====       Act        ====#
+        plan = compile_layout(json_data, extension)
+
+        #====      Assert      ====#
+        keys = [ entry.key for entry in plan.entries ]
+        self.assertEqual(keys, [ 'artifacts_dir', 'data_dir', 'data_processed_dir', 'data_raw_dir', 'experiments_dir', 'data_interim_dir', 'models_readme', 'models_dir' ])
+        ordered = [ entry.path for entry in plan.ordered ]
+        self.assertLess(ordered.index('/models'), ordered.index('/models/README.md'))
+        self.assertLess(ordered.index('/data'), ordered.index('/data/interim'))
+        self.assertEqual(plan.entries[6].contents, "# Models\n")
+
+
+    def test_UNIT_compile_layout_reports_every_error(self):
+        """
+        Tests that invalid schemas raise a single ValueError listing every error.
+        - An entry without a leading /
+        - An entry with a non boolean isFile
+        - Two entries with the same path
+        - An entry inside a file
+        """
+        #====      Arange      ====#
+        invalid = { "relative": { "path": "models", "isFile": False }, "flag": { "path": "/flag", "isFile": "no" } }
+        conflicting = { "copy": { "path": "/data/", "isFile": False }, "nested": { "path": "/sources.csv/nested", "isFile": False } }
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError) as invalid_context:
+            compile_layout(json_data, invalid)
+        with self.assertRaises(ValueError) as conflicting_context:
+            compile_layout(json_data, conflicting)
+
+        #====      Assert      ====#
+        self.assertIn("'relative' must have a path starting with a /", str(invalid_context.exception))
+        self.assertIn("'flag' must have a boolean isFile", str(invalid_context.exception))
+        self.assertIn("'copy' has the same path as 'data_dir'", str(conflicting_context.exception))
+        self.assertIn("'nested' is inside a file", str(conflicting_context.exception))
+
+
+    def test_UNIT_get_layout_plan_is_cached_until_a_schema_changes(self):
+        """
+        Tests that the schemas of a project are only loaded again when the project schema is created or changed.
+        """
+        #====      Arange      ====#
+        default_plan = get_layout_plan(self.test_dir)
+
+        #====       Act        ====#
+        with patch('dsutils.layout.json.load', side_effect=json.load) as mock_json_load:
+            cached_plan = get_layout_plan(self.test_dir)
+            self.__write_project_schema__({ "reports_dir": { "path": "/reports", "isFile": False } })
+            extended_plan = get_layout_plan(self.test_dir)
+            cached_extended_plan = get_layout_plan(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertIs(cached_plan, default_plan)
+        self.assertIs(cached_extended_plan, extended_plan)
+        self.assertEqual(mock_json_load.call_count, 2)
+        self.assertEqual(len(extended_plan), len(default_plan) + 1)
+
+
+    @patch('dsutils.create_files_and_folders.dsutils_info')
+    @patch('dsutils.create_files_and_folders.dsutils_success')
+    @patch('dsutils.create_files_and_folders.dsutils_warn')
+    def test_SYSTEM_diff_and_create_custom_layout(self, mock_cfaf_warn, mock_cfaf_success, mock_cfaf_info):
+        """
+        Tests that the diff of a project with a custom layout lists what is missing and conflicting, and that creating the files and folders completes it.
+        - The data folder exists
+        - A file exists where the models folder should be
+        """
+        #====      Arange      ====#
+        self.__write_project_schema__({
+            "data_interim_dir": { "path": "/data/interim", "isFile": False },
+            "models_dir": { "path": "/models", "isFile": False },
+            "reports_dir": { "path": "/reports", "isFile": False },
+        })
+        os.mkdir(os.path.join(self.test_dir, 'data'))
+        with open(os.path.join(self.test_dir, 'models'), 'w') as f:
+            f.write('')
+        plan = get_layout_plan(self.test_dir)
+
+        #====       Act        ====#
+        before = plan.diff(self.test_dir)
+        os.remove(os.path.join(self.test_dir, 'models'))
+        create_files_and_folders(self.test_dir)
+        after = plan.diff(self.test_dir)
+
+        #====      Assert      ====#
+        self.assertEqual([ entry.key for entry in before.existing ], [ 'data_dir' ])
+        self.assertEqual([ entry.key for entry in before.conflicting ], [ 'models_dir' ])
+        self.assertIn('data_interim_dir', [ entry.key for entry in before.missing ])
+        self.assertTrue(after.is_complete())
+        self.assertTrue(os.path.isdir(os.path.join(self.test_dir, 'data', 'interim')))
+
+
+    def test_UNIT_load_layout_schema_rejects_invalid_json(self):
+        """
+        Tests that a schema file that is not valid JSON raises a ValueError naming the file.
+        """
+        #====      Arange      ====#
+        path = os.path.join(self.test_dir, 'layout.json')
+        with open(path, 'w') as f:
+            f.write('{ "models_dir": ')
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError) as context:
+            load_layout_schema(path)
+
+        #====      Assert      ====#
+        self.assertIn(path, str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from dsutils.notebook_template import NotebookTemplate, load_notebook_template, get_notebook_template, DEFAULT_TEMPLATE
+import json
+import os
+import shutil
+
+
+TEMPLATE_VALUES = {
+    'title': 'Baseline Model',
+    'description': 'A "quoted" description\nwith a C:\\windows\\path',
+    'project_dir': 'C:\\projects\\example',
+    'experiments_dir': '\\experiments',
+    'data_dir': '\\data',
+    'processed_dir': '\\data\\processed',
+    'raw_dir': '\\data\\raw',
+    'artifacts_dir': '\\artifacts',
+    'sources_file': '\\sources.csv',
+}
+
+
+class TestNotebookTemplate(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_notebook_template_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_NotebookTemplate_render_produces_valid_json_for_special_characters(self):
+        """
+        Tests that values containing quotes, backslashes and newlines still render to a valid notebook.
+        """
+        #====      Arange      ====#
+        template = load_notebook_template()
+
+        #====       Act        ====#
+        result = json.loads(template.render(**TEMPLATE_VALUES))
+
+        #====      Assert      ====#
+        self.assertEqual(result['cells'][0]['source'][0], '# Baseline Model\n')
+        self.assertEqual(result['cells'][0]['source'][2], TEMPLATE_VALUES['description'])
+        self.assertIn("project_dir = r'C:\\projects\\example'\n", result['cells'][1]['source'])
+
+
+    def test_UNIT_NotebookTemplate_render_raises_on_missing_value(self):
+        """
+        Tests that rendering without a value for every placeholder raises a KeyError.
+        """
+        #====      Arange      ====#
+        template = NotebookTemplate({ 'cells': [ { 'source': [ '{{title}} {{missing}}' ] } ] })
+
+        #====       Act        ====#
+        with self.assertRaises(KeyError):
+            template.render(title='title')
+
+        #====      Assert      ====#
+        self.assertEqual(template.fields, ['title', 'missing'])
+
+
+    def test_UNIT_NotebookTemplate_rejects_non_notebooks(self):
+        """
+        Tests that a JSON document without cells is not accepted as a template.
+        """
+        #====      Arange      ====#
+        not_a_notebook = { 'metadata': {} }
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError):
+            NotebookTemplate(not_a_notebook)
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+    def test_UNIT_load_notebook_template_is_cached(self):
+        """
+        Tests that loading the same template twice returns the same compiled template.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        first = load_notebook_template()
+        second = load_notebook_template(DEFAULT_TEMPLATE)
+
+        #====      Assert      ====#
+        self.assertIs(first, second)
+
+
+    def test_SYSTEM_get_notebook_template_uses_project_template(self):
+        """
+        Tests that a template configured with NOTEBOOK_TEMPLATE in the environment is used instead of the default template.
+        """
+        #====      Arange      ====#
+        with open(os.path.join(self.test_dir, 'template.ipynb'), 'w') as f:
+            json.dump({ 'cells': [ { 'cell_type': 'markdown', 'metadata': {}, 'source': [ '{{description}}' ] } ] }, f)
+        env_vars = { 'PROJECT_ROOT': self.test_dir, 'NOTEBOOK_TEMPLATE': '/template.ipynb' }
+
+        #====       Act        ====#
+        result = get_notebook_template(env_vars)
+
+        #====      Assert      ====#
+        self.assertEqual(result.fields, ['description'])
+        self.assertIs(get_notebook_template({ 'PROJECT_ROOT': self.test_dir }), load_notebook_template())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch
+from dsutils.partitioning import write_partitioned, read_partitioned, select_shards
+import dsutils.partitioning
+import os
+import shutil
+
+
+class TestPartitioning(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_partitioning_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.records = [ { 'id': i, 'year': 2022 + i % 3, 'region': 'eu' if i % 2 == 0 else 'us' } for i in range(30) ]
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_SYSTEM_write_partitioned_round_trips_records(self):
+        """
+        Tests that a dataset written with worker threads is read back completely, with a manifest of every shard.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        manifest = write_partitioned(self.records, 'sales', by='year', n_shards=2, processed_dir=self.test_dir, workers=2)
+        records = list(read_partitioned('sales', processed_dir=self.test_dir, verify=True))
+
+        #====      Assert      ====#
+        self.assertEqual(manifest['rows'], 30)
+        self.assertEqual(len(manifest['shards']), 6)
+        self.assertEqual(sum([ shard['rows'] for shard in manifest['shards'] ]), 30)
+        self.assertEqual(sorted([ r['id'] for r in records ]), list(range(30)))
+        self.assertTrue(os.path.isfile(os.path.join(self.test_dir, 'sales', 'year=2023', 'part-00001.jsonl')))
+
+
+    def test_UNIT_write_partitioned_streams_records_into_shards(self):
+        """
+        Tests that records are written to their shard while the dataset is still being read, rather than after collecting all of them,
+        and that shards written in many parts match their checksum.
+        """
+        #====      Arange      ====#
+        tmp_dir = os.path.join(self.test_dir, f'sales.{os.getpid()}.tmp')
+        written_while_reading = []
+
+        def records():
+            for i, record in enumerate(self.records):
+                if i == len(self.records) - 1:
+                    shard = os.path.join(tmp_dir, 'year=2022', 'part-00000.jsonl')
+                    written_while_reading.append(os.path.getsize(shard) if os.path.isfile(shard) else 0)
+                yield record
+
+        #====       Act        ====#
+        with patch('dsutils.partitioning.SHARD_BUFFER_SIZE', 64):
+            manifest = write_partitioned(records(), 'sales', by='year', processed_dir=self.test_dir, workers=1)
+        read = list(read_partitioned('sales', processed_dir=self.test_dir, verify=True))
+
+        #====      Assert      ====#
+        self.assertGreater(written_while_reading[0], 0)
+        self.assertEqual(manifest['rows'], 30)
+        self.assertEqual(sorted([ r['id'] for r in read ]), list(range(30)))
+
+
+    def test_UNIT_read_partitioned_only_reads_selected_shards(self):
+        """
+        Tests that shards whose partition does not match the predicate are never opened.
+        """
+        #====      Arange      ====#
+        write_partitioned(self.records, 'sales', by=['year', 'region'], processed_dir=self.test_dir, workers=1)
+
+        #====       Act        ====#
+        with patch('dsutils.partitioning.__read_shard__', wraps=dsutils.partitioning.__read_shard__) as mock_read:
+            records = list(read_partitioned('sales', where=lambda p: p['year'] >= 2023 and p['region'] == 'eu', processed_dir=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertEqual(mock_read.call_count, 2)
+        self.assertTrue(all([ r['year'] >= 2023 and r['region'] == 'eu' for r in records ]))
+        self.assertEqual(len(records), 10)
+
+
+    def test_UNIT_select_shards_accepts_dict_of_values(self):
+        """
+        Tests that shards can be selected with a dict of partition values.
+        """
+        #====      Arange      ====#
+        write_partitioned({ 'id': [1, 2, 3], 'region': ['eu', 'us', 'eu'] }, 'sales', by='region', processed_dir=self.test_dir, workers=1)
+
+        #====       Act        ====#
+        shards = select_shards('sales', where={ 'region': 'eu' }, processed_dir=self.test_dir)
+
+        #====      Assert      ====#
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(shards[0]['rows'], 2)
+        self.assertTrue(os.path.isabs(shards[0]['path']))
+
+
+    def test_UNIT_read_partitioned_verify_detects_corrupted_shard(self):
+        """
+        Tests that a shard modified after it was written fails verification.
+        """
+        #====      Arange      ====#
+        write_partitioned(self.records, 'sales', processed_dir=self.test_dir, workers=1)
+        with open(os.path.join(self.test_dir, 'sales', 'part-00000.jsonl'), 'a') as f:
+            f.write('{"id": 99}\n')
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError):
+            list(read_partitioned('sales', verify=True, processed_dir=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+if __name__ == '__main__':
+    unittest.main()
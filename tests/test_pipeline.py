@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+from dsutils.pipeline import Pipeline
+import os
+import shutil
+
+
+def combine(inputs: list[str], output_dir: str):
+    with open(os.path.join(output_dir, 'combined.txt'), 'w') as out:
+        for path in inputs:
+            with open(path) as f:
+                out.write(f.read())
+
+
+def count_lines(inputs: list[str], output_dir: str):
+    with open(inputs[0]) as f:
+        lines = len(f.read().splitlines())
+    with open(os.path.join(output_dir, 'count.txt'), 'w') as out:
+        out.write(str(lines))
+
+
+def upper(inputs: list[str], output_dir: str):
+    with open(os.path.join(output_dir, 'upper.txt'), 'w') as out:
+        for path in inputs:
+            with open(path) as f:
+                out.write(f.read().upper())
+
+
+def forgets_output(inputs: list[str], output_dir: str):
+    pass
+
+
+@patch('dsutils.pipeline.dsutils_success')
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_pipeline_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        self.raw_dir = os.path.join(self.test_dir, 'raw')
+        self.processed_dir = os.path.join(self.test_dir, 'processed')
+        os.makedirs(self.raw_dir)
+        os.makedirs(self.processed_dir)
+        for name, content in [('a.txt', 'a\n'), ('b.txt', 'b\n')]:
+            with open(os.path.join(self.raw_dir, name), 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __pipeline__(self):
+        pipeline = Pipeline(self.raw_dir, self.processed_dir)
+        pipeline.add_step(combine, inputs=['*.txt'], outputs=['combined.txt'])
+        pipeline.add_step(count_lines, outputs=['count.txt'], depends_on=['combine'])
+        pipeline.add_step(upper, inputs=['a.txt'], outputs=['upper.txt'])
+        return pipeline
+
+
+    def test_SYSTEM_Pipeline_run_runs_every_step_in_dependency_order(self, mock_success):
+        """
+        Tests that a first run executes every step, with dependent steps seeing the outputs of their dependencies.
+        """
+        #====      Arange      ====#
+        pipeline = self.__pipeline__()
+
+        #====       Act        ====#
+        status = pipeline.run(workers=2)
+
+        #====      Assert      ====#
+        self.assertEqual(status, { 'combine': 'ran', 'count_lines': 'ran', 'upper': 'ran' })
+        with open(os.path.join(self.processed_dir, 'count.txt')) as f:
+            self.assertEqual(f.read(), '2')
+
+
+    def test_UNIT_Pipeline_run_skips_up_to_date_steps(self, mock_success):
+        """
+        Tests that a second run without changes does not execute any step.
+        """
+        #====      Arange      ====#
+        self.__pipeline__().run(workers=1)
+
+        #====       Act        ====#
+        status = self.__pipeline__().run(workers=1)
+
+        #====      Assert      ====#
+        self.assertEqual(status, { 'combine': 'skipped', 'count_lines': 'skipped', 'upper': 'skipped' })
+
+
+    def test_UNIT_Pipeline_run_reruns_steps_affected_by_changed_input(self, mock_success):
+        """
+        Tests that changing an input only reruns the steps reading it, and the steps depending on those.
+        """
+        #====      Arange      ====#
+        self.__pipeline__().run(workers=1)
+        with open(os.path.join(self.raw_dir, 'b.txt'), 'w') as f:
+            f.write('b\nc\n')
+
+        #====       Act        ====#
+        status = self.__pipeline__().run(workers=1)
+
+        #====      Assert      ====#
+        self.assertEqual(status, { 'combine': 'ran', 'count_lines': 'ran', 'upper': 'skipped' })
+        with open(os.path.join(self.processed_dir, 'count.txt')) as f:
+            self.assertEqual(f.read(), '3')
+
+
+    def test_UNIT_Pipeline_run_reruns_step_with_missing_output(self, mock_success):
+        """
+        Tests that a step whose output was removed is executed again.
+        """
+        #====      Arange      ====#
+        self.__pipeline__().run(workers=1)
+        os.remove(os.path.join(self.processed_dir, 'upper.txt'))
+
+        #====       Act        ====#
+        status = self.__pipeline__().run(workers=1)
+
+        #====      Assert      ====#
+        self.assertEqual(status['upper'], 'ran')
+        self.assertEqual(status['combine'], 'skipped')
+
+
+    def test_UNIT_Pipeline_run_raises_when_step_does_not_produce_output(self, mock_success):
+        """
+        Tests that a step which does not write its declared outputs fails the run.
+        """
+        #====      Arange      ====#
+        pipeline = Pipeline(self.raw_dir, self.processed_dir)
+        pipeline.add_step(forgets_output, inputs=['a.txt'], outputs=['missing.txt'])
+
+        #====       Act        ====#
+        with self.assertRaises(FileNotFoundError):
+            pipeline.run(workers=1)
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+    def test_UNIT_Pipeline_add_step_rejects_unknown_dependency(self, mock_success):
+        """
+        Tests that a step cannot depend on a step that was not registered before it.
+        """
+        #====      Arange      ====#
+        pipeline = Pipeline(self.raw_dir, self.processed_dir)
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError):
+            pipeline.add_step(count_lines, depends_on=['combine'])
+
+        #====      Assert      ====#
+        self.assertEqual(pipeline.steps, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
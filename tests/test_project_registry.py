@@ -0,0 +1,138 @@
+import unittest
+from dsutils.project_registry import ProjectRegistry, REGISTRY_FILE, get_dsutils_home
+from dsutils.create_files_and_folders import LAYOUT_VERSION
+from dsutils.internals import ENV_FILE
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestProjectRegistry(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_project_registry_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.home = os.path.join(self.test_dir, '.dsutils')
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_get_dsutils_home_uses_environment_variable(self):
+        """
+        Tests that the DSUTILS_HOME environment variable overrides the default home directory.
+        """
+        #====      Arange      ====#
+        previous = os.environ.get('DSUTILS_HOME')
+
+        #====       Act        ====#
+        os.environ['DSUTILS_HOME'] = self.home
+        try:
+            home = get_dsutils_home()
+        finally:
+            if previous is None:
+                os.environ.pop('DSUTILS_HOME')
+            else:
+                os.environ['DSUTILS_HOME'] = previous
+
+        #====      Assert      ====#
+        self.assertEqual(home, self.home)
+
+
+    def test_UNIT_register_and_list_projects(self):
+        """
+        Tests that registered projects are listed with their layout version, and that registering a project again updates it.
+        """
+        #====      Arange      ====#
+        registry = ProjectRegistry(self.home)
+        first, second = os.path.join(self.test_dir, 'first'), os.path.join(self.test_dir, 'second')
+
+        #====       Act        ====#
+        registry.register([ second, first ], layout_version=0)
+        registered_at = registry.projects()[0]['registered_at']
+        registry.register([ first ])
+
+        #====      Assert      ====#
+        projects = registry.projects()
+        self.assertEqual([ project['root'] for project in projects ], [ first, second ])
+        self.assertEqual(projects[0]['name'], 'first')
+        self.assertEqual(projects[0]['registered_at'], registered_at)
+        self.assertEqual([ project['root'] for project in registry.projects(layout_version=LAYOUT_VERSION) ], [ first ])
+        with open(os.path.join(self.home, REGISTRY_FILE), 'r') as f:
+            self.assertEqual(json.load(f)['version'], 1)
+
+
+    def test_UNIT_concurrent_registrations_are_not_lost(self):
+        """
+        Tests that projects registered from many threads at once all end up in the registry.
+        """
+        #====      Arange      ====#
+        roots = [ os.path.join(self.test_dir, f'project_{i}') for i in range(16) ]
+
+        #====       Act        ====#
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda root: ProjectRegistry(self.home).register([ root ]), roots))
+
+        #====      Assert      ====#
+        self.assertEqual([ project['root'] for project in ProjectRegistry(self.home).projects() ], sorted(roots))
+
+
+    def test_UNIT_prune_removes_projects_without_environment_file(self):
+        """
+        Tests that pruning removes the projects whose environment file was deleted, and keeps the others.
+        """
+        #====      Arange      ====#
+        registry = ProjectRegistry(self.home)
+        kept, removed = os.path.join(self.test_dir, 'kept'), os.path.join(self.test_dir, 'removed')
+        os.mkdir(kept)
+        with open(kept + ENV_FILE, 'w') as f:
+            f.write('')
+        registry.register([ kept, removed ])
+
+        #====       Act        ====#
+        pruned = registry.prune()
+
+        #====      Assert      ====#
+        self.assertEqual(pruned, [ removed ])
+        self.assertEqual([ project['root'] for project in registry.projects() ], [ kept ])
+
+
+
+    def test_SYSTEM_main_prune_reports_removed_projects_before_listing(self):
+        """
+        Tests that the projects removed by --prune are reported before the listing, and kept out of the --json output.
+        """
+        #====      Arange      ====#
+        registry = ProjectRegistry(self.home)
+        kept, removed = os.path.join(self.test_dir, 'kept'), os.path.join(self.test_dir, 'removed')
+        os.mkdir(kept)
+        with open(kept + ENV_FILE, 'w') as f:
+            f.write('')
+        env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT, DSUTILS_HOME=self.home)
+
+        def run(*args):
+            registry.register([ kept, removed ])
+            return subprocess.run([ sys.executable, '-m', 'dsutils', 'projects', '--prune', *args ], env=env, capture_output=True, text=True)
+
+        #====       Act        ====#
+        listed = run()
+        listed_json = run('--json')
+
+        #====      Assert      ====#
+        self.assertEqual(listed.returncode, 0, listed.stderr)
+        self.assertLess(listed.stdout.index(f"removed: {removed}"), listed.stdout.index(f"{kept}\t"))
+        self.assertEqual([ project['root'] for project in json.loads(listed_json.stdout) ], [ kept ])
+        self.assertIn(f"removed: {removed}", listed_json.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from dsutils.setup import setup as dsutils_setup
+from dsutils.setup import setup as dsutils_setup, setup_many
+from dsutils.project_registry import list_projects
+from dsutils.internals import ENV_FILE
 import json
+import logging
 import os
 import shutil
 
@@ -18,8 +21,16 @@ class TestSetup(unittest.TestCase):
         if os.path.isdir(self.test_dir):
             shutil.rmtree(self.test_dir)
         os.mkdir(self.test_dir)            
+        # Keep the project registry in the test directory
+        self.dsutils_home = os.environ.get('DSUTILS_HOME')
+        os.environ['DSUTILS_HOME'] = os.path.join(self.test_dir, '.dsutils')
 
     def tearDown(self):
+        # Restore the project registry location
+        if self.dsutils_home is None:
+            os.environ.pop('DSUTILS_HOME', None)
+        else:
+            os.environ['DSUTILS_HOME'] = self.dsutils_home
         # Remove the contents of the test directory
         if os.path.isdir(self.test_dir):
             shutil.rmtree(self.test_dir)
@@ -238,7 +249,117 @@ class TestSetup(unittest.TestCase):
         mock_cfaf.assert_not_called()
 
 
+    def test_SYSTEM_setup_many_sets_up_every_project(self):
+        """
+        Tests that setting up many projects at once creates their files, folders and environment files and registers them.
+        """
+        #====      Arange      ====#
+        roots = [ os.path.join(self.test_dir, f'project_{i}') for i in range(4) ]
+        for root in roots:
+            os.mkdir(root)
+
+        #====       Act        ====#
+        results = setup_many(roots, workers=2)
+
+        #====      Assert      ====#
+        self.assertEqual([ result['root'] for result in results ], roots)
+        self.assertTrue(all(result['status'] == 'created' for result in results))
+        for root in roots:
+            self.assertTrue(os.path.isfile(root + ENV_FILE))
+            self.assertTrue(os.path.isdir(os.path.join(root, 'experiments')))
+        self.assertEqual([ project['root'] for project in list_projects() ], roots)
+
+
+    def test_SYSTEM_setup_many_skips_existing_and_reports_failed_projects(self):
+        """
+        Tests that projects which are already set up are skipped, and that a missing root directory does not affect the other projects.
+        - The first project already has an environment file
+        - The second project does not exist
+        - The third project is new
+        """
+        #====      Arange      ====#
+        existing, missing, new = [ os.path.join(self.test_dir, name) for name in ('existing', 'missing', 'new') ]
+        os.mkdir(existing)
+        os.mkdir(new)
+        with open(existing + ENV_FILE, 'w') as f:
+            f.write('')
+
+        #====       Act        ====#
+        results = setup_many([ existing, missing, new, new ])
+
+        #====      Assert      ====#
+        self.assertEqual([ result['status'] for result in results ], [ 'skipped', 'failed', 'created' ])
+        self.assertIn('does not exist', results[1]['error'])
+        with open(existing + ENV_FILE, 'r') as f:
+            self.assertEqual(f.read(), '')
+        self.assertEqual([ project['root'] for project in list_projects() ], [ new ])
+
+
+
+    def test_SYSTEM_setup_many_reports_project_with_invalid_layout_as_failed(self):
+        """
+        Tests that a project with an invalid layout schema is reported as failed without affecting the other projects.
+        """
+        #====      Arange      ====#
+        roots = [ os.path.join(self.test_dir, f'project_{i}') for i in range(3) ]
+        for root in roots:
+            os.mkdir(root)
+        with open(os.path.join(roots[1], '.dsutils.layout.json'), 'w') as f:
+            f.write('{ "models": { "path": "models" ')
+
+        #====       Act        ====#
+        results = setup_many(roots, workers=2)
+
+        #====      Assert      ====#
+        self.assertEqual([ result['status'] for result in results ], [ 'created', 'failed', 'created' ])
+        self.assertIn('invalid JSON', results[1]['error'])
+        self.assertFalse(os.path.isfile(roots[1] + ENV_FILE))
+        self.assertEqual([ project['root'] for project in list_projects() ], [ roots[0], roots[2] ])
+
+
+    def test_SYSTEM_setup_many_reports_unexpected_errors_as_failed(self):
+        """
+        Tests that an unexpected exception while setting up one project is reported as failed instead of aborting the whole batch.
+        """
+        #====      Arange      ====#
+        from dsutils.setup import create_files_and_folders
+        roots = [ os.path.join(self.test_dir, f'project_{i}') for i in range(3) ]
+        for root in roots:
+            os.mkdir(root)
+
+        def create_or_raise(project_root):
+            if project_root == roots[1]:
+                raise RuntimeError('unexpected')
+            return create_files_and_folders(project_root)
+
+        #====       Act        ====#
+        with patch('dsutils.setup.create_files_and_folders', side_effect=create_or_raise):
+            results = setup_many(roots, workers=2)
+
+        #====      Assert      ====#
+        self.assertEqual([ result['status'] for result in results ], [ 'created', 'failed', 'created' ])
+        self.assertEqual(results[1]['error'], 'unexpected')
+
+
+    def test_SYSTEM_setup_many_returns_messages_of_every_project(self):
+        """
+        Tests that the messages logged while setting up a project, e.g. warnings about existing folders, are returned with its result.
+        """
+        #====      Arange      ====#
+        roots = [ os.path.join(self.test_dir, f'project_{i}') for i in range(2) ]
+        for root in roots:
+            os.mkdir(root)
+        os.mkdir(os.path.join(roots[1], 'experiments'))
+
+        #====       Act        ====#
+        results = setup_many(roots)
+
+        #====      Assert      ====#
+        warnings = [ [ message for level, message in result['messages'] if level >= logging.WARNING ] for result in results ]
+        self.assertEqual(warnings[0], [])
+        self.assertEqual(len(warnings[1]), 1)
+        self.assertIn('experiments', warnings[1][0])
+        self.assertIn('already exists', warnings[1][0])
 
-            
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
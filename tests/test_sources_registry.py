@@ -0,0 +1,292 @@
+import unittest
+from dsutils.sources_registry import SourcesRegistry, COMPACT_AFTER
+from multiprocessing import Process
+import os
+import shutil
+
+
+HEADER = "id;name;description;url;citation"
+
+
+def __add_sources_in_process__(sources_file: str, prefix: str, count: int):
+    registry = SourcesRegistry(sources_file)
+    for i in range(count):
+        with registry.writer() as writer:
+            writer.add(f"{prefix}{i}", "d", "https://a.b", "c")
+
+
+class TestSourcesRegistry(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_sources_registry_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.sources_file = os.path.join(self.test_dir, 'sources.csv')
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def __write_sources__(self, rows: list[str], mode: str = 'w'):
+        with open(self.sources_file, mode) as f:
+            if mode == 'w':
+                f.write(HEADER)
+            for row in rows:
+                f.write(f"\n{row}")
+
+
+    def test_UNIT_SourcesRegistry_indexes_names_and_max_id(self):
+        """
+        Tests that the registry finds existing names and allocates the id after the highest one.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'", "4;'titanic';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+
+        #====       Act        ====#
+        next_id = registry.next_id()
+
+        #====      Assert      ====#
+        self.assertTrue(registry.contains('iris'))
+        self.assertTrue(registry.contains('titanic'))
+        self.assertFalse(registry.contains('tit'))
+        self.assertEqual(next_id, 5)
+        self.assertEqual(len(registry), 2)
+
+
+    def test_UNIT_SourcesRegistry_empty_sources_file_starts_at_id_0(self):
+        """
+        Tests that a sources file with only a header allocates id 0.
+        """
+        #====      Arange      ====#
+        self.__write_sources__([])
+        registry = SourcesRegistry(self.sources_file)
+
+        #====       Act        ====#
+        next_id = registry.next_id()
+
+        #====      Assert      ====#
+        self.assertEqual(next_id, 0)
+        self.assertEqual(len(registry), 0)
+
+
+    def test_UNIT_SourcesRegistry_picks_up_appended_rows(self):
+        """
+        Tests that rows appended after the first refresh are indexed, with their byte offsets.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+
+        #====       Act        ====#
+        self.__write_sources__(["1;'mnist';'d';'https://a.b';'c'"], mode='a')
+
+        #====      Assert      ====#
+        self.assertTrue(registry.contains('mnist'))
+        self.assertEqual(registry.next_id(), 2)
+        with open(self.sources_file, 'rb') as f:
+            f.seek(registry.offset('mnist'))
+            self.assertTrue(f.readline().startswith(b"1;'mnist'"))
+
+
+    def test_UNIT_SourcesRegistry_rebuilds_when_file_is_rewritten(self):
+        """
+        Tests that rewriting the sources file drops names that no longer exist.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'", "1;'mnist';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+
+        #====       Act        ====#
+        self.__write_sources__(["0;'cifar';'d';'https://a.b';'c'"])
+
+        #====      Assert      ====#
+        self.assertFalse(registry.contains('iris'))
+        self.assertTrue(registry.contains('cifar'))
+        self.assertEqual(registry.next_id(), 1)
+
+
+    def test_SYSTEM_SourcesRegistry_persists_index_next_to_sources_file(self):
+        """
+        Tests that the index is written next to the sources file and reused by a new registry.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'"])
+        SourcesRegistry(self.sources_file).refresh()
+
+        #====       Act        ====#
+        registry = SourcesRegistry(self.sources_file)
+
+        #====      Assert      ====#
+        self.assertTrue(os.path.isfile(registry.index_file))
+        self.assertEqual(os.path.dirname(registry.index_file), self.test_dir)
+        self.assertTrue(registry.contains('iris'))
+
+
+    def test_UNIT_SourcesRegistry_appends_new_names_to_index_file(self):
+        """
+        Tests that picking up appended rows only appends to the index file, and that a new registry reads the appended index.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'", "1;'setosa';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+        with open(registry.index_file, "r") as f:
+            before = f.read()
+
+        #====       Act        ====#
+        self.__write_sources__(["2;'titanic';'d';'https://a.b';'c'"], mode='a')
+        registry.refresh()
+        with open(registry.index_file, "r") as f:
+            after = f.read()
+        reloaded = SourcesRegistry(self.sources_file)
+
+        #====      Assert      ====#
+        self.assertTrue(after.startswith(before))
+        self.assertNotIn("iris", after[len(before):])
+        self.assertEqual(registry.offset('titanic'), reloaded.offset('titanic'))
+        self.assertTrue(reloaded.contains('iris'))
+        self.assertTrue(reloaded.contains('setosa'))
+        self.assertEqual(reloaded.next_id(), 3)
+
+
+    def test_UNIT_SourcesRegistry_reparses_row_appended_in_two_writes(self):
+        """
+        Tests that a row read while it is only partly appended is parsed again once it is complete,
+        rather than being indexed, and persisted, with a cut-off name.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'alpha';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+
+        #====       Act        ====#
+        with open(self.sources_file, 'a') as f:
+            f.write("\n1;'betaga")
+        registry.refresh()
+        with open(self.sources_file, 'a') as f:
+            f.write("mma';'d';'https://a.b';'c'")
+        registry.refresh()
+        self.__write_sources__(["2;'delta';'d';'https://a.b';'c'"], mode='a')
+        registry.refresh()
+        reloaded = SourcesRegistry(self.sources_file)
+        with open(self.sources_file, 'rb') as f:
+            data = f.read()
+
+        #====      Assert      ====#
+        for r in (registry, reloaded):
+            self.assertEqual(r.names(), { 'alpha', 'betagamma', 'delta' })
+            self.assertEqual(r.next_id(), 3)
+            self.assertEqual(r.offset('betagamma'), data.index(b"1;'betagamma'"))
+
+
+    def test_UNIT_SourcesRegistry_skips_incomplete_index_records(self):
+        """
+        Tests that an incomplete record at the end of the index file, e.g. of a process that stopped while appending it, is skipped.
+        """
+        #====      Arange      ====#
+        self.__write_sources__(["0;'iris';'d';'https://a.b';'c'"])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+        with open(registry.index_file, "a") as f:
+            f.write('{"size":1,"names":{"tita')
+
+        #====       Act        ====#
+        self.__write_sources__(["1;'name\twith tab';'d';'https://a.b';'c'"], mode='a')
+        SourcesRegistry(self.sources_file).refresh()
+        reloaded = SourcesRegistry(self.sources_file)
+
+        #====      Assert      ====#
+        self.assertTrue(reloaded.contains('iris'))
+        self.assertTrue(reloaded.contains('name\twith tab'))
+        self.assertFalse(reloaded.contains('tita'))
+        self.assertEqual(reloaded.next_id(), 2)
+
+
+    def test_UNIT_SourcesRegistry_compacts_index_file(self):
+        """
+        Tests that the index file is rewritten as a single checkpoint once it holds COMPACT_AFTER checkpoints.
+        """
+        #====      Arange      ====#
+        self.__write_sources__([])
+        registry = SourcesRegistry(self.sources_file)
+        registry.refresh()
+
+        #====       Act        ====#
+        for i in range(COMPACT_AFTER):
+            self.__write_sources__([f"{i};'source{i}';'d';'https://a.b';'c'"], mode='a')
+            registry.refresh()
+        with open(registry.index_file, "r") as f:
+            lines = f.read().splitlines()
+
+        #====      Assert      ====#
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(len(SourcesRegistry(self.sources_file)), COMPACT_AFTER)
+
+
+    def test_UNIT_SourcesRegistry_append_writes_all_rows(self):
+        """
+        Tests that appending a batch of rows writes them in order and makes them visible to the registry.
+        """
+        #====      Arange      ====#
+        self.__write_sources__([])
+        registry = SourcesRegistry(self.sources_file)
+
+        #====       Act        ====#
+        registry.append(["0;'iris';'d';'https://a.b';'c'", "1;'mnist';'d';'https://a.b';'c'"])
+
+        #====      Assert      ====#
+        with open(self.sources_file) as f:
+            self.assertEqual(f.read().splitlines()[1:], ["0;'iris';'d';'https://a.b';'c'", "1;'mnist';'d';'https://a.b';'c'"])
+        self.assertTrue(registry.contains('mnist'))
+        self.assertEqual(registry.next_id(), 2)
+
+
+    def test_UNIT_SourcesWriter_discards_rows_on_exception(self):
+        """
+        Tests that a batch is not written when an exception is raised inside the writer block.
+        """
+        #====      Arange      ====#
+        self.__write_sources__([])
+        registry = SourcesRegistry(self.sources_file)
+
+        #====       Act        ====#
+        with self.assertRaises(RuntimeError):
+            with registry.writer() as writer:
+                writer.add('iris', 'd', 'https://a.b', 'c')
+                raise RuntimeError()
+
+        #====      Assert      ====#
+        self.assertFalse(registry.contains('iris'))
+        self.assertEqual(registry.next_id(), 0)
+
+
+    def test_SYSTEM_SourcesWriter_concurrent_writers_get_unique_ids(self):
+        """
+        Tests that processes adding sources at the same time never allocate the same id or interleave rows.
+        """
+        #====      Arange      ====#
+        self.__write_sources__([])
+        processes = [ Process(target=__add_sources_in_process__, args=(self.sources_file, f"p{p}x", 25)) for p in range(4) ]
+
+        #====       Act        ====#
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        #====      Assert      ====#
+        with open(self.sources_file) as f:
+            rows = f.read().splitlines()[1:]
+        ids = [ int(row.split(';')[0]) for row in rows ]
+        self.assertEqual(len(rows), 100)
+        self.assertEqual(sorted(ids), list(range(100)))
+        self.assertTrue(all([ row.endswith("'c'") for row in rows ]))
+
+
+if __name__ == '__main__':
+    unittest.main()
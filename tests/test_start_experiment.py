@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import patch
+from dsutils.start_experiment import start_experiment, start_experiments, main
+import json
+import os
+import shutil
+
+
+class TestStartExperiment(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_start_experiment_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        self.experiments_dir = os.path.join(self.test_dir, 'experiments')
+        os.makedirs(self.experiments_dir)
+
+        # Point the scripts at the test directory instead of discovering a project
+        env_vars = {
+            "PROJECT_ROOT": self.test_dir,
+            "EXPERIMENTS_DIR": "/experiments",
+            "DATA_DIR": "/data",
+            "DATA_PROCESSED_DIR": "/data/processed",
+            "DATA_RAW_DIR": "/data/raw",
+            "ARTIFACTS_DIR": "/artifacts",
+            "SOURCES_FILE": "/sources.csv",
+        }
+        self.patchers = [
+            patch('dsutils.start_experiment.dsutils_get_experiments_dir', return_value=self.experiments_dir),
+            patch('dsutils.experiment_catalogue.dsutils_get_experiments_dir', return_value=self.experiments_dir),
+            patch('dsutils.start_experiment.dsutils_read_env', return_value=env_vars),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_start_experiment_creates_notebook(self):
+        """
+        Tests that an experiment directory and notebook are created under a normalized name.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        dir_path = start_experiment('Baseline Model', 'A first baseline')
+
+        #====      Assert      ====#
+        self.assertEqual(dir_path, os.path.join(self.experiments_dir, 'baseline_model'))
+        self.assertTrue(os.path.isfile(os.path.join(dir_path, 'baseline_model.ipynb')))
+
+
+    def test_UNIT_start_experiment_invalid_arguments_raise_ValueError(self):
+        """
+        Tests that invalid arguments raise a ValueError outside of interactive mode, without prompting.
+        """
+        #====      Arange      ====#
+        start_experiment('baseline', 'A first baseline')
+
+        #====       Act        ====#
+        with patch('dsutils.start_experiment.dsutils_input') as mock_input, self.assertRaises(ValueError) as context:
+            start_experiment('Baseline', '')
+
+        #====      Assert      ====#
+        mock_input.assert_not_called()
+        self.assertIn("already exists", str(context.exception))
+        self.assertIn("description cannot be empty", str(context.exception))
+
+
+    def test_UNIT_start_experiment_interactive_prompts_for_invalid_arguments(self):
+        """
+        Tests that interactive mode prompts for every invalid argument until it is valid.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        with patch('dsutils.start_experiment.dsutils_input', side_effect=[ 'A first baseline' ]) as mock_input:
+            dir_path = start_experiment('baseline', None, interactive=True)
+
+        #====      Assert      ====#
+        self.assertEqual(mock_input.call_count, 1)
+        self.assertTrue(os.path.isdir(dir_path))
+
+
+    def test_UNIT_start_experiments_expands_grid(self):
+        """
+        Tests that every combination of a grid spec is created.
+        """
+        #====      Arange      ====#
+        spec = { "name": "lr_{lr}_bs_{bs}", "description": "lr {lr}, batch size {bs}", "grid": { "lr": [ 1, 2 ], "bs": [ 32, 64 ] } }
+
+        #====       Act        ====#
+        manifest = start_experiments(spec, workers=2)
+
+        #====      Assert      ====#
+        self.assertEqual([ e["name"] for e in manifest ], [ 'lr_1_bs_32', 'lr_1_bs_64', 'lr_2_bs_32', 'lr_2_bs_64' ])
+        self.assertTrue(all(os.path.isfile(e["notebook"]) for e in manifest))
+
+
+    def test_UNIT_start_experiments_rejects_whole_batch_for_one_invalid_experiment(self):
+        """
+        Tests that a batch with an invalid experiment creates nothing, and names every error.
+        - One experiment already exists
+        - Two experiments of the batch have the same normalized name
+        - One experiment has no description
+        """
+        #====      Arange      ====#
+        start_experiment('baseline', 'A first baseline')
+        specs = [
+            { "name": "Baseline", "description": "Again" },
+            { "name": "Tuned Model", "description": "Tuned" },
+            { "name": "tuned_model", "description": "Tuned again" },
+            { "name": "ablation", "description": "" },
+        ]
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError) as context:
+            start_experiments(specs)
+
+        #====      Assert      ====#
+        message = str(context.exception)
+        self.assertIn("baseline:", message)
+        self.assertIn("tuned_model:", message)
+        self.assertIn("ablation:", message)
+        self.assertEqual(sorted(e for e in os.listdir(self.experiments_dir) if not e.startswith('.')), [ 'baseline' ])
+
+
+    def test_UNIT_start_experiments_returns_manifest_in_spec_order(self):
+        """
+        Tests that a list spec creates every experiment under its normalized name, and returns them in the order of the spec.
+        """
+        #====      Arange      ====#
+        specs = [ { "name": f"Run {i}", "description": f"Run number {i}" } for i in range(5, 0, -1) ]
+
+        #====       Act        ====#
+        manifest = start_experiments(specs, workers=3)
+
+        #====      Assert      ====#
+        self.assertEqual([ e["name"] for e in manifest ], [ f"run_{i}" for i in range(5, 0, -1) ])
+        self.assertEqual([ e["description"] for e in manifest ], [ f"Run number {i}" for i in range(5, 0, -1) ])
+        for e in manifest:
+            self.assertEqual(e["notebook"], os.path.join(self.experiments_dir, e["name"], e["name"] + ".ipynb"))
+            self.assertTrue(os.path.isfile(e["notebook"]))
+
+
+    def test_SYSTEM_main_with_spec_writes_manifest(self):
+        """
+        Tests that the --spec command line mode creates the experiments of a grid spec file and writes their manifest.
+        """
+        #====      Arange      ====#
+        spec_file = os.path.join(self.test_dir, 'sweep.json')
+        manifest_file = os.path.join(self.test_dir, 'manifest.json')
+        with open(spec_file, 'w') as f:
+            json.dump({ "name": "seed_{seed}", "description": "Seed {seed}", "grid": { "seed": [ 0, 1, 2 ] } }, f)
+
+        #====       Act        ====#
+        main([ '--spec', spec_file, '--manifest', manifest_file, '--workers', '2' ], forward=False)
+
+        #====      Assert      ====#
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+        self.assertEqual([ e["name"] for e in manifest ], [ 'seed_0', 'seed_1', 'seed_2' ])
+        self.assertTrue(all(os.path.isdir(e["path"]) for e in manifest))
+
+
+    def test_SYSTEM_main_parses_the_given_arguments(self):
+        """
+        Tests that the command line entry point parses the given arguments rather than the ones of the host process.
+        """
+        #====      Arange      ====#
+        argv = [ '-n', 'baseline', '-d', 'A first baseline' ]
+
+        #====       Act        ====#
+        with patch('sys.argv', [ 'host', '--unknown-flag' ]):
+            main(argv)
+
+        #====      Assert      ====#
+        self.assertTrue(os.path.isdir(os.path.join(self.experiments_dir, 'baseline')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+from unittest.mock import patch
+from dsutils.step_cache import cache
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestStepCache(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_step_cache_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        self.calls = []
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_cache_returns_stored_result_for_same_arguments(self):
+        """
+        Tests that a second call with the same arguments is served from the cache, and different arguments are not.
+        """
+        #====      Arange      ====#
+        @cache(cache_dir=self.test_dir)
+        def square(x, power=2):
+            self.calls.append(x)
+            return x ** power
+
+        #====       Act        ====#
+        results = [ square(3), square(3), square(4), square(3, power=3) ]
+
+        #====      Assert      ====#
+        self.assertEqual(results, [9, 9, 16, 27])
+        self.assertEqual(self.calls, [3, 4, 3])
+        self.assertEqual(square.cache_info()['hits'], 1)
+        self.assertEqual(square.cache_info()['misses'], 3)
+        self.assertEqual(square.cache_info()['entries'], 3)
+
+
+    def test_SYSTEM_cache_survives_redecoration(self):
+        """
+        Tests that results persist on disk, e.g. across kernel restarts where the function is decorated again.
+        """
+        #====      Arange      ====#
+        def double(x):
+            self.calls.append(x)
+            return x * 2
+        cache(cache_dir=self.test_dir)(double)(21)
+
+        #====       Act        ====#
+        result = cache(cache_dir=self.test_dir)(double)(21)
+
+        #====      Assert      ====#
+        self.assertEqual(result, 42)
+        self.assertEqual(self.calls, [21])
+
+
+    def test_UNIT_cache_expires_results_after_ttl(self):
+        """
+        Tests that a result older than the TTL is recomputed.
+        """
+        #====      Arange      ====#
+        @cache(cache_dir=self.test_dir, ttl=60)
+        def identity(x):
+            self.calls.append(x)
+            return x
+        identity(1)
+
+        #====       Act        ====#
+        with patch('dsutils.step_cache.time.time', return_value=time.time() + 120):
+            identity(1)
+
+        #====      Assert      ====#
+        self.assertEqual(self.calls, [1, 1])
+
+
+    def test_UNIT_cache_evicts_least_recently_used_results(self):
+        """
+        Tests that the least recently used result is evicted when the cache grows past max_size.
+        """
+        #====      Arange      ====#
+        @cache(cache_dir=self.test_dir, max_size=2500)
+        def payload(x):
+            self.calls.append(x)
+            return b'x' * 1000
+
+        payload(1)
+        payload(2)
+        # Make the result of 1 the most recently used
+        time.sleep(0.01)
+        payload(1)
+
+        #====       Act        ====#
+        payload(3)
+        payload(1)
+        payload(2)
+
+        #====      Assert      ====#
+        self.assertEqual(self.calls, [1, 2, 3, 2])
+        self.assertGreaterEqual(payload.cache_info()['evictions'], 1)
+
+
+    def test_UNIT_cache_recomputes_results_that_cannot_be_unpickled(self):
+        """
+        Tests that a stale result whose class or module no longer exists is recomputed and replaced instead of raising.
+        """
+        stale_results = {
+            'missing module': b'cdsutils_missing_module\nThing\n.',
+            'missing class': b'cdsutils.step_cache\nMissingThing\n.',
+        }
+        for name, stale_result in stale_results.items():
+            with self.subTest(name):
+                #====      Arange      ====#
+                @cache(cache_dir=self.test_dir)
+                def identity(x):
+                    self.calls.append(x)
+                    return x
+                identity.cache_clear()
+                self.calls.clear()
+                identity(1)
+                path = os.path.join(identity.step_cache.cache_dir, os.listdir(identity.step_cache.cache_dir)[0])
+                with open(path, 'wb') as f:
+                    f.write(stale_result)
+
+                #====       Act        ====#
+                results = [ identity(1), identity(1) ]
+
+                #====      Assert      ====#
+                self.assertEqual(results, [1, 1])
+                self.assertEqual(self.calls, [1, 1])
+                with open(path, 'rb') as f:
+                    self.assertNotEqual(f.read(), stale_result)
+
+
+    @patch('dsutils.step_cache.dsutils_warn')
+    def test_UNIT_cache_calls_function_for_unpicklable_arguments(self, mock_warn):
+        """
+        Tests that calls with arguments that cannot be pickled are passed through without caching.
+        """
+        #====      Arange      ====#
+        @cache(cache_dir=self.test_dir)
+        def call(f):
+            self.calls.append(f)
+            return f()
+
+        #====       Act        ====#
+        results = [ call(lambda: 1), call(lambda: 1) ]
+
+        #====      Assert      ====#
+        self.assertEqual(results, [1, 1])
+        self.assertEqual(len(self.calls), 2)
+        mock_warn.assert_called()
+
+
+    def test_SYSTEM_cache_key_is_stable_across_hash_seeds(self):
+        """
+        Tests that the key of a call with sets and dictionaries as arguments is the same in processes with different hash seeds,
+        e.g. after restarting the kernel.
+        """
+        #====      Arange      ====#
+        script = (
+            "from dsutils.step_cache import StepCache\n"
+            "import json\n"
+            "args = ({'alpha', 'beta', 'gamma', 'delta'}, [ frozenset({'x', 'y', 'z'}) ])\n"
+            "kwargs = { 'options': { 'zeta': 1, 'eta': { 'theta', 'iota' } }, 'name': 'sweep' }\n"
+            "print(StepCache(json.dumps).key(args, kwargs))\n"
+        )
+
+        #====       Act        ====#
+        keys = set()
+        for seed in ('1', '2', '3'):
+            env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=PACKAGE_ROOT)
+            result = subprocess.run([ sys.executable, '-c', script ], cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            keys.add(result.stdout.strip())
+
+        #====      Assert      ====#
+        self.assertEqual(len(keys), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from dsutils.streaming import stream_records
+import dsutils.streaming
+import os
+import shutil
+import threading
+import time
+from unittest.mock import patch
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        # Create the test directory
+        self.test_dir = os.path.abspath(os.path.dirname(__file__) + '/test_streaming_dir/')
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        os.mkdir(self.test_dir)
+        with open(os.path.join(self.test_dir, 'sales.csv'), 'w', newline='') as f:
+            f.write('id,note\n')
+            for i in range(10):
+                f.write(f'{i},"line {i}\nwith newline"\n' if i == 4 else f'{i},note {i}\n')
+        with open(os.path.join(self.test_dir, 'events.jsonl'), 'w') as f:
+            for i in range(10):
+                f.write(f'{{"id": {i}, "amount": {i / 2}}}\n')
+
+    def tearDown(self):
+        # Remove the contents of the test directory
+        if os.path.isdir(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+
+    def test_UNIT_stream_records_yields_fixed_size_batches(self):
+        """
+        Tests that a CSV file is streamed in batches of the requested size, including records spanning several lines.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        batches = list(stream_records('sales.csv', batch_size=4, raw_dir=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertEqual([ len(batch) for batch in batches ], [4, 4, 2])
+        self.assertEqual(batches[1].records[0], { 'id': '4', 'note': 'line 4\nwith newline' })
+        self.assertEqual(batches[-1].end_offset, os.path.getsize(os.path.join(self.test_dir, 'sales.csv')))
+
+
+    def test_UNIT_stream_records_resumes_from_offset(self):
+        """
+        Tests that streaming from the end offset of a batch continues with the next record.
+        """
+        #====      Arange      ====#
+        for name in ['sales.csv', 'events.jsonl']:
+            first = next(iter(stream_records(name, batch_size=5, raw_dir=self.test_dir)))
+
+            #====       Act        ====#
+            rest = list(stream_records(name, batch_size=5, offset=first.end_offset, raw_dir=self.test_dir))
+
+            #====      Assert      ====#
+            self.assertEqual([ str(record['id']) for batch in rest for record in batch.records ], ['5', '6', '7', '8', '9'])
+
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_UNIT_stream_records_yields_arrays(self):
+        """
+        Tests that batches can be read as one NumPy array per column.
+        """
+        #====      Arange      ====#
+
+        #====       Act        ====#
+        batches = list(stream_records('events.jsonl', batch_size=10, as_arrays=True, raw_dir=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertEqual(batches[0].arrays['id'].dtype, np.int64)
+        self.assertEqual(batches[0].arrays['amount'].sum(), 22.5)
+
+
+    def test_UNIT_stream_records_stops_prefetching_when_closed_early(self):
+        """
+        Tests that the background reader stops when the consumer stops iterating.
+        """
+        #====      Arange      ====#
+        stream = stream_records('sales.csv', batch_size=1, prefetch=1, raw_dir=self.test_dir)
+        next(stream)
+
+        #====       Act        ====#
+        stream.close()
+
+        #====      Assert      ====#
+        self.assertFalse(any([ thread.name == 'dsutils-prefetch' for thread in threading.enumerate() ]))
+
+
+    def test_UNIT_stream_records_reads_at_most_prefetch_batches_ahead(self):
+        """
+        Tests that the background thread does not read a batch while `prefetch` batches are ready and one is being processed,
+        so at most `batch_size * (prefetch + 1)` records are in memory.
+        """
+        #====      Arange      ====#
+        read = []
+        read_batches = dsutils.streaming.__read_batches__
+
+        def counting_read_batches(*args):
+            for batch in read_batches(*args):
+                read.append(batch)
+                yield batch
+
+        #====       Act        ====#
+        with patch('dsutils.streaming.__read_batches__', side_effect=counting_read_batches):
+            stream = stream_records('sales.csv', batch_size=1, prefetch=1, raw_dir=self.test_dir)
+            next(stream)
+            time.sleep(0.3)
+            read_while_processing = len(read)
+            remaining = len(list(stream))
+
+        #====      Assert      ====#
+        self.assertEqual(read_while_processing, 2)
+        self.assertEqual(remaining, 9)
+
+
+    def test_UNIT_stream_records_unsupported_file_raises_ValueError(self):
+        """
+        Tests that files other than .csv and .jsonl files are rejected.
+        """
+        #====      Arange      ====#
+        with open(os.path.join(self.test_dir, 'data.txt'), 'w') as f:
+            f.write('text')
+
+        #====       Act        ====#
+        with self.assertRaises(ValueError):
+            list(stream_records('data.txt', raw_dir=self.test_dir))
+
+        #====      Assert      ====#
+        self.assertTrue(True)
+
+
+if __name__ == '__main__':
+    unittest.main()